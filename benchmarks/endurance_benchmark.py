@@ -0,0 +1,60 @@
+"""
+Monte Carlo endurance estimator benchmark.
+
+Runs randomized flights of the profile in data/logs/flight_profile.json
+against the tanks in data/logs/tank_config.json with an increasing
+number of pool workers, printing the running reserve probability as
+batches arrive and the final percentiles.
+
+Usage:
+    python benchmarks/endurance_benchmark.py
+    python benchmarks/endurance_benchmark.py --scenarios 20000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.endurance_estimator import EnduranceEstimator
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'logs')
+
+
+def run(scenarios, workers, batch_size, seed=1):
+    estimator = EnduranceEstimator.from_files(os.path.join(DATA_DIR, 'tank_config.json'),
+                                              os.path.join(DATA_DIR, 'flight_profile.json'),
+                                              batch_size=batch_size, workers=workers)
+
+    def progress(result):
+        print(f"\r  {result.get_scenario_count():>8,} scenarios  "
+              f"P(reserve)={result.get_reserve_probability():.3f}", end="", flush=True)
+
+    start = time.perf_counter()
+    result = estimator.run(scenarios, seed=seed, callback=progress)
+    elapsed = time.perf_counter() - start
+    summary = result.get_summary()
+
+    print(f"\r{'':<50}\r", end="")
+    print(f"{workers} workers, {scenarios:,} scenarios in {elapsed:.2f}s "
+          f"({scenarios / elapsed:,.0f}/s)")
+    print(f"  P(reserve) {summary['reserve_probability']:.3f}   "
+          f"P(starvation) {summary['starvation_probability']:.3f}")
+    for metric in ("remaining_fuel", "reserve_margin", "endurance_minutes"):
+        stats = summary[metric]
+        print(f"  {metric:<18} p5 {stats[5]:>9.1f}   p50 {stats[50]:>9.1f}   p95 {stats[95]:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo endurance estimator benchmark")
+    parser.add_argument("--scenarios", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch-size", type=int, default=250)
+    args = parser.parse_args()
+    for workers in args.workers:
+        run(args.scenarios, workers, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
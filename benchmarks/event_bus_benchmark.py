@@ -0,0 +1,77 @@
+"""
+Tank event bus benchmark: change events against polling.
+
+Builds a system with many tanks and applies a burst of fuel changes to a
+few of them, then compares the cost of polling every tank (what a
+once-a-second display refresh does) with flushing the coalesced events.
+Also reports the per-change overhead of the bus with and without
+subscribers.
+
+Usage:
+    python benchmarks/event_bus_benchmark.py
+    python benchmarks/event_bus_benchmark.py --tanks 10000 --changes 50000 --touched 100
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.fuel_system import FuelSystem
+from models.main_fuel_tank import MainFuelTank
+
+
+def build_system(tank_count):
+    system = FuelSystem()
+    store = system.get_store()
+    for i in range(tank_count):
+        system.add_tank(MainFuelTank(f"TANK_{i:06d}", f"Tank {i}", 5000, 4000, store=store))
+    return system
+
+
+def apply_changes(tanks, changes, rng):
+    start = time.perf_counter()
+    for _ in range(changes):
+        rng.choice(tanks).set_fuel_level(rng.uniform(3000, 5000))
+    return time.perf_counter() - start
+
+
+def run(tank_count, changes, touched, seed=1):
+    rng = random.Random(seed)
+    system = build_system(tank_count)
+    tanks = list(system.get_all_tanks().values())[:touched]
+    bus = system.get_event_bus()
+
+    idle = apply_changes(tanks, changes, rng)
+
+    changed = set()
+    bus.subscribe(lambda events: changed.update(event.tank_id for event in events))
+    subscribed = apply_changes(tanks, changes, rng)
+
+    start = time.perf_counter()
+    delivered = bus.flush()
+    flush_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    polled = [(t.get_fuel_percentage(), t.get_status()) for t in system.get_all_tanks().values()]
+    poll_time = time.perf_counter() - start
+
+    print(f"{tank_count:,} tanks, {changes:,} fuel changes on {touched:,} tanks")
+    print(f"  per change   idle bus {idle / changes * 1e6:.2f}us   subscribed {subscribed / changes * 1e6:.2f}us")
+    print(f"  flush        {flush_time * 1000:>8.2f}ms  ({delivered:,} events, {len(changed):,} tanks)")
+    print(f"  poll all     {poll_time * 1000:>8.2f}ms  ({len(polled):,} tanks)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tank event bus benchmark")
+    parser.add_argument("--tanks", type=int, default=10000)
+    parser.add_argument("--changes", type=int, default=50000)
+    parser.add_argument("--touched", type=int, default=100, help="distinct tanks that change")
+    args = parser.parse_args()
+    run(args.tanks, args.changes, args.touched)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Fleet manager scaling benchmark.
+
+Loads a fleet of identical aircraft (the tank layout from
+data/logs/tank_config.json) into a FleetManager with an increasing number
+of worker processes, then times fleet-wide transfer batches, sensor
+reading batches and summary queries.
+
+Usage:
+    python benchmarks/fleet_benchmark.py
+    python benchmarks/fleet_benchmark.py --aircraft 5000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.fleet_manager import FleetManager
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'logs', 'tank_config.json')
+
+
+def run(aircraft, workers, rounds, seed=1):
+    with open(CONFIG_PATH) as f:
+        config = json.load(f)
+    tank_ids = [t["tank_id"] for t in config["tanks"] if t["type"] != "ReserveTank"]
+    capacities = {t["tank_id"]: t["capacity"] for t in config["tanks"]}
+    level_sensors = [(s["sensor_id"], capacities[s["tank_id"]])
+                     for s in config.get("sensors", []) if s["sensor_type"] == "LEVEL"]
+    aircraft_ids = [f"AC{i:05d}" for i in range(aircraft)]
+    rng = random.Random(seed)
+
+    with FleetManager(workers=workers) as fleet:
+        start = time.perf_counter()
+        fleet.add_fleet({aircraft_id: config for aircraft_id in aircraft_ids})
+        load = time.perf_counter() - start
+
+        transfers = [(aircraft_id, *rng.sample(tank_ids, 2), 10.0)
+                     for aircraft_id in aircraft_ids for _ in range(rounds)]
+        start = time.perf_counter()
+        fleet.execute_transfers(transfers)
+        transfer_time = time.perf_counter() - start
+
+        readings = [(aircraft_id, sensor_id, rng.uniform(0.2, 0.9) * capacity)
+                    for aircraft_id in aircraft_ids for sensor_id, capacity in level_sensors]
+        start = time.perf_counter()
+        fleet.route_readings(readings)
+        reading_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(10):
+            summary = fleet.get_fleet_summary()
+        summary_time = (time.perf_counter() - start) / 10
+
+    print(f"{workers} workers, {aircraft:,} aircraft ({summary['tanks']:,} tanks)")
+    print(f"  load      {load * 1000:>9.1f}ms")
+    print(f"  transfers {len(transfers) / transfer_time:>12,.0f}/s")
+    print(f"  readings  {len(readings) / reading_time:>12,.0f}/s")
+    print(f"  summary   {summary_time * 1000:>9.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet manager scaling benchmark")
+    parser.add_argument("--aircraft", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--rounds", type=int, default=10, help="transfers per aircraft")
+    args = parser.parse_args()
+    for workers in args.workers:
+        run(args.aircraft, workers, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
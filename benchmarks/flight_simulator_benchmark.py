@@ -0,0 +1,58 @@
+"""
+Flight burn simulator benchmark.
+
+Loads a fleet of aircraft with the tank layout from
+data/logs/tank_config.json, flies the profile in
+data/logs/flight_profile.json (a 12 hour long-haul flight) and reports
+the wall time against simulated time.
+
+Usage:
+    python benchmarks/flight_simulator_benchmark.py
+    python benchmarks/flight_simulator_benchmark.py --aircraft 1000 --step 30
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.flight_simulator import FlightSimulator, load_flight_profile
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'logs')
+
+
+def run(aircraft, step_seconds, seed=1):
+    with open(os.path.join(DATA_DIR, 'tank_config.json')) as f:
+        config = json.load(f)
+    phases, feed_schedule = load_flight_profile(os.path.join(DATA_DIR, 'flight_profile.json'))
+    rng = random.Random(seed)
+
+    simulator = FlightSimulator(phases, feed_schedule, step_seconds=step_seconds)
+    start = time.perf_counter()
+    simulator.add_fleet(config, [f"AC{i:05d}" for i in range(aircraft)],
+                        [rng.uniform(0.97, 1.03) for _ in range(aircraft)])
+    load = time.perf_counter() - start
+    report = simulator.run()
+    summary = report.get_summary()
+
+    print(f"{aircraft:,} aircraft, {summary['simulated_hours']:.1f}h flight, {step_seconds:g}s steps")
+    print(f"  load        {load * 1000:>9.1f}ms")
+    print(f"  simulate    {summary['wall_seconds']:>9.2f}s  ({summary['steps']:,} steps, "
+          f"{summary['simulated_hours'] * 3600 / summary['wall_seconds']:,.0f}x real time)")
+    print(f"  transitions {summary['transitions']:>9,}   alerts {summary['alerts']:,}")
+    print(f"  reserve     {summary['reserve_touched']:>9,}   starved {summary['starved']:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flight burn simulator benchmark")
+    parser.add_argument("--aircraft", type=int, default=1000)
+    parser.add_argument("--step", type=float, default=60.0, help="time step in seconds")
+    args = parser.parse_args()
+    run(args.aircraft, args.step)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Throughput benchmark for the binary sensor frame decoder.
+
+Reports frames per second for decoding alone and for decoding plus
+ingestion into a SensorBank (with and without reading history).
+
+Usage:
+    python benchmarks/frame_decoder_benchmark.py
+    python benchmarks/frame_decoder_benchmark.py --sensors 4096 --frames 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.fuel_sensor import FuelSensor
+from models.sensor_bank import SensorBank, SENSOR_TYPES
+from utils.sensor_frames import FrameDecoder, decode_frames, encode_frames
+
+
+def build_bank(sensor_count):
+    bank = SensorBank()
+    for i in range(sensor_count):
+        FuelSensor(f"SENS_{i}", SENSOR_TYPES[i % 3], f"TANK_{i // 3}", bank=bank)
+    return bank
+
+
+def build_buffer(sensor_count, frame_count, seed=1):
+    rng = random.Random(seed)
+    indices = [rng.randrange(sensor_count) for _ in range(frame_count)]
+    type_codes = [index % 3 for index in indices]
+    timestamps = [i * 0.001 for i in range(frame_count)]
+    values = [rng.uniform(0, 90) for _ in range(frame_count)]
+    return bytes(encode_frames(indices, type_codes, timestamps, values))
+
+
+def _rate(func, frame_count, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return frame_count / best
+
+
+def run(sensor_count, frame_count, repeats):
+    buffer = build_buffer(sensor_count, frame_count)
+    decoder = FrameDecoder(build_bank(sensor_count))
+
+    def decode_only():
+        # Decoding itself is zero-copy; scan the fields so the figure
+        # reflects actually reading every frame
+        indices, type_codes, timestamps, values = decode_frames(buffer)
+        return max(indices), max(type_codes), sum(timestamps), sum(values)
+
+    results = {
+        "decode": _rate(decode_only, frame_count, repeats),
+        "decode+ingest": _rate(lambda: decoder.feed(buffer, record_history=False),
+                               frame_count, repeats),
+        "decode+ingest+history": _rate(lambda: decoder.feed(buffer), frame_count, repeats),
+    }
+    print(f"{sensor_count:,} sensors, {frame_count:,} frames per buffer")
+    for name, rate in results.items():
+        print(f"  {name:<24} {rate:>14,.0f} frames/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sensor frame decoder throughput benchmark")
+    parser.add_argument("--sensors", type=int, default=4096)
+    parser.add_argument("--frames", type=int, default=200000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sensors, args.frames, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Secondary index benchmark: indexed queries against full scans.
+
+Builds a system with many tanks, runs random fuel changes, then times
+"tanks below 25%" and "10 fullest auxiliary tanks" through the indexes
+and as a scan over every tank.
+
+Usage:
+    python benchmarks/index_query_benchmark.py
+    python benchmarks/index_query_benchmark.py --tanks 100000 --changes 1000
+"""
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.fuel_system import FuelSystem
+from models.auxiliary_tank import AuxiliaryTank
+from models.main_fuel_tank import MainFuelTank
+
+
+def build_system(tank_count, rng):
+    system = FuelSystem()
+    store = system.get_store()
+    for i in range(tank_count):
+        tank_class = AuxiliaryTank if i % 4 == 0 else MainFuelTank
+        system.add_tank(tank_class(f"TANK_{i:06d}", f"Tank {i}", 5000, rng.uniform(0, 5000), store=store))
+    return system
+
+
+def timed(function, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def run(tank_count, changes, seed=1):
+    rng = random.Random(seed)
+    system = build_system(tank_count, rng)
+    tanks = list(system.get_all_tanks().values())
+
+    def scan_below():
+        return [t for t in tanks if t.get_fuel_percentage() < 25]
+
+    def scan_fullest():
+        auxiliaries = [t for t in tanks if t.get_tank_type() == "AUXILIARY"]
+        return heapq.nlargest(10, auxiliaries, key=lambda t: t.get_fuel_percentage())
+
+    def indexed(query):
+        # Each round changes some tanks first, so dirty rows are part of the cost
+        def run_query():
+            for tank in rng.sample(tanks, changes):
+                tank.set_fuel_level(rng.uniform(0, tank.get_capacity()))
+            return query()
+        return run_query
+
+    _, change_cost = timed(indexed(lambda: None))
+    below, indexed_below = timed(indexed(lambda: system.get_tanks_below_percentage(25)))
+    _, scanned_below = timed(scan_below)
+    fullest, indexed_fullest = timed(indexed(lambda: system.get_fullest_tanks(10, "AUXILIARY")))
+    _, scanned_fullest = timed(scan_fullest)
+    assert [t.get_tank_id() for t in fullest] == [t.get_tank_id() for t in scan_fullest()]
+
+    print(f"{tank_count:,} tanks, {changes:,} fuel changes between queries "
+          f"(changes alone: {change_cost:.2f}ms)")
+    print(f"  below 25%      indexed {indexed_below - change_cost:>8.2f}ms   scan {scanned_below:>8.2f}ms "
+          f"({len(below):,} tanks)")
+    print(f"  10 fullest AUX indexed {indexed_fullest - change_cost:>8.2f}ms   scan {scanned_fullest:>8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Secondary index query benchmark")
+    parser.add_argument("--tanks", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=100)
+    args = parser.parse_args()
+    run(args.tanks, args.changes)
+
+
+if __name__ == "__main__":
+    main()
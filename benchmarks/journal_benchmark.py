@@ -0,0 +1,125 @@
+"""
+Transfer journal benchmark: group commit throughput and recovery time.
+
+Runs transfers through a journaled FuelTransferController: first with an
+asynchronous journal for several group sizes (records per fsync), then
+with a synchronous journal from several threads, where concurrent
+transfers share fsyncs. Finally replays journals of increasing
+length into a fresh system and reports how long recovery takes.
+
+Usage:
+    python benchmarks/journal_benchmark.py
+    python benchmarks/journal_benchmark.py --transfers 5000 --groups 1 16 256
+    python benchmarks/journal_benchmark.py --threads 1 4 16
+    python benchmarks/journal_benchmark.py --recovery 1000 10000 100000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.fuel_system import FuelSystem
+from controllers.fuel_transfer_controller import FuelTransferController
+from models.main_fuel_tank import MainFuelTank
+from utils.transfer_journal import TransferJournal
+
+
+class _NullLogger:
+    """Discards log records so logging does not dominate the measurement"""
+
+    def log_transfer(self, source_tank, destination_tank, amount, success):
+        pass
+
+    def log_transfer_batch(self, applied, rejected, amount, tank_count, mode):
+        pass
+
+
+def build_system(tank_count=8):
+    system = FuelSystem()
+    for i in range(tank_count):
+        system.add_tank(MainFuelTank(f"TANK_{i:04d}", f"Tank {i}", 1e9, 5e8))
+    return system
+
+
+def run_throughput(directory, transfers, group_size):
+    path = os.path.join(directory, f"throughput_{group_size}.bin")
+    system = build_system()
+    journal = TransferJournal(path, group_size=group_size, max_delay=1.0, checkpoint_every=10 ** 9,
+                              synchronous=False)
+    controller = FuelTransferController(system, _NullLogger(), journal)
+    tank_ids = system.get_tank_ids()
+    start = time.perf_counter()
+    for i in range(transfers):
+        controller.execute_transfer(tank_ids[i % 8], tank_ids[(i + 1) % 8], 1.0)
+    journal.close()
+    elapsed = time.perf_counter() - start
+    commits = journal.get_metrics()["commits"]
+    print(f"  group {group_size:>5}: {transfers / elapsed:>10,.0f} transfers/s, {commits:,} fsyncs")
+
+
+def run_synchronous(directory, transfers, threads):
+    path = os.path.join(directory, f"synchronous_{threads}.bin")
+    system = build_system()
+    journal = TransferJournal(path, checkpoint_every=10 ** 9)
+    controller = FuelTransferController(system, _NullLogger(), journal)
+    tank_ids = system.get_tank_ids()
+
+    def worker(offset):
+        for i in range(offset, transfers, threads):
+            controller.execute_transfer(tank_ids[i % 8], tank_ids[(i + 1) % 8], 1.0)
+
+    workers = [threading.Thread(target=worker, args=(offset,)) for offset in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    journal.close()
+    commits = journal.get_metrics()["commits"]
+    print(f"  {threads:>3} threads: {transfers / elapsed:>10,.0f} transfers/s, {commits:,} fsyncs")
+
+
+def run_recovery(directory, records):
+    path = os.path.join(directory, f"recovery_{records}.bin")
+    system = build_system()
+    journal = TransferJournal(path, group_size=1024, checkpoint_every=10 ** 9)
+    tank_ids = system.get_tank_ids()
+    for i in range(records):
+        journal.record_transfer(tank_ids[i % 8], tank_ids[(i + 1) % 8], 1.0)
+    journal.close()
+    stats = TransferJournal(path).recover(build_system())
+    print(f"  {records:>9,} records: {stats['seconds'] * 1000:>9.1f}ms "
+          f"({stats['seconds'] / records * 1e6:.2f}us/record)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transfer journal benchmark")
+    parser.add_argument("--transfers", type=int, default=2000)
+    parser.add_argument("--groups", type=int, nargs="+", default=[1, 8, 64, 512])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--recovery", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"Asynchronous journal ({args.transfers:,} transfers per run)")
+        for group_size in args.groups:
+            run_throughput(directory, args.transfers, group_size)
+        print(f"Synchronous journal ({args.transfers:,} transfers per run)")
+        for threads in args.threads:
+            run_synchronous(directory, args.transfers, threads)
+        print("Recovery (replay without snapshot; checkpoint_every bounds this)")
+        for records in args.recovery:
+            run_recovery(directory, records)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
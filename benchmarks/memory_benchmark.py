@@ -0,0 +1,144 @@
+"""
+Memory benchmark for the tank and sensor models.
+
+Reports the traced memory per tank (object plus its TankStore row) and per
+sensor (object plus its SensorBank row) for a range of instance counts, so
+regressions in the per-object footprint are visible. Each is measured in a
+shared store or bank (as in a FuelSystem) and standalone, i.e. built without
+a store or bank argument; sensors are also measured after one reading, which
+allocates their reading history.
+
+Usage:
+    python benchmarks/memory_benchmark.py
+    python benchmarks/memory_benchmark.py --counts 10000,100000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.main_fuel_tank import MainFuelTank
+from models.auxiliary_tank import AuxiliaryTank
+from models.reserve_tank import ReserveTank
+from models.fuel_sensor import FuelSensor
+from models.tank_store import SharedTankStore, TankStore
+from models.sensor_bank import SensorBank, SharedSensorBank
+
+TANK_CLASSES = [MainFuelTank, AuxiliaryTank, ReserveTank]
+SENSOR_TYPES = ["LEVEL", "PRESSURE", "TEMPERATURE"]
+
+
+def _traced_bytes(factory, count):
+    """
+    Measure memory allocated while building `count` instances.
+
+    Returns:
+        tuple: (total_bytes, bytes_per_instance)
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = factory(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    gc.collect()
+    total = after - before
+    return total, total / count
+
+
+def build_tanks(count):
+    """Build tanks sharing one store, as FuelSystem does"""
+    store = TankStore()
+    ids = [f"TANK_{i}" for i in range(count)]
+    tanks = [
+        TANK_CLASSES[i % 3](ids[i], "Benchmark Tank", 5000, 2500, store=store)
+        for i in range(count)
+    ]
+    return store, ids, tanks
+
+
+def build_standalone_tanks(count):
+    """
+    Build tanks without a store argument.
+
+    They land in a SharedTankStore like DEFAULT_STORE; a fresh one is used
+    so rows freed by earlier runs are not reused and go uncounted.
+    """
+    store = SharedTankStore()
+    ids = [f"TANK_{i}" for i in range(count)]
+    tanks = [TANK_CLASSES[i % 3](ids[i], "Benchmark Tank", 5000, 2500, store=store) for i in range(count)]
+    return store, ids, tanks
+
+
+def build_ids(count):
+    """Baseline: the ID strings alone, subtracted from the tank figure"""
+    return [f"TANK_{i}" for i in range(count)]
+
+
+def build_sensors(count):
+    """Build sensors sharing one bank (no readings, so no history allocated)"""
+    bank = SensorBank()
+    sensors = [
+        FuelSensor(f"SENS_{i}", SENSOR_TYPES[i % 3], f"TANK_{i // 3}", bank=bank)
+        for i in range(count)
+    ]
+    return bank, sensors
+
+
+def build_standalone_sensors(count, readings=0):
+    """Build sensors without a bank argument (fresh SharedSensorBank, as for tanks)"""
+    bank = SharedSensorBank()
+    sensors = [
+        FuelSensor(f"SENS_{i}", SENSOR_TYPES[i % 3], f"TANK_{i // 3}", bank=bank)
+        for i in range(count)
+    ]
+    for reading in range(readings):
+        for sensor in sensors:
+            sensor.set_reading(50.0, timestamp=float(reading))
+    return bank, sensors
+
+
+def build_read_sensors(count):
+    """Standalone sensors after one reading (history allocated)"""
+    return build_standalone_sensors(count, readings=1)
+
+
+def build_sensor_ids(count):
+    """Baseline: the sensor and tank ID strings alone"""
+    return ([f"SENS_{i}" for i in range(count)],
+            [f"TANK_{i // 3}" for i in range(count)])
+
+
+def run(counts):
+    print(f"{'':>12} {'bytes/tank':^25} {'bytes/sensor':^40}")
+    print(f"{'instances':>12} {'shared':>12} {'standalone':>12} {'shared':>12} {'standalone':>12} "
+          f"{'1 reading':>14}")
+    results = []
+    for count in counts:
+        _, id_bytes = _traced_bytes(build_ids, count)
+        _, sensor_id_bytes = _traced_bytes(build_sensor_ids, count)
+        per_tank = _traced_bytes(build_tanks, count)[1] - id_bytes
+        standalone_tank = _traced_bytes(build_standalone_tanks, count)[1] - id_bytes
+        per_sensor = _traced_bytes(build_sensors, count)[1] - sensor_id_bytes
+        standalone_sensor = _traced_bytes(build_standalone_sensors, count)[1] - sensor_id_bytes
+        read_sensor = _traced_bytes(build_read_sensors, count)[1] - sensor_id_bytes
+        results.append((count, per_tank, standalone_tank, per_sensor, standalone_sensor, read_sensor))
+        print(f"{count:>12,} {per_tank:>12.1f} {standalone_tank:>12.1f} {per_sensor:>12.1f} "
+              f"{standalone_sensor:>12.1f} {read_sensor:>14.1f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tank/sensor memory benchmark")
+    parser.add_argument("--counts", default="10000,1000000",
+                        help="Comma-separated instance counts (default: 10000,1000000)")
+    args = parser.parse_args()
+    run([int(c) for c in args.counts.split(",")])
+
+
+if __name__ == "__main__":
+    main()
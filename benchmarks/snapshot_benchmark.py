@@ -0,0 +1,78 @@
+"""
+Snapshot benchmark: binary full/delta snapshots against JSON.
+
+Builds a system with many tanks, then times writing and restoring a full
+binary snapshot, a delta after a few tanks changed, and the JSON
+round trip of FuelSystem.to_dict() for comparison.
+
+Usage:
+    python benchmarks/snapshot_benchmark.py
+    python benchmarks/snapshot_benchmark.py --tanks 100000 --changed 100
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.fuel_system import FuelSystem
+from models.main_fuel_tank import MainFuelTank
+from utils.state_snapshot import SnapshotManager
+
+
+def build_system(tank_count):
+    system = FuelSystem()
+    store = system.get_store()
+    for i in range(tank_count):
+        system.add_tank(MainFuelTank(f"TANK_{i:06d}", f"Tank {i}", 5000, 2500 + i % 1000, store=store))
+    return system
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(tank_count, changed):
+    system = build_system(tank_count)
+    directory = tempfile.mkdtemp()
+    try:
+        manager = SnapshotManager(system, directory)
+        (_, path), full_write = timed(manager.take_snapshot)
+        full_size = os.path.getsize(path)
+        tank_ids = system.get_tank_ids()
+        for i in range(changed):
+            system.get_tank(tank_ids[i * (tank_count // changed)]).set_fuel_level(100)
+        (_, path), delta_write = timed(manager.take_snapshot)
+        delta_size = os.path.getsize(path)
+        stats, restore = timed(SnapshotManager(system, directory).restore)
+
+        json_path = os.path.join(directory, "state.json")
+        _, json_write = timed(lambda: json.dump(system.to_dict(), open(json_path, 'w')))
+        _, json_read = timed(lambda: json.load(open(json_path)))
+        json_size = os.path.getsize(json_path)
+    finally:
+        shutil.rmtree(directory)
+
+    print(f"{tank_count:,} tanks, {changed:,} changed between snapshots")
+    print(f"  full snapshot   write {full_write:>8.1f}ms  {full_size / 1e6:>7.2f}MB")
+    print(f"  delta snapshot  write {delta_write:>8.1f}ms  {delta_size / 1e3:>7.1f}KB")
+    print(f"  restore (full + {stats['deltas']} delta) {restore:>8.1f}ms")
+    print(f"  JSON            write {json_write:>8.1f}ms  {json_size / 1e6:>7.2f}MB, parse {json_read:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binary snapshot benchmark")
+    parser.add_argument("--tanks", type=int, default=100000)
+    parser.add_argument("--changed", type=int, default=100)
+    args = parser.parse_args()
+    run(args.tanks, args.changed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Multi-threaded stress benchmark for fuel transfers.
+
+Worker threads run random transfers through one FuelTransferController
+and the benchmark reports transfers per second, then checks that total
+fuel is conserved (tank levels and the system's running total).
+
+Usage:
+    python benchmarks/transfer_stress_benchmark.py
+    python benchmarks/transfer_stress_benchmark.py --threads 8 --tanks 16 --transfers 20000
+    python benchmarks/transfer_stress_benchmark.py --disjoint      # each thread owns its tanks
+    python benchmarks/transfer_stress_benchmark.py --no-locks      # show lost updates
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.fuel_system import FuelSystem
+from controllers.fuel_transfer_controller import FuelTransferController
+from models.main_fuel_tank import MainFuelTank
+
+
+class _NullLogger:
+    """Discards log records so logging does not dominate the measurement"""
+
+    def log_transfer(self, source_tank, destination_tank, amount, success):
+        pass
+
+    def log_transfer_batch(self, applied, rejected, amount, tank_count, mode):
+        pass
+
+
+class _NoLocks:
+    """Stand-in for TankLocks used to demonstrate unsynchronized transfers"""
+
+    @contextmanager
+    def hold(self, tank_ids):
+        yield
+
+
+def build_system(tank_count):
+    system = FuelSystem()
+    for i in range(tank_count):
+        system.add_tank(MainFuelTank(f"TANK_{i:04d}", f"Tank {i}", 10000, 5000))
+    return system
+
+
+def run(thread_count, tank_count, transfers, disjoint=False, use_locks=True, seed=1):
+    system = build_system(tank_count)
+    controller = FuelTransferController(system, _NullLogger())
+    if not use_locks:
+        controller._locks = _NoLocks()
+    tank_ids = system.get_tank_ids()
+    initial_total = math.fsum(t.get_fuel_level() for t in system.get_all_tanks().values())
+
+    if disjoint:
+        if tank_count < 2 * thread_count:
+            raise SystemExit("--disjoint needs at least two tanks per thread")
+        pools = [tank_ids[i::thread_count] for i in range(thread_count)]
+    else:
+        pools = [tank_ids] * thread_count
+
+    per_thread = transfers // thread_count
+    succeeded = [0] * thread_count
+    start_barrier = threading.Barrier(thread_count + 1)
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        pool = pools[index]
+        plan = [(*rng.sample(pool, 2), float(rng.randint(1, 500))) for _ in range(per_thread)]
+        execute = controller.execute_transfer
+        count = 0
+        start_barrier.wait()
+        for source_id, dest_id, amount in plan:
+            if execute(source_id, dest_id, amount)[0]:
+                count += 1
+        succeeded[index] = count
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    final_total = math.fsum(t.get_fuel_level() for t in system.get_all_tanks().values())
+    attempted = per_thread * thread_count
+    print(f"{thread_count} threads, {tank_count} tanks, {attempted:,} transfers "
+          f"({'disjoint' if disjoint else 'shared'} tanks, locks {'on' if use_locks else 'off'})")
+    print(f"  {attempted / elapsed:>12,.0f} transfers/s ({sum(succeeded):,} succeeded)")
+    print(f"  total fuel {initial_total:,.1f}L -> {final_total:,.1f}L "
+          f"(running total {system.get_total_fuel():,.1f}L)")
+
+    conserved = final_total == initial_total and system.get_total_fuel() == initial_total
+    if use_locks:
+        assert conserved, "Fuel was not conserved"
+    print("  fuel conserved" if conserved else "  FUEL NOT CONSERVED (lost updates)")
+    return attempted / elapsed, conserved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent fuel transfer stress benchmark")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--tanks", type=int, default=8)
+    parser.add_argument("--transfers", type=int, default=100000)
+    parser.add_argument("--disjoint", action="store_true", help="give each thread its own tanks")
+    parser.add_argument("--no-locks", action="store_true", help="bypass the per-tank locks")
+    parser.add_argument("--switch-interval", type=float, default=1e-5,
+                        help="interpreter thread switch interval in seconds (small values provoke races)")
+    args = parser.parse_args()
+    sys.setswitchinterval(args.switch_interval)
+    run(args.threads, args.tanks, args.transfers, args.disjoint, not args.no_locks)
+
+
+if __name__ == "__main__":
+    main()
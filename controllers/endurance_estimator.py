@@ -0,0 +1,342 @@
+import json
+import math
+import multiprocessing
+import os
+import random
+from collections import Counter
+
+from controllers.flight_simulator import FlightSimulator, load_flight_profile
+from utils.system_config import TANK_CLASSES
+
+# Metric -> histogram bin width
+METRICS = {
+    "remaining_fuel": 1.0,  # Liters left in all tanks at landing
+    "reserve_margin": 1.0,  # Usable non-reserve liters left (negative: liters taken from reserve)
+    "endurance_minutes": 0.1,  # Further flight time on usable fuel at the final phase's burn
+}
+
+
+def _add_exact(partials, x):
+    """Add x to a list of non-overlapping partials in place, without rounding error"""
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        high = x + y
+        low = y - (high - x)
+        if low:
+            partials[i] = low
+            i += 1
+        x = high
+    partials[i:] = [x]
+
+
+class MetricHistogram:
+    """
+    Fixed-width histogram of one metric.
+
+    Only bin counts, the count, min, max and the running sum travel
+    between processes, so merging results from any number of workers
+    costs the number of occupied bins, not the number of scenarios.
+
+    The sum of the batch sums is kept exactly as Shewchuk partials (a
+    short list of non-overlapping floats whose length is bounded by the
+    float exponent range, not by the number of batches).
+    """
+
+    def __init__(self, bin_width):
+        self._bin_width = bin_width
+        self._bins = Counter()
+        self._count = 0
+        self._partials = []  # Exact sum of the batch sums
+        self._min = math.inf
+        self._max = -math.inf
+
+    def add(self, values):
+        if not values:
+            return
+        width = self._bin_width
+        self._bins.update(math.floor(value / width) for value in values)
+        self._count += len(values)
+        _add_exact(self._partials, math.fsum(values))
+        self._min = min(self._min, min(values))
+        self._max = max(self._max, max(values))
+
+    def merge(self, other):
+        self._bins.update(other._bins)
+        self._count += other._count
+        for partial in other._partials:
+            _add_exact(self._partials, partial)
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+    def get_count(self):
+        return self._count
+
+    def get_mean(self):
+        # The partials are exact and fsum rounds them correctly, so the mean
+        # does not depend on merge order
+        return math.fsum(self._partials) / self._count if self._count else 0.0
+
+    def get_min(self):
+        return self._min if self._count else 0.0
+
+    def get_max(self):
+        return self._max if self._count else 0.0
+
+    def get_percentile(self, percentile):
+        """Value at a percentile (0-100), accurate to one bin width"""
+        if not self._count:
+            return 0.0
+        rank = max(1, math.ceil(percentile / 100 * self._count))
+        seen = 0
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if seen >= rank:
+                value = (index + 0.5) * self._bin_width
+                return min(max(value, self._min), self._max)
+        return self._max
+
+
+class EnduranceResult:
+    """Aggregated outcome of Monte Carlo flight scenarios"""
+
+    def __init__(self):
+        self._histograms = {metric: MetricHistogram(width) for metric, width in METRICS.items()}
+        self._scenarios = 0
+        self._reserve_touched = 0
+        self._starved = 0
+        self._feed_failures = 0
+        self._batches = 0
+
+    def record(self, values, reserve_touched, starved, feed_failures):
+        """
+        Add a batch of scenario outcomes.
+
+        Args:
+            values (dict): Metric -> one value per scenario
+            reserve_touched (int): Scenarios that fed from a reserve tank
+            starved (int): Scenarios in which an engine ran out of feed
+            feed_failures (int): Feed failures drawn across the batch
+        """
+        for metric, metric_values in values.items():
+            self._histograms[metric].add(metric_values)
+        self._scenarios += len(next(iter(values.values()), []))
+        self._reserve_touched += reserve_touched
+        self._starved += starved
+        self._feed_failures += feed_failures
+        self._batches += 1
+
+    def merge(self, partial):
+        """Fold in a worker's partial result"""
+        for metric, histogram in partial._histograms.items():
+            self._histograms[metric].merge(histogram)
+        self._scenarios += partial._scenarios
+        self._reserve_touched += partial._reserve_touched
+        self._starved += partial._starved
+        self._feed_failures += partial._feed_failures
+        self._batches += partial._batches
+
+    def get_scenario_count(self):
+        return self._scenarios
+
+    def get_reserve_probability(self):
+        """Share of scenarios that had to feed from a reserve tank"""
+        return self._reserve_touched / self._scenarios if self._scenarios else 0.0
+
+    def get_starvation_probability(self):
+        """Share of scenarios in which an engine ran out of feed"""
+        return self._starved / self._scenarios if self._scenarios else 0.0
+
+    def get_batch_count(self):
+        return self._batches
+
+    def get_feed_failure_count(self):
+        return self._feed_failures
+
+    def get_histogram(self, metric):
+        return self._histograms[metric]
+
+    def get_percentiles(self, metric, percentiles=(5, 50, 95)):
+        """
+        Percentiles of a metric.
+
+        Args:
+            metric (str): remaining_fuel, reserve_margin or endurance_minutes
+            percentiles: Percentiles to report (0-100)
+
+        Returns:
+            dict: percentile -> value
+        """
+        histogram = self._histograms[metric]
+        return {p: histogram.get_percentile(p) for p in percentiles}
+
+    def get_summary(self, percentiles=(5, 50, 95)):
+        summary = {
+            "scenarios": self._scenarios,
+            "reserve_probability": self.get_reserve_probability(),
+            "starvation_probability": self.get_starvation_probability(),
+            "feed_failures": self._feed_failures,
+        }
+        for metric, histogram in self._histograms.items():
+            summary[metric] = {"mean": histogram.get_mean(), "min": histogram.get_min(),
+                               "max": histogram.get_max(), **self.get_percentiles(metric, percentiles)}
+        return summary
+
+    def __str__(self):
+        margin = self.get_percentiles("reserve_margin", (5, 50))
+        return (f"EnduranceResult({self._scenarios} scenarios, "
+                f"P(reserve)={self.get_reserve_probability():.3f}, "
+                f"margin p5/p50={margin[5]:.0f}/{margin[50]:.0f}L)")
+
+
+def _run_task(task):
+    """
+    Run one batch of scenarios and reduce them to an EnduranceResult.
+
+    Module-level so that pool workers can unpickle it. The batch's random
+    stream is seeded from (seed, task index), so results do not depend on
+    which worker runs which batch.
+    """
+    config, phases, feed_schedule, options, seed, index, count = task
+    rng = random.Random(f"{seed}:{index}")
+    tanks = [t for t in config.get("tanks", []) if t.get("type") in TANK_CLASSES]
+    reserve_ids = {t["tank_id"] for t in tanks if t["type"] == "ReserveTank"}
+    feed_ids = sorted({tank_id for feeds in feed_schedule.values() for tank_ids in feeds.values()
+                       for tank_id in tank_ids} - reserve_ids)
+    duration = sum(phase["minutes"] * 60 for phase in phases)
+    final_burn = sum(phases[-1]["burn_rates"].values()) / 60 if phases else 0.0
+
+    simulator = FlightSimulator(phases, feed_schedule, step_seconds=options["step_seconds"])
+    scenarios = []
+    for i in range(count):
+        # Sensor error: the true departure fuel differs from the indicated amount
+        scenario_config = dict(config, tanks=[
+            dict(t, initial_fuel=min(t["capacity"], max(0.0, t.get("initial_fuel", 0)
+                                                         * rng.gauss(1.0, options["sensor_sigma"]))))
+            for t in tanks])
+        burn_factor = max(0.0, rng.gauss(1.0, options["burn_sigma"]))
+        failures = {tank_id: rng.uniform(0, duration) for tank_id in feed_ids
+                    if rng.random() < options["transfer_failure_rate"]}
+        aircraft_id = f"S{index}-{i}"
+        simulator.add_fleet(scenario_config, [aircraft_id], [burn_factor], [failures])
+        scenarios.append((aircraft_id, burn_factor, failures, scenario_config))
+
+    report = simulator.run()
+    reserve_touched = report.get_reserve_touched()
+    starved = report.get_starved()
+    values = {metric: [] for metric in METRICS}
+    for aircraft_id, burn_factor, failures, scenario_config in scenarios:
+        final = report.get_final_levels(aircraft_id)
+        reserve_used = sum(t["initial_fuel"] - final[t["tank_id"]]
+                           for t in scenario_config["tanks"] if t["tank_id"] in reserve_ids)
+        usable = sum(level for tank_id, level in final.items()
+                     if tank_id not in reserve_ids and tank_id not in failures)
+        reserve_left = sum(final[tank_id] for tank_id in reserve_ids)
+        burn_per_minute = final_burn * burn_factor
+        values["remaining_fuel"].append(sum(final.values()))
+        values["reserve_margin"].append(usable - reserve_used)
+        values["endurance_minutes"].append((usable + reserve_left) / burn_per_minute
+                                           if burn_per_minute else 0.0)
+
+    result = EnduranceResult()
+    result.record(values, len(reserve_touched), len(starved),
+                  sum(len(failures) for _, _, failures, _ in scenarios))
+    return result
+
+
+class EnduranceEstimator:
+    """
+    Monte Carlo estimate of remaining fuel and reserve margin.
+
+    Each scenario flies the profile with a random burn factor, random
+    departure fuel errors (sensor error on every tank) and random feed
+    failures that trap the rest of a tank's fuel. Scenarios run in
+    batches through the vectorized FlightSimulator on a process pool;
+    each batch returns only histograms and counts, which are merged as
+    they arrive, so per-scenario traces never leave the worker.
+    """
+
+    def __init__(self, config, phases, feed_schedule, burn_sigma=0.03, sensor_sigma=0.02,
+                 transfer_failure_rate=0.02, step_seconds=60.0, batch_size=250,
+                 workers=None, processes=True):
+        """
+        Initialize the estimator.
+
+        Args:
+            config (dict): Tank config (the tank_config.json layout)
+            phases: Flight profile phases (see FlightSimulator)
+            feed_schedule (dict): Feed schedule (see FlightSimulator)
+            burn_sigma (float): Standard deviation of the burn factor (fraction)
+            sensor_sigma (float): Standard deviation of departure fuel errors (fraction)
+            transfer_failure_rate (float): Chance per flight that a feed tank fails
+            step_seconds (float): Simulation time step
+            batch_size (int): Scenarios per pool task
+            workers (int): Pool size (default: CPU count)
+            processes (bool): Use a process pool; False runs batches in this process
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        FlightSimulator(phases, feed_schedule)  # Validate the profile up front
+        self._config = config
+        self._phases = phases
+        self._feed_schedule = feed_schedule
+        self._options = {
+            "burn_sigma": burn_sigma,
+            "sensor_sigma": sensor_sigma,
+            "transfer_failure_rate": transfer_failure_rate,
+            "step_seconds": step_seconds,
+        }
+        self._batch_size = batch_size
+        self._workers = workers or os.cpu_count() or 1
+        self._processes = processes
+
+    @classmethod
+    def from_files(cls, config_path, profile_path, **kwargs):
+        """Build an estimator from a tank_config.json and a flight profile file"""
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+        phases, feed_schedule = load_flight_profile(profile_path)
+        return cls(config, phases, feed_schedule, **kwargs)
+
+    def _tasks(self, scenarios, seed):
+        index = 0
+        for start in range(0, scenarios, self._batch_size):
+            count = min(self._batch_size, scenarios - start)
+            yield (self._config, self._phases, self._feed_schedule, self._options, seed, index, count)
+            index += 1
+
+    def run(self, scenarios, seed=0, callback=None):
+        """
+        Run scenarios and aggregate their outcomes.
+
+        The same (scenarios, seed, batch_size) gives the same result for
+        any number of workers.
+
+        Args:
+            scenarios (int): Number of randomized flights
+            seed: Base seed for the per-batch random streams
+            callback: Called with the running EnduranceResult after each batch
+
+        Returns:
+            EnduranceResult
+        """
+        result = EnduranceResult()
+        tasks = self._tasks(scenarios, seed)
+        if not self._processes:
+            for partial in map(_run_task, tasks):
+                result.merge(partial)
+                if callback is not None:
+                    callback(result)
+            return result
+
+        with multiprocessing.Pool(self._workers) as pool:
+            for partial in pool.imap_unordered(_run_task, tasks):
+                result.merge(partial)
+                if callback is not None:
+                    callback(result)
+        return result
+
+    def __str__(self):
+        return (f"EnduranceEstimator({len(self._config.get('tanks', []))} tanks, "
+                f"{len(self._phases)} phases, {self._workers} workers)")
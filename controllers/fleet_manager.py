@@ -0,0 +1,344 @@
+import multiprocessing
+import os
+import zlib
+
+from controllers.fuel_transfer_controller import FuelTransferController
+from models.tank_store import STATUS_NAMES
+from utils.system_config import build_fuel_system
+
+
+class _ShardLog:
+    """Counts transfer records instead of printing one line per transfer"""
+
+    def __init__(self):
+        self.transfers = 0
+        self.failed_transfers = 0
+
+    def log_transfer(self, source_tank, destination_tank, amount, success):
+        self.transfers += 1
+        if not success:
+            self.failed_transfers += 1
+
+    def log_transfer_batch(self, applied, rejected, amount, tank_count, mode):
+        self.transfers += applied + rejected
+        self.failed_transfers += rejected
+
+    def log_alert(self, tank_id, alert_message):
+        pass
+
+
+class FleetShard:
+    """
+    The aircraft owned by one worker.
+
+    All requests arrive as lists of (operation, args) commands so that one
+    message to the worker can carry many transfers or readings. A command
+    list is not a transaction: the operations are checked up front, but if
+    one raises, the commands before it stay applied and the rest are not
+    run. Transfers report failure in their result instead of raising.
+    """
+
+    OPERATIONS = ("add_aircraft", "remove_aircraft", "transfer", "route_readings",
+                  "get_aircraft_status", "get_summary", "get_critical_aircraft")
+
+    def __init__(self):
+        self._aircraft = {}  # aircraft_id -> (FuelSystem, FuelTransferController)
+        self._log = _ShardLog()
+
+    def handle(self, commands):
+        """Run a list of (operation, args) commands and return their results"""
+        for operation, _ in commands:
+            if operation not in self.OPERATIONS:
+                raise ValueError(f"Unknown fleet operation: {operation}")
+        results = []
+        for operation, args in commands:
+            results.append(getattr(self, operation)(*args))
+        return results
+
+    def add_aircraft(self, aircraft_id, config):
+        fuel_system = build_fuel_system(config)
+        self._aircraft[aircraft_id] = (fuel_system, FuelTransferController(fuel_system, self._log))
+        return len(fuel_system.get_tank_ids())
+
+    def remove_aircraft(self, aircraft_id):
+        return self._aircraft.pop(aircraft_id, None) is not None
+
+    def transfer(self, aircraft_id, source_id, dest_id, amount):
+        entry = self._aircraft.get(aircraft_id)
+        if entry is None:
+            return False, f"Aircraft {aircraft_id} not found"
+        return entry[1].execute_transfer(source_id, dest_id, amount)
+
+    def route_readings(self, readings):
+        """
+        Apply (aircraft_id, sensor_id, value) readings.
+
+        Returns:
+            int: Readings applied to a tank
+        """
+        applied = 0
+        for aircraft_id, sensor_id, value in readings:
+            entry = self._aircraft.get(aircraft_id)
+            if entry is not None and entry[0].route_reading(sensor_id, value):
+                applied += 1
+        return applied
+
+    def get_aircraft_status(self, aircraft_id):
+        entry = self._aircraft.get(aircraft_id)
+        if entry is None:
+            return None
+        fuel_system = entry[0]
+        return {
+            "total_fuel": fuel_system.get_total_fuel(),
+            "fuel_percentage": fuel_system.get_system_fuel_percentage(),
+            "tanks": {tank_id: (tank.get_fuel_level(), tank.get_status())
+                      for tank_id, tank in fuel_system.get_all_tanks().items()}
+        }
+
+    def get_summary(self):
+        """Partial fleet aggregates for this shard (O(aircraft))"""
+        summary = {"aircraft": len(self._aircraft), "tanks": 0, "total_fuel": 0.0, "total_capacity": 0.0,
+                   "status_counts": dict.fromkeys(STATUS_NAMES, 0), "critical_aircraft": 0,
+                   "transfers": self._log.transfers, "failed_transfers": self._log.failed_transfers}
+        counts = summary["status_counts"]
+        for fuel_system, _ in self._aircraft.values():
+            aggregates = fuel_system.get_aggregates()
+            summary["tanks"] += len(fuel_system.get_tank_ids())
+            summary["total_fuel"] += aggregates.get_total_fuel()
+            summary["total_capacity"] += aggregates.get_total_capacity()
+            for status in STATUS_NAMES:
+                counts[status] += aggregates.count_status(status)
+            if aggregates.count_status("CRITICAL"):
+                summary["critical_aircraft"] += 1
+        return summary
+
+    def get_critical_aircraft(self):
+        return [aircraft_id for aircraft_id, (fuel_system, _) in self._aircraft.items()
+                if fuel_system.get_aggregates().count_status("CRITICAL")]
+
+
+def _run_shard(connection):
+    """Worker process loop: one FleetShard serving command lists until None arrives"""
+    shard = FleetShard()
+    while True:
+        commands = connection.recv()
+        if commands is None:
+            break
+        try:
+            connection.send((True, shard.handle(commands)))
+        except Exception as e:
+            connection.send((False, f"{type(e).__name__}: {e}"))
+    connection.close()
+
+
+class FleetManager:
+    """
+    Fleet-wide manager sharding aircraft FuelSystems across worker processes.
+
+    Each aircraft lives in exactly one shard, chosen by a stable hash of
+    its ID, so transfers and sensor readings go straight to the owning
+    worker. Requests are grouped per shard and sent as one message each;
+    fleet aggregates are scattered to every shard at once and the partial
+    results merged, so queries run on all cores in parallel.
+    """
+
+    def __init__(self, workers=None, processes=True):
+        """
+        Initialize fleet manager and start its workers.
+
+        Args:
+            workers (int): Number of shards (default: CPU count)
+            processes (bool): Run shards in worker processes; False keeps
+                              them in this process (small fleets, tests)
+        """
+        self._shard_count = workers or os.cpu_count() or 1
+        self._connections = []
+        self._processes = []
+        self._local_shards = []
+        if processes:
+            for _ in range(self._shard_count):
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_run_shard, args=(child,), daemon=True)
+                process.start()
+                child.close()
+                self._connections.append(parent)
+                self._processes.append(process)
+        else:
+            self._local_shards = [FleetShard() for _ in range(self._shard_count)]
+
+    def get_shard_count(self):
+        return self._shard_count
+
+    def get_shard(self, aircraft_id):
+        """Index of the shard that owns an aircraft"""
+        return zlib.crc32(aircraft_id.encode()) % self._shard_count
+
+    # Scatter/gather
+
+    def _scatter(self, commands_by_shard):
+        """
+        Send each shard its command list, then gather all replies.
+
+        If any shard fails, RuntimeError is raised after all replies are in.
+        The other shards' commands, and the failing shard's commands before
+        the error, have already been applied (see FleetShard).
+
+        Returns:
+            dict: shard index -> list of results
+        """
+        if self._local_shards:
+            replies = {}
+            for shard, commands in commands_by_shard.items():
+                try:
+                    replies[shard] = (True, self._local_shards[shard].handle(commands))
+                except Exception as e:
+                    replies[shard] = (False, f"{type(e).__name__}: {e}")
+            receive = replies.__getitem__
+        else:
+            if not self._connections:
+                raise RuntimeError("Fleet manager is closed")
+            for shard, commands in commands_by_shard.items():
+                self._connections[shard].send(commands)
+            receive = lambda shard: self._connections[shard].recv()
+        results = {}
+        errors = []
+        for shard in commands_by_shard:
+            ok, result = receive(shard)
+            if ok:
+                results[shard] = result
+            else:
+                errors.append(f"shard {shard}: {result}")
+        if errors:
+            raise RuntimeError("Fleet request failed (" + "; ".join(errors) + ")")
+        return results
+
+    def _route(self, operation, requests):
+        """Run one operation per request on the owning shards; results come back in request order"""
+        commands_by_shard = {}
+        positions = {}
+        for position, args in enumerate(requests):
+            shard = self.get_shard(args[0])
+            commands_by_shard.setdefault(shard, []).append((operation, args))
+            positions.setdefault(shard, []).append(position)
+        results = [None] * len(requests)
+        for shard, shard_results in self._scatter(commands_by_shard).items():
+            for position, result in zip(positions[shard], shard_results):
+                results[position] = result
+        return results
+
+    def _broadcast(self, operation):
+        return self._scatter({shard: [(operation, ())] for shard in range(self._shard_count)})
+
+    # Aircraft
+
+    def add_aircraft(self, aircraft_id, config):
+        """Build an aircraft's FuelSystem from a tank config in its shard"""
+        return self._route("add_aircraft", [(aircraft_id, config)])[0]
+
+    def add_fleet(self, configs):
+        """
+        Add many aircraft with one message per shard.
+
+        Args:
+            configs (dict): aircraft_id -> tank config dict
+
+        Returns:
+            int: Number of tanks created
+        """
+        return sum(self._route("add_aircraft", list(configs.items())))
+
+    def remove_aircraft(self, aircraft_id):
+        return self._route("remove_aircraft", [(aircraft_id,)])[0]
+
+    # Routing
+
+    def transfer(self, aircraft_id, source_id, dest_id, amount):
+        """
+        Execute a transfer on the aircraft's shard.
+
+        Returns:
+            tuple: (success, message)
+        """
+        return self._route("transfer", [(aircraft_id, source_id, dest_id, amount)])[0]
+
+    def execute_transfers(self, transfers):
+        """
+        Execute (aircraft_id, source_id, dest_id, amount) transfers across the fleet.
+
+        Returns:
+            list: (success, message) per transfer, in input order
+        """
+        return [tuple(result) for result in self._route("transfer", transfers)]
+
+    def route_readings(self, readings):
+        """
+        Route (aircraft_id, sensor_id, value) readings to the owning shards.
+
+        Returns:
+            int: Readings applied to a tank
+        """
+        batches = {}
+        for reading in readings:
+            batches.setdefault(self.get_shard(reading[0]), []).append(reading)
+        results = self._scatter({shard: [("route_readings", (batch,))] for shard, batch in batches.items()})
+        return sum(result[0] for result in results.values())
+
+    # Fleet queries
+
+    def get_aircraft_status(self, aircraft_id):
+        return self._route("get_aircraft_status", [(aircraft_id,)])[0]
+
+    def get_fleet_summary(self):
+        """
+        Fleet-wide aggregates gathered from every shard.
+
+        Returns:
+            dict: aircraft, tanks, total fuel/capacity, fuel percentage,
+                  tank status counts, aircraft with a critical tank, transfers
+        """
+        summary = {"aircraft": 0, "tanks": 0, "total_fuel": 0.0, "total_capacity": 0.0,
+                   "status_counts": dict.fromkeys(STATUS_NAMES, 0), "critical_aircraft": 0,
+                   "transfers": 0, "failed_transfers": 0}
+        for (partial,) in self._broadcast("get_summary").values():
+            for key, value in partial.items():
+                if key == "status_counts":
+                    for status, count in value.items():
+                        summary["status_counts"][status] += count
+                else:
+                    summary[key] += value
+        capacity = summary["total_capacity"]
+        summary["fuel_percentage"] = (summary["total_fuel"] / capacity) * 100 if capacity else 0
+        return summary
+
+    def get_critical_aircraft(self):
+        """IDs of aircraft with at least one critical tank"""
+        critical = []
+        for (aircraft,) in self._broadcast("get_critical_aircraft").values():
+            critical.extend(aircraft)
+        return sorted(critical)
+
+    # Lifecycle
+
+    def close(self):
+        """Stop the worker processes"""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __str__(self):
+        mode = "processes" if self._processes else "in-process"
+        return f"FleetManager: {self._shard_count} shards ({mode})"
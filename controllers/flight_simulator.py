@@ -0,0 +1,420 @@
+import json
+import time
+from array import array
+from collections import deque
+from itertools import compress, repeat
+from operator import add, gt, mul, ne, sub
+
+from models.status_classifier import get_thresholds
+from models.tank_store import STATUS_CODES, STATUS_NAMES
+from utils.system_config import build_fuel_system
+
+_CRITICAL = STATUS_CODES["CRITICAL"]
+_ALERT_SEVERITY = {"LOW": "WARNING", "CRITICAL": "CRITICAL"}
+
+
+def load_flight_profile(path):
+    """
+    Load a flight profile JSON file.
+
+    The file holds "phases" - a list of {"name", "minutes", "burn_rates"}
+    with burn rates in liters per hour per engine - and a "feed_schedule"
+    mapping a phase name (or "default") to {engine: [tank IDs in feed order]}.
+
+    Returns:
+        tuple: (phases, feed_schedule)
+    """
+    with open(path, 'r') as f:
+        profile = json.load(f)
+    return profile["phases"], profile["feed_schedule"]
+
+
+class FlightReport:
+    """Levels, status transitions and alerts from one FlightSimulator run"""
+
+    def __init__(self, layout, sample_times, samples, transitions, alerts, reserve_touched,
+                 starved, fuel_burned, duration, steps, wall_seconds):
+        self._layout = layout  # aircraft_id -> [(tank_id, simulation row)]
+        self._sample_times = sample_times
+        self._samples = samples  # One array of all simulation rows per sample time
+        self._transitions = transitions
+        self._alerts = alerts
+        self._reserve_touched = reserve_touched
+        self._starved = starved
+        self._fuel_burned = fuel_burned
+        self._duration = duration
+        self._steps = steps
+        self._wall_seconds = wall_seconds
+
+    def get_aircraft_ids(self):
+        return list(self._layout)
+
+    def get_sample_times(self):
+        """Sample times in seconds since departure"""
+        return list(self._sample_times)
+
+    def get_levels(self, aircraft_id):
+        """Fuel level of each tank at every sample time"""
+        return {tank_id: [sample[row] for sample in self._samples]
+                for tank_id, row in self._layout[aircraft_id]}
+
+    def get_final_levels(self, aircraft_id):
+        """Fuel level of each tank at the end of the flight"""
+        final = self._samples[-1]
+        return {tank_id: final[row] for tank_id, row in self._layout[aircraft_id]}
+
+    def get_remaining_fuel(self, aircraft_id):
+        return sum(self.get_final_levels(aircraft_id).values())
+
+    def get_fuel_burned(self, aircraft_id):
+        return self._fuel_burned[aircraft_id]
+
+    def get_transitions(self, aircraft_id=None):
+        """Status transitions as (seconds, aircraft_id, tank_id, old_status, new_status)"""
+        if aircraft_id is None:
+            return list(self._transitions)
+        return [t for t in self._transitions if t[1] == aircraft_id]
+
+    def get_alerts(self, aircraft_id=None, severity=None):
+        return [alert for alert in self._alerts
+                if (aircraft_id is None or alert["aircraft_id"] == aircraft_id)
+                and (severity is None or alert["severity"] == severity)]
+
+    def get_reserve_touched(self):
+        """Aircraft that had to feed from a reserve tank -> seconds when it started"""
+        return dict(self._reserve_touched)
+
+    def get_starved(self):
+        """Aircraft with an engine that ran out of feed -> seconds when it happened"""
+        return dict(self._starved)
+
+    def get_summary(self):
+        remaining = [self.get_remaining_fuel(aircraft_id) for aircraft_id in self._layout]
+        return {
+            "aircraft": len(self._layout),
+            "simulated_hours": self._duration / 3600,
+            "steps": self._steps,
+            "wall_seconds": self._wall_seconds,
+            "fuel_burned": sum(self._fuel_burned.values()),
+            "min_remaining_fuel": min(remaining, default=0.0),
+            "transitions": len(self._transitions),
+            "alerts": len(self._alerts),
+            "reserve_touched": len(self._reserve_touched),
+            "starved": len(self._starved),
+        }
+
+    def __str__(self):
+        summary = self.get_summary()
+        return (f"FlightReport({summary['aircraft']} aircraft, {summary['simulated_hours']:.1f}h, "
+                f"{summary['alerts']} alerts, {summary['reserve_touched']} reserve, "
+                f"{summary['starved']} starved)")
+
+
+class FlightSimulator:
+    """
+    Faster-than-real-time fuel burn over a flight profile.
+
+    Every aircraft's tank levels are copied into one flat array. Each step
+    draws each engine's burn from the first tank in its feed list that
+    still has fuel, for all aircraft at once: one pass over the fleet per
+    (engine, feed priority), with the per-aircraft work done by map() over
+    row lists. Statuses are reclassified in the same vectorized way after
+    every step to find transitions and raise alerts. A tank whose feed
+    fails mid-flight drops out of its feed lists from the next step. The
+    FuelSystems are written back once at the end of the run (one bulk
+    write per aircraft).
+    """
+
+    def __init__(self, phases, feed_schedule, step_seconds=60.0, sample_seconds=900.0):
+        """
+        Initialize the simulator.
+
+        Args:
+            phases: List of {"name", "minutes", "burn_rates": {engine: liters/hour}}
+            feed_schedule (dict): Phase name or "default" -> {engine: [tank IDs in feed order]}
+            step_seconds (float): Simulation time step
+            sample_seconds (float): Interval between recorded tank levels
+        """
+        if step_seconds <= 0 or sample_seconds <= 0:
+            raise ValueError("Step and sample intervals must be positive")
+        for phase in phases:
+            if phase["name"] not in feed_schedule and "default" not in feed_schedule:
+                raise ValueError(f"No feed schedule for phase {phase['name']}")
+        self._phases = phases
+        self._feed_schedule = feed_schedule
+        self._step_seconds = step_seconds
+        self._sample_seconds = sample_seconds
+        self._aircraft = {}  # aircraft_id -> (FuelSystem, burn factor, feed failures)
+
+    def _feeds(self, phase):
+        return self._feed_schedule.get(phase["name"], self._feed_schedule.get("default", {}))
+
+    def add_aircraft(self, aircraft_id, fuel_system, burn_factor=1.0, failures=None):
+        """
+        Add an aircraft to simulate.
+
+        Args:
+            aircraft_id (str): Aircraft identifier
+            fuel_system: The aircraft's FuelSystem
+            burn_factor (float): Multiplier on the profile's burn rates
+            failures (dict): tank_id -> seconds after departure from which the
+                             tank can no longer feed (failed pump or transfer);
+                             its remaining fuel is trapped
+
+        Raises:
+            ValueError: If a feed list or failure names a tank the aircraft does not have
+        """
+        for phase in self._phases:
+            for engine, tank_ids in self._feeds(phase).items():
+                for tank_id in tank_ids:
+                    if fuel_system.get_tank(tank_id) is None:
+                        raise ValueError(f"{aircraft_id}: {engine} feed tank {tank_id} not found")
+        for tank_id in failures or {}:
+            if fuel_system.get_tank(tank_id) is None:
+                raise ValueError(f"{aircraft_id}: failed tank {tank_id} not found")
+        self._aircraft[aircraft_id] = (fuel_system, burn_factor, dict(failures or {}))
+
+    def add_fleet(self, config, aircraft_ids, burn_factors=None, failures=None):
+        """
+        Build and add one FuelSystem per aircraft from a tank config dict.
+
+        Args:
+            config (dict): Tank config (the tank_config.json layout)
+            aircraft_ids: Aircraft identifiers
+            burn_factors: Optional burn factor per aircraft
+            failures: Optional feed failures dict per aircraft
+
+        Returns:
+            dict: aircraft_id -> FuelSystem
+        """
+        systems = {}
+        for i, aircraft_id in enumerate(aircraft_ids):
+            systems[aircraft_id] = build_fuel_system(config)
+            self.add_aircraft(aircraft_id, systems[aircraft_id],
+                              burn_factors[i] if burn_factors is not None else 1.0,
+                              failures[i] if failures is not None else None)
+        return systems
+
+    def get_aircraft_count(self):
+        return len(self._aircraft)
+
+    def get_duration(self):
+        """Total profile duration in seconds"""
+        return sum(phase["minutes"] * 60 for phase in self._phases)
+
+    def run(self):
+        """
+        Fly the whole profile.
+
+        Returns:
+            FlightReport
+        """
+        start = time.perf_counter()
+        aircraft_ids = list(self._aircraft)
+
+        # Flat simulation rows: every aircraft's tanks in turn
+        layout = {}
+        rows = {}  # (aircraft index, tank_id) -> simulation row
+        reserve_rows = set()
+        tanks = []
+        levels = array('d')
+        normal_limits = []
+        low_limits = []
+        for a, aircraft_id in enumerate(aircraft_ids):
+            layout[aircraft_id] = []
+            fuel_system = self._aircraft[aircraft_id][0]
+            thresholds = fuel_system.get_status_thresholds()
+            for tank_id, tank in fuel_system.get_all_tanks().items():
+                row = len(levels)
+                rows[a, tank_id] = row
+                layout[aircraft_id].append((tank_id, row))
+                tanks.append((a, tank))
+                if tank.get_tank_type() == "RESERVE":
+                    reserve_rows.add(row)
+                levels.append(tank.get_fuel_level())
+                # Same comparison as classify_statuses: fuel * 100 > threshold * capacity
+                normal, low = get_thresholds(tank.get_tank_type(), thresholds)
+                normal_limits.append(normal * tank.get_capacity())
+                low_limits.append(low * tank.get_capacity())
+        initial_fuel = [sum(levels[row] for _, row in layout[aircraft_id]) for aircraft_id in aircraft_ids]
+        # A failed tank's feed slots point at this always-empty row instead
+        dead_row = len(levels)
+        levels.append(0.0)
+        normal_limits.append(0.0)
+        low_limits.append(0.0)
+        pending_failures = sorted(((seconds, a, tank_id)
+                                   for a, aircraft_id in enumerate(aircraft_ids)
+                                   for tank_id, seconds in self._aircraft[aircraft_id][2].items()),
+                                  reverse=True)
+        failed = set()
+
+        statuses = self._classify(levels, normal_limits, low_limits)
+        transitions = []
+        alerts = []
+        reserve_touched = {}
+        starved = {}
+        sample_times = [0.0]
+        samples = [array('d', levels)]
+        next_sample = self._sample_seconds
+        elapsed = 0.0
+        steps = 0
+
+        for phase in self._phases:
+            plan = self._plan_phase(phase, aircraft_ids, rows, reserve_rows, failed, dead_row)
+            phase_seconds = phase["minutes"] * 60
+            full_steps, remainder = divmod(phase_seconds, self._step_seconds)
+            step_sizes = [self._step_seconds] * int(full_steps) + ([remainder] if remainder > 1e-9 else [])
+            demand_cache = {}
+            for dt in step_sizes:
+                if pending_failures and pending_failures[-1][0] <= elapsed:
+                    while pending_failures and pending_failures[-1][0] <= elapsed:
+                        _, a, tank_id = pending_failures.pop()
+                        failed.add((a, tank_id))
+                        tank = self._aircraft[aircraft_ids[a]][0].get_tank(tank_id)
+                        alerts.append(self._alert(aircraft_ids[a], tank, "WARNING", "FEED_FAILURE",
+                                                  f"{tank.get_name()} can no longer feed", elapsed,
+                                                  phase["name"], levels[rows[a, tank_id]]))
+                    plan = self._plan_phase(phase, aircraft_ids, rows, reserve_rows, failed, dead_row)
+                    demand_cache = {}
+                demands = demand_cache.get(dt)
+                if demands is None:
+                    demands = demand_cache[dt] = [(list(map(mul, factors, repeat(rate * dt / 3600))), priorities)
+                                                  for rate, factors, priorities in plan]
+                touched, short = self._step(levels, demands)
+                elapsed += dt
+                steps += 1
+
+                for a in touched:
+                    if a not in reserve_touched:
+                        reserve_touched[a] = elapsed
+                        alerts.append(self._alert(aircraft_ids[a], None, "CRITICAL", "RESERVE",
+                                                  "Feeding from reserve tank", elapsed, phase["name"]))
+                for a, engine in short:
+                    if a not in starved:
+                        starved[a] = elapsed
+                        alerts.append(self._alert(aircraft_ids[a], None, "CRITICAL", "FUEL_STARVATION",
+                                                  f"{engine} fuel starvation", elapsed, phase["name"]))
+
+                codes = self._classify(levels, normal_limits, low_limits)
+                if codes != statuses:
+                    for row in compress(range(len(codes)), map(ne, codes, statuses)):
+                        a, tank = tanks[row]
+                        old, new = STATUS_NAMES[statuses[row]], STATUS_NAMES[codes[row]]
+                        transitions.append((elapsed, aircraft_ids[a], tank.get_tank_id(), old, new))
+                        if new in _ALERT_SEVERITY:
+                            percentage = levels[row] / tank.get_capacity() * 100 if tank.get_capacity() else 0.0
+                            alerts.append(self._alert(aircraft_ids[a], tank, _ALERT_SEVERITY[new], "FUEL_LEVEL",
+                                                      f"{new} fuel level: {percentage:.1f}%", elapsed,
+                                                      phase["name"], levels[row]))
+                    statuses = codes
+
+                if elapsed >= next_sample - 1e-9:
+                    sample_times.append(elapsed)
+                    samples.append(array('d', levels))
+                    next_sample += self._sample_seconds
+
+        if sample_times[-1] != elapsed:
+            sample_times.append(elapsed)
+            samples.append(array('d', levels))
+
+        self._write_levels(aircraft_ids, layout, levels, statuses, reserve_rows, reserve_touched)
+        fuel_burned = {aircraft_id: initial_fuel[a] - sum(levels[row] for _, row in layout[aircraft_id])
+                       for a, aircraft_id in enumerate(aircraft_ids)}
+        return FlightReport(layout, sample_times, samples, transitions, alerts,
+                            {aircraft_ids[a]: t for a, t in reserve_touched.items()},
+                            {aircraft_ids[a]: t for a, t in starved.items()},
+                            fuel_burned, elapsed, steps, time.perf_counter() - start)
+
+    def _plan_phase(self, phase, aircraft_ids, rows, reserve_rows, failed, dead_row):
+        """
+        Per engine: (burn rate, per-aircraft burn factors, feed priorities).
+
+        Each feed priority is (simulation row per aircraft, reserve mask or
+        None, engine); failed (aircraft index, tank_id) pairs feed from
+        the dead row.
+        """
+        factors = [self._aircraft[aircraft_id][1] for aircraft_id in aircraft_ids]
+        plan = []
+        for engine, rate in sorted(phase["burn_rates"].items()):
+            tank_ids = self._feeds(phase).get(engine, [])
+            if rate <= 0 or not tank_ids:
+                continue
+            priorities = []
+            for tank_id in tank_ids:
+                feed_rows = [dead_row if (a, tank_id) in failed else rows[a, tank_id]
+                             for a in range(len(aircraft_ids))]
+                reserve_mask = [row in reserve_rows for row in feed_rows]
+                priorities.append((feed_rows, reserve_mask if any(reserve_mask) else None, engine))
+            plan.append((rate, factors, priorities))
+        return plan
+
+    @staticmethod
+    def _step(levels, demands):
+        """
+        Draw one step of burn from the feed tanks of every aircraft.
+
+        Engines are drawn one after another so that two engines feeding
+        from the same tank see each other's draw.
+
+        Returns:
+            tuple: (aircraft indices that drew from a reserve tank,
+                    (aircraft index, engine) pairs whose demand was not met)
+        """
+        touched = []
+        short = []
+        get_level, set_level = levels.__getitem__, levels.__setitem__
+        for remaining, priorities in demands:
+            engine = None
+            for feed_rows, reserve_mask, engine in priorities:
+                available = list(map(get_level, feed_rows))
+                drawn = list(map(min, available, remaining))
+                deque(map(set_level, feed_rows, map(sub, available, drawn)), maxlen=0)
+                if reserve_mask is not None:
+                    touched.extend(compress(range(len(drawn)), map(mul, drawn, reserve_mask)))
+                remaining = list(map(sub, remaining, drawn))
+                if not any(remaining):
+                    break
+            else:
+                short.extend(zip(compress(range(len(remaining)), remaining), repeat(engine)))
+        return touched, short
+
+    @staticmethod
+    def _classify(levels, normal_limits, low_limits):
+        scaled = list(map(mul, levels, repeat(100.0)))
+        return list(map(sub, repeat(_CRITICAL),
+                        map(add, map(gt, scaled, normal_limits), map(gt, scaled, low_limits))))
+
+    @staticmethod
+    def _alert(aircraft_id, tank, severity, alert_type, message, elapsed, phase, value=None):
+        return {
+            "aircraft_id": aircraft_id,
+            "tank_id": tank.get_tank_id() if tank is not None else None,
+            "tank_name": tank.get_name() if tank is not None else None,
+            "severity": severity,
+            "type": alert_type,
+            "message": message,
+            "value": value,
+            "time": elapsed,
+            "phase": phase,
+        }
+
+    def _write_levels(self, aircraft_ids, layout, levels, statuses, reserve_rows, reserve_touched):
+        """Write final levels and statuses into each aircraft's FuelSystem"""
+        for a, aircraft_id in enumerate(aircraft_ids):
+            fuel_system = self._aircraft[aircraft_id][0]
+            store_rows = []
+            fuel_levels = []
+            codes = []
+            for tank_id, row in layout[aircraft_id]:
+                tank = fuel_system.get_tank(tank_id)
+                store_rows.append(tank.get_row())
+                fuel_levels.append(levels[row])
+                codes.append(statuses[row])
+                if a in reserve_touched and row in reserve_rows:
+                    # Reserve use is already in the report's alerts; skip the notice
+                    tank.activate_emergency_mode(quiet=True)
+            fuel_system.get_store().write_rows(store_rows, {"fuel_level": fuel_levels, "status": codes})
+
+    def __str__(self):
+        return (f"FlightSimulator({len(self._aircraft)} aircraft, {len(self._phases)} phases, "
+                f"{self.get_duration() / 3600:.1f}h, {self._step_seconds:g}s steps)")
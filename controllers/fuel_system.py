@@ -4,18 +4,104 @@ sys.path.append('models')
 from models.main_fuel_tank import MainFuelTank
 from models.auxiliary_tank import AuxiliaryTank
 from models.reserve_tank import ReserveTank
+from models.tank_store import TankStore
+from models.status_classifier import update_statuses
+from models.tank_aggregates import TankAggregates
+from models.tank_indexes import TankIndexes
+from models.tank_events import TankEventBus
+from controllers.sensor_registry import SensorRegistry
+from controllers.tank_locks import TankLocks
 
 
 class FuelSystem:
     """Main fuel system controller - manages all tanks"""
     
-    def __init__(self):
+    def __init__(self, status_thresholds=None, check_consistency=False, reading_policy=None,
+                 detect_sensor_faults=False):
+        """
+        Initialize the fuel system.
+        
+        Args:
+            status_thresholds (dict): Optional tank type -> (normal_above, low_above)
+                                      percentages used by batch status checks and
+                                      whenever a tank's fuel changes
+            check_consistency (bool): Verify running totals and status buckets
+                                      against a full rescan on every query
+            reading_policy (ReadingPolicy): How sensor readings update tanks
+            detect_sensor_faults (bool): Drop readings from stuck, spiking or
+                                         drifting sensors before they reach tanks
+                                         (off by default)
+        """
         self._tanks = {}
+        self._store = TankStore()
+        self._store.status_thresholds = status_thresholds
+        self._aggregates = TankAggregates(self._store, check_consistency)
+        self._indexes = TankIndexes(self._store)
+        self._events = TankEventBus(self._store)
+        self._tank_locks = TankLocks()
+        self._sensors = SensorRegistry(self, reading_policy, detect_sensor_faults)
+        self._topology = None
+        self._status_thresholds = status_thresholds
         self._system_status = "INITIALIZING"
     
     def add_tank(self, tank):
-        """Add a tank to the system"""
-        self._tanks[tank.get_tank_id()] = tank
+        """
+        Add a tank to the system.
+        
+        The tank's state is moved into the system's TankStore so that
+        fleet-wide queries run over the store columns, and the tank is
+        reclassified with the system's thresholds.
+        """
+        tank_id = tank.get_tank_id()
+        existing = self._tanks.get(tank_id)
+        if existing is not None and existing is not tank:
+            self._store.release_row(existing.get_row())
+        self._store.adopt(tank)
+        if self._status_thresholds is not None:
+            tank._update_status()
+        self._tanks[tank_id] = tank
+        self._sensors.invalidate_tank(tank_id)
+        if self._topology is not None:
+            self._topology.mark_tanks((tank_id,))
+    
+    def get_store(self):
+        """Get the columnar store holding all tank state"""
+        return self._store
+    
+    def get_aggregates(self):
+        """Get the incrementally maintained totals and status buckets"""
+        return self._aggregates
+    
+    def get_indexes(self):
+        """Get the type, percentage and available capacity indexes"""
+        return self._indexes
+    
+    def get_event_bus(self):
+        """Get the bus publishing tank change events"""
+        return self._events
+    
+    def set_topology(self, topology):
+        """
+        Set the PlumbingTopology that transfers must follow (None allows any route).
+        
+        The system's tanks are marked as tanks in the topology, so routes
+        only pass through junctions.
+        """
+        if topology is not None:
+            topology.mark_tanks(self._tanks)
+            topology.warm_cache()  # Pay for the route solve here, not on the first transfer
+        self._topology = topology
+    
+    def get_topology(self):
+        return self._topology
+    
+    def get_status_thresholds(self):
+        """Get the tank type -> (normal_above, low_above) table (None: per-type defaults)"""
+        return self._status_thresholds
+    
+    def get_tank_locks(self):
+        """Get the per-tank locks shared by everything that moves fuel between tanks"""
+        return self._tank_locks
     
     def get_tank(self, tank_id):
         """Get tank by ID"""
@@ -29,13 +115,36 @@ class FuelSystem:
         """Get list of all tank IDs"""
         return list(self._tanks.keys())
     
+    # Sensors
+    
+    def add_sensor(self, sensor):
+        """Register a sensor with the system's sensor registry"""
+        self._sensors.add_sensor(sensor)
+    
+    def get_sensor(self, sensor_id):
+        """Get sensor by ID"""
+        return self._sensors.get_sensor(sensor_id)
+    
+    def get_sensor_registry(self):
+        """Get the registry indexing sensors by ID, tank and type"""
+        return self._sensors
+    
+    def route_reading(self, sensor_id, value, timestamp=None):
+        """
+        Apply a raw sensor reading to the sensor's tank.
+        
+        Returns:
+            Policy result (True or a Rejection), or None if not applied
+        """
+        return self._sensors.route_reading(sensor_id, value, timestamp)
+    
     def get_total_fuel(self):
-        """Calculate total fuel across all tanks"""
-        return sum(tank.get_fuel_level() for tank in self._tanks.values())
+        """Total fuel across all tanks (maintained incrementally)"""
+        return self._aggregates.get_total_fuel()
     
     def get_total_capacity(self):
-        """Calculate total capacity across all tanks"""
-        return sum(tank.get_capacity() for tank in self._tanks.values())
+        """Total capacity across all tanks (maintained incrementally)"""
+        return self._aggregates.get_total_capacity()
     
     def get_system_fuel_percentage(self):
         """Get overall system fuel percentage"""
@@ -52,35 +161,89 @@ class FuelSystem:
         """Set system status"""
         self._system_status = status
     
-    def get_tanks_by_status(self, status):
+    def refresh_statuses(self):
+        """
+        Reclassify every tank in one batch pass using the system thresholds.
+        
+        Returns:
+            List of tanks whose status changed
+        """
+        changed = update_statuses(self._store, self._status_thresholds)
+        return [self._store.get_tank(row) for row in changed]
+    
+    def get_tanks_by_status(self, status, refresh=False):
         """
         Get tanks with specific status.
         
         Args:
             status: Status to filter by (NORMAL, LOW, CRITICAL)
+            refresh: Reclassify all tanks before filtering
         
         Returns:
             List of tanks with that status
         """
-        return [tank for tank in self._tanks.values() if tank.get_status() == status]
+        if refresh:
+            self.refresh_statuses()
+        return self._aggregates.get_tanks_by_status(status)
+    
+    def get_tanks_by_type(self, tank_type):
+        """Get tanks of a tank type (MAIN, AUXILIARY, RESERVE)"""
+        return self._indexes.get_tanks_by_type(tank_type)
+    
+    def get_tanks_below_percentage(self, percentage, tank_type=None):
+        """Get tanks below a fuel percentage, emptiest first (amortized O(log n + k))"""
+        return self._indexes.get_tanks_below_percentage(percentage, tank_type)
     
-    def get_low_fuel_tanks(self):
+    def get_fullest_tanks(self, count, tank_type=None):
+        """Get the count fullest tanks by percentage, fullest first (amortized O(log n + k))"""
+        return self._indexes.get_fullest_tanks(count, tank_type)
+    
+    def get_low_fuel_tanks(self, refresh=False):
         """Get list of tanks with low or critical fuel"""
-        low_tanks = []
-        for tank in self._tanks.values():
-            status = tank.get_status()
-            if status in ["LOW", "CRITICAL"]:
-                low_tanks.append(tank)
-        return low_tanks
+        if refresh:
+            self.refresh_statuses()
+        return self._aggregates.get_tanks_by_statuses(("LOW", "CRITICAL"))
     
     def check_all_tanks(self):
         """
-        Check all tanks and return status summary.
+        Reclassify all tanks and return status summary.
         
         Returns:
             Dictionary with tank statuses
         """
+        self.refresh_statuses()
+        columns = self._store.to_columns()
+        return {
+            tank_id: status
+            for tank_id, status in zip(columns["tank_id"], columns["status"])
+            if tank_id is not None
+        }
+    
+    def to_dict(self):
+        """
+        Export all tank state in one pass over the store columns.
+        
+        Returns:
+            Dictionary with system status and a list of tank records
+        """
+        columns = self._store.to_columns()
+        tanks = [
+            {
+                "tank_id": tank_id,
+                "fuel_level": fuel_level,
+                "capacity": capacity,
+                "pressure": pressure,
+                "temperature": temperature,
+                "status": status
+            }
+            for tank_id, fuel_level, capacity, pressure, temperature, status in zip(
+                columns["tank_id"], columns["fuel_level"], columns["capacity"],
+                columns["pressure"], columns["temperature"], columns["status"])
+            if tank_id is not None
+        ]
         return {
-            tank_id: tank.get_status() 
-            for tank_id, tank in self._tanks.items()
+            "system_status": self._system_status,
+            "total_fuel_capacity": self.get_total_capacity(),
+            "current_total_fuel": self.get_total_fuel(),
+            "tanks": tanks
         }
\ No newline at end of file
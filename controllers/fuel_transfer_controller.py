@@ -1,16 +1,21 @@
 class FuelTransferController:
     """Controller for managing fuel transfers between tanks"""
     
-    def __init__(self, fuel_system, data_logger):
+    BATCH_MODES = ("ATOMIC", "BEST_EFFORT")
+    
+    def __init__(self, fuel_system, data_logger, journal=None):
         """
         Initialize transfer controller.
         
         Args:
             fuel_system: FuelSystem instance
             data_logger: DataLogger instance
+            journal: Optional TransferJournal recording successful transfers
         """
         self._fuel_system = fuel_system
         self._logger = data_logger
+        self._journal = journal
+        self._locks = fuel_system.get_tank_locks()
     
     def validate_transfer(self, source_id, dest_id, amount):
         """
@@ -19,10 +24,32 @@ class FuelTransferController:
         Returns:
             tuple: (is_valid, error_message)
         """
-        # Get tanks
         source = self._fuel_system.get_tank(source_id)
         dest = self._fuel_system.get_tank(dest_id)
+        return self._validate(source_id, source, dest_id, dest, amount)
+    
+    def _validate(self, source_id, source, dest_id, dest, amount):
+        is_valid, message = self._check_tanks(source_id, source, dest_id, dest, amount)
+        if is_valid:
+            is_valid, message = self._check_route(source_id, dest_id)
+        if not is_valid:
+            return False, message
+        
+        # Source has enough fuel
+        if source.get_fuel_level() < amount:
+            available = source.get_fuel_level()
+            return False, f"Insufficient fuel in source (available: {available:.1f}L)"
+        
+        # Destination has capacity
+        if dest.get_available_capacity() < amount:
+            available = dest.get_available_capacity()
+            return False, f"Insufficient capacity in destination (available: {available:.1f}L)"
         
+        return self._check_emergency_mode(source)
+    
+    @staticmethod
+    def _check_tanks(source_id, source, dest_id, dest, amount):
+        """Checks that do not depend on fuel levels (shared by single and batch transfers)"""
         if not source:
             return False, f"Source tank {source_id} not found"
         if not dest:
@@ -36,16 +63,17 @@ class FuelTransferController:
         if amount <= 0:
             return False, "Amount must be positive"
         
-        # Source has enough fuel
-        if source.get_fuel_level() < amount:
-            available = source.get_fuel_level()
-            return False, f"Insufficient fuel in source (available: {available:.1f}L)"
-        
-        # Destination has capacity
-        if dest.get_available_capacity() < amount:
-            available = dest.get_available_capacity()
-            return False, f"Insufficient capacity in destination (available: {available:.1f}L)"
-        
+        return True, "Valid"
+    
+    def _check_route(self, source_id, dest_id):
+        # Plumbing check (O(1) against the topology's cached routes)
+        topology = self._fuel_system.get_topology()
+        if topology is not None and not topology.is_reachable(source_id, dest_id):
+            return False, f"No fuel route from {source_id} to {dest_id}"
+        return True, "Valid"
+    
+    @staticmethod
+    def _check_emergency_mode(source):
         # Check reserve tank emergency mode
         if hasattr(source, 'is_emergency_mode'):
             if not source.is_emergency_mode():
@@ -57,31 +85,207 @@ class FuelTransferController:
         """
         Execute fuel transfer between tanks.
         
+        Validation and both fuel moves run while holding the two tanks'
+        locks, so concurrent transfers cannot lose updates. With a
+        synchronous journal the call returns only after the transfer's
+        record is on disk (concurrent callers share fsyncs).
+        
         Returns:
             tuple: (success, message)
         """
-        # Validate first
-        is_valid, message = self.validate_transfer(source_id, dest_id, amount)
-        if not is_valid:
-            self._logger.log_transfer(source_id, dest_id, amount, False)
-            return False, message
-        
-        # Get tanks
+        seq = None
+        with self._locks.hold((source_id, dest_id)):
+            success, message = self._transfer(source_id, dest_id, amount)
+            if success and self._journal is not None:
+                seq = self._journal.record_transfer(source_id, dest_id, amount)
+        if self._journal is not None:
+            self._journal.wait_durable(seq)
+        self._logger.log_transfer(source_id, dest_id, amount, success)
+        return success, message
+    
+    def _transfer(self, source_id, dest_id, amount):
+        # Get tanks once and validate them
         source = self._fuel_system.get_tank(source_id)
         dest = self._fuel_system.get_tank(dest_id)
+        is_valid, message = self._validate(source_id, source, dest_id, dest, amount)
+        if not is_valid:
+            return False, message
         
         # Remove from source
         if not source.remove_fuel(amount):
-            self._logger.log_transfer(source_id, dest_id, amount, False)
             return False, "Failed to remove fuel from source"
         
         # Add to destination
         if not dest.add_fuel(amount):
             # Rollback - add fuel back to source
             source.add_fuel(amount)
-            self._logger.log_transfer(source_id, dest_id, amount, False)
             return False, "Failed to add fuel to destination (rolled back)"
         
         # Success
-        self._logger.log_transfer(source_id, dest_id, amount, True)
-        return True, f"Successfully transferred {amount:.1f}L"
\ No newline at end of file
+        return True, f"Successfully transferred {amount:.1f}L"
+    
+    def execute_transfers(self, batch, mode="ATOMIC"):
+        """
+        Execute a batch of transfers with one validation pass and one log record.
+        
+        Transfers are validated against the net change of every tank
+        involved, so a tank may pass fuel on that it receives in the same
+        batch. Each tank is then written once with its final level. The
+        locks of all tanks in the batch are held from validation to apply.
+        
+        When a tank's net level would be out of bounds, every transfer that
+        drains it (or fills it) is reported as rejected. If a tank refuses
+        its final write, the writes already made are undone and the
+        transfers touching that tank are rejected too; only transfers whose
+        writes all succeeded are counted and journaled.
+        
+        Args:
+            batch: Sequence of (source_id, dest_id, amount) tuples
+            mode (str): "ATOMIC" applies all transfers or none;
+                        "BEST_EFFORT" skips the transfers that do not fit
+        
+        Returns:
+            tuple: (number of transfers applied, list of (batch index, error message))
+        """
+        if mode not in self.BATCH_MODES:
+            raise ValueError(f"Unknown batch mode: {mode}")
+        
+        tank_ids = set()
+        for source_id, dest_id, _ in batch:
+            tank_ids.add(source_id)
+            tank_ids.add(dest_id)
+        with self._locks.hold(tank_ids):
+            accepted, rejected, deltas = self._apply_batch(batch, mode)
+            seq = None
+            if self._journal is not None:
+                for index in accepted:
+                    seq = self._journal.record_transfer(*batch[index])
+        if seq is not None:
+            self._journal.commit()  # One fsync for the whole batch
+        
+        moved = sum(batch[index][2] for index in accepted)
+        self._logger.log_transfer_batch(len(accepted), len(rejected), moved,
+                                        sum(1 for delta in deltas.values() if delta), mode)
+        return len(accepted), rejected
+    
+    def _apply_batch(self, batch, mode):
+        get_tank = self._fuel_system.get_tank
+        tanks = {}
+        deltas = {}
+        accepted = []
+        rejected = []
+        
+        for index, (source_id, dest_id, amount) in enumerate(batch):
+            source = tanks.get(source_id)
+            if source is None:
+                source = tanks[source_id] = get_tank(source_id)
+            dest = tanks.get(dest_id)
+            if dest is None:
+                dest = tanks[dest_id] = get_tank(dest_id)
+            is_valid, message = self._check_tanks(source_id, source, dest_id, dest, amount)
+            if is_valid:
+                is_valid, message = self._check_route(source_id, dest_id)
+            if is_valid:
+                is_valid, message = self._check_emergency_mode(source)
+            if not is_valid:
+                rejected.append((index, message))
+                continue
+            accepted.append(index)
+            deltas[source_id] = deltas.get(source_id, 0.0) - amount
+            deltas[dest_id] = deltas.get(dest_id, 0.0) + amount
+        
+        overflowing = self._check_net_deltas(tanks, deltas)
+        if overflowing:
+            if mode == "ATOMIC":
+                for tank_id, message in overflowing:
+                    short = tanks[tank_id].get_fuel_level() + deltas[tank_id] < 0
+                    for index in accepted:
+                        if batch[index][0 if short else 1] == tank_id:
+                            rejected.append((index, f"{tank_id}: {message}"))
+                accepted = []
+            else:
+                accepted, deltas = self._fit_in_order(batch, accepted, tanks, rejected)
+        elif rejected and mode == "ATOMIC":
+            accepted = []
+        
+        # Apply: one write per tank with its final level
+        while accepted:
+            failed_id = self._write_levels(tanks, deltas)
+            if failed_id is None:
+                break
+            failed = [index for index in accepted if failed_id in batch[index][:2]]
+            for index in failed:
+                rejected.append((index, f"{failed_id}: Tank rejected its new fuel level"))
+            if mode == "ATOMIC":
+                accepted = []
+            else:
+                remaining = [index for index in accepted if index not in failed]
+                accepted, deltas = self._fit_in_order(batch, remaining, tanks, rejected)
+        
+        if not accepted:
+            deltas = {}
+        rejected.sort(key=lambda item: item[0])
+        return accepted, rejected, deltas
+    
+    @staticmethod
+    def _write_levels(tanks, deltas):
+        """
+        Write each tank's final level, undoing the batch if a tank refuses.
+        
+        Returns:
+            str: ID of the tank that rejected its write, or None if all succeeded
+        """
+        written = []
+        for tank_id, delta in deltas.items():
+            if delta:
+                tank = tanks[tank_id]
+                level = tank.get_fuel_level()
+                if not tank.set_fuel_level(level + delta):
+                    for done_id, old_level in reversed(written):
+                        tanks[done_id].set_fuel_level(old_level)
+                    return tank_id
+                written.append((tank_id, level))
+        return None
+    
+    @staticmethod
+    def _check_net_deltas(tanks, deltas):
+        """Return (tank_id, message) for every tank whose final level is out of bounds"""
+        problems = []
+        for tank_id, delta in deltas.items():
+            tank = tanks[tank_id]
+            level = tank.get_fuel_level() + delta
+            if level < 0:
+                problems.append((tank_id, f"Insufficient fuel (net {delta:.1f}L, "
+                                          f"available: {tank.get_fuel_level():.1f}L)"))
+            elif level > tank.get_capacity():
+                problems.append((tank_id, f"Insufficient capacity (net {delta:+.1f}L, "
+                                          f"available: {tank.get_available_capacity():.1f}L)"))
+        return problems
+    
+    @staticmethod
+    def _fit_in_order(batch, candidates, tanks, rejected):
+        """
+        Best-effort fallback when the net plan does not fit: accept transfers
+        in batch order while every running tank level stays within bounds.
+        
+        Returns:
+            tuple: (accepted indices, net deltas of the accepted transfers)
+        """
+        accepted = []
+        deltas = {}
+        for index in candidates:
+            source_id, dest_id, amount = batch[index]
+            source, dest = tanks[source_id], tanks[dest_id]
+            source_level = source.get_fuel_level() + deltas.get(source_id, 0.0)
+            dest_level = dest.get_fuel_level() + deltas.get(dest_id, 0.0)
+            if source_level < amount:
+                rejected.append((index, f"Insufficient fuel in source (available: {source_level:.1f}L)"))
+                continue
+            if dest.get_capacity() - dest_level < amount:
+                available = dest.get_capacity() - dest_level
+                rejected.append((index, f"Insufficient capacity in destination (available: {available:.1f}L)"))
+                continue
+            accepted.append(index)
+            deltas[source_id] = deltas.get(source_id, 0.0) - amount
+            deltas[dest_id] = deltas.get(dest_id, 0.0) + amount
+        return accepted, deltas
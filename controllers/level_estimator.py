@@ -0,0 +1,299 @@
+import threading
+from array import array
+from collections import deque
+from itertools import repeat
+from operator import add, mul, truediv
+
+from models.sensor_bank import SENSOR_TYPES
+from models.tank_store import StoreListener
+
+
+class LevelEstimator(StoreListener):
+    """
+    Kalman-style fuel level estimate per tank, fused from all its LEVEL sensors.
+
+    Each tank has a level estimate and its variance. predict() advances the
+    estimates by the known flow rates and grows the variance by the process
+    noise; update() folds in a batch of calibrated readings by inverse-variance
+    weighting, which is the Kalman update for a directly measured level.
+    Readings are scattered into per-tank sums and the per-tank update runs
+    over float64 columns, so a tick costs no per-sensor Python arithmetic.
+
+    Fuel moved outside the estimator (transfers, refuelling) is treated as
+    a known flow: the estimator listens to the FuelSystem's TankStore, and
+    before each step or query shifts the estimates of the tanks whose level
+    changed since it last saw them, so a query costs O(changed tanks), not
+    O(tanks). A tank that is replaced or resized is re-seeded from its
+    current level.
+
+    Let the estimator own the fuel level by ignoring LEVEL readings in the
+    registry's ReadingPolicy (ReadingPolicy(ignore=["LEVEL"])) and passing
+    the calibrated batch from route_batch() to step().
+    """
+
+    # Default variances (liters squared)
+    MEASUREMENT_VARIANCE = 25.0  # Per LEVEL reading
+    PROCESS_VARIANCE = 4.0  # Per second of unmodelled flow
+    INITIAL_VARIANCE = 10000.0
+
+    def __init__(self, fuel_system, measurement_variance=MEASUREMENT_VARIANCE,
+                 process_variance=PROCESS_VARIANCE, level_units="LITERS"):
+        """
+        Initialize estimator.
+
+        Args:
+            fuel_system: FuelSystem whose tanks and LEVEL sensors are fused
+            measurement_variance (float): Default variance of one LEVEL reading
+            process_variance (float): Variance added per second by predict()
+            level_units (str): "LITERS" or "PERCENT" for LEVEL readings
+        """
+        if level_units not in ("LITERS", "PERCENT"):
+            raise ValueError(f"Unknown level units: {level_units}")
+        self._fuel_system = fuel_system
+        self._registry = fuel_system.get_sensor_registry()
+        self._measurement_variance = measurement_variance
+        self._process_variance = process_variance
+        self._percent = level_units == "PERCENT"
+        self._sensor_variances = {}  # sensor_id -> variance override
+
+        self._tank_ids = []  # slot -> tank_id
+        self._slots = {}  # tank_id -> slot
+        self._slot_tanks = []  # slot -> tank object (None once removed)
+        self.level = array('d')
+        self.variance = array('d')
+        self._seen = array('d')  # slot -> tank level when last read or written
+        self._row_slot = array('l')  # bank row -> slot (-1 if not a LEVEL sensor)
+        self._row_weight = array('d')  # bank row -> 1 / measurement variance
+        self._row_scale = array('d')  # bank row -> liters per reading unit
+        self._row_slots = {}  # store row -> slot
+        self._sensor_layout = None  # (bank rows, sensor count) at the last rebuild
+        self._lock = threading.Lock()  # Guards the two fields below (set by store hooks)
+        self._dirty_rows = set()  # Store rows whose fuel level changed since the last sync
+        self._tanks_changed = True  # A tank was added, removed, resized or bulk-written
+        fuel_system.get_store().add_listener(self)
+
+    # Layout
+
+    def invalidate(self):
+        """Rebuild the tank and sensor layout on the next tick"""
+        with self._lock:
+            self._tanks_changed = True
+
+    # StoreListener hooks
+
+    def fuel_changed(self, row, old_level, new_level):
+        with self._lock:
+            self._dirty_rows.add(row)
+
+    def _tank_layout_changed(self, *args):
+        with self._lock:
+            self._tanks_changed = True
+
+    row_added = row_released = capacity_changed = store_reloaded = _tank_layout_changed
+
+    def _sync(self):
+        """Rebuild the layout if needed and shift estimates by fuel moved outside the estimator"""
+        with self._lock:
+            rebuild, dirty = self._tanks_changed, self._dirty_rows
+            self._tanks_changed = False
+            self._dirty_rows = set()
+        sensor_layout = (len(self._registry.get_bank()), self._registry.get_sensor_count())
+        if rebuild or sensor_layout != self._sensor_layout:
+            self._rebuild()
+            self._sensor_layout = sensor_layout
+        if rebuild:
+            slots = range(len(self._slot_tanks))
+        else:
+            row_slots = self._row_slots
+            slots = [row_slots[row] for row in dirty if row in row_slots]
+        level, seen, slot_tanks = self.level, self._seen, self._slot_tanks
+        for slot in slots:
+            tank = slot_tanks[slot]
+            if tank is not None:
+                current = tank.get_fuel_level()
+                level[slot] += current - seen[slot]
+                seen[slot] = current
+
+    def _rebuild(self):
+        tanks = self._fuel_system.get_all_tanks()
+        for slot, tank_id in enumerate(self._tank_ids):
+            if tanks.get(tank_id) is None:
+                self._slot_tanks[slot] = None
+        for tank_id, tank in tanks.items():
+            slot = self._slots.get(tank_id)
+            if slot is None:
+                self._slots[tank_id] = len(self._tank_ids)
+                self._tank_ids.append(tank_id)
+                self._slot_tanks.append(tank)
+                self.level.append(tank.get_fuel_level())
+                self.variance.append(self.INITIAL_VARIANCE)
+                self._seen.append(tank.get_fuel_level())
+            elif tank is not self._slot_tanks[slot]:
+                # Replaced by a new tank under the same ID: start over
+                self._slot_tanks[slot] = tank
+                self.level[slot] = self._seen[slot] = tank.get_fuel_level()
+                self.variance[slot] = self.INITIAL_VARIANCE
+        self._row_slots = {tank.get_row(): slot for slot, tank in enumerate(self._slot_tanks)
+                           if tank is not None}
+
+        bank = self._registry.get_bank()
+        rows = len(bank)
+        self._row_slot = array('l', repeat(-1, rows))
+        self._row_weight = array('d', repeat(0.0, rows))
+        self._row_scale = array('d', repeat(1.0, rows))
+        level_code = SENSOR_TYPES.index("LEVEL")
+        for sensor in self._registry.get_sensors_by_type("LEVEL"):
+            row = sensor.get_row()
+            tank = self._fuel_system.get_tank(sensor.get_tank_id())
+            if tank is None or bank.sensor_type[row] != level_code:
+                continue
+            variance = self._sensor_variances.get(sensor.get_sensor_id(), self._measurement_variance)
+            self._row_slot[row] = self._slots[sensor.get_tank_id()]
+            self._row_scale[row] = tank.get_capacity() / 100 if self._percent else 1.0
+            # Weight is per liter squared, so scale percent readings' variance too
+            self._row_weight[row] = 1.0 / (variance * self._row_scale[row] ** 2)
+
+    def set_sensor_variance(self, sensor_id, variance):
+        """Override the measurement variance of one sensor (in reading units squared)"""
+        self._sensor_variances[sensor_id] = variance
+        self.invalidate()
+
+    def reset_tank(self, tank_id, level=None, variance=INITIAL_VARIANCE):
+        """Restart a tank's estimate (default: from its current fuel level)"""
+        self._sync()
+        slot = self._slots.get(tank_id)
+        if slot is None:
+            return False
+        if level is None:
+            level = self._seen[slot]
+        self.level[slot] = level
+        self.variance[slot] = variance
+        return True
+
+    # Filter steps
+
+    def predict(self, dt, flow_rates=None):
+        """
+        Advance every estimate by dt seconds.
+
+        Args:
+            dt (float): Elapsed time in seconds
+            flow_rates (dict): Optional tank_id -> net inflow in liters per second
+        """
+        self._sync()
+        if flow_rates:
+            level, slots = self.level, self._slots
+            for tank_id, rate in flow_rates.items():
+                slot = slots.get(tank_id)
+                if slot is not None:
+                    level[slot] += rate * dt
+        self.variance = array('d', map(add, self.variance, repeat(self._process_variance * dt)))
+
+    def update(self, values, indices=None, mask=None):
+        """
+        Fuse a batch of calibrated readings into the estimates.
+
+        Readings from sensors that are not LEVEL sensors of a known tank,
+        or whose mask entry is 0, carry no weight.
+
+        Args:
+            values: Calibrated readings (e.g. from SensorRegistry.route_batch)
+            indices: Bank row per reading (default: one reading per row, in order)
+            mask: Optional operational mask per reading
+
+        Returns:
+            list: IDs of the tanks that received at least one reading
+        """
+        self._sync()
+        row_slot, row_weight, row_scale = self._row_slot, self._row_weight, self._row_scale
+        if indices is None:
+            slots, weights, scales = row_slot[:len(values)], row_weight[:len(values)], row_scale[:len(values)]
+        else:
+            slots = array('l', map(row_slot.__getitem__, indices))
+            weights = array('d', map(row_weight.__getitem__, indices))
+            scales = map(row_scale.__getitem__, indices)
+        if mask is not None:
+            weights = array('d', map(mul, weights, mask))
+        liters = map(mul, values, scales)
+
+        # Scatter-add into per-tank sums; non-LEVEL rows land in the spare
+        # last slot (-1) and are discarded
+        count = len(self._tank_ids)
+        weight_sum = array('d', repeat(0.0, count + 1))
+        info_sum = array('d', repeat(0.0, count + 1))
+        deque(map(weight_sum.__setitem__, slots,
+                  map(add, map(weight_sum.__getitem__, slots), weights)), maxlen=0)
+        deque(map(info_sum.__setitem__, slots,
+                  map(add, map(info_sum.__getitem__, slots), map(mul, weights, liters))), maxlen=0)
+        del weight_sum[count], info_sum[count]
+
+        # Information form: 1/P' = 1/P + sum(w), x' = P' * (x/P + sum(w*z))
+        prior_info = array('d', map(truediv, repeat(1.0), self.variance))
+        posterior_info = array('d', map(add, prior_info, weight_sum))
+        self.level = array('d', map(truediv, map(add, map(mul, self.level, prior_info), info_sum),
+                                    posterior_info))
+        self.variance = array('d', map(truediv, repeat(1.0), posterior_info))
+
+        tank_ids = self._tank_ids
+        return [tank_ids[slot] for slot in range(count) if weight_sum[slot]]
+
+    def apply(self, tank_ids=None):
+        """
+        Write estimates into the tanks, clamped to 0..capacity.
+
+        Each tank is written under its lock from the FuelSystem's TankLocks.
+
+        Args:
+            tank_ids: Tanks to write (default: all)
+
+        Returns:
+            int: Number of tanks written
+        """
+        self._sync()
+        locks = self._fuel_system.get_tank_locks()
+        written = 0
+        for tank_id in (self._tank_ids if tank_ids is None else tank_ids):
+            tank = self._fuel_system.get_tank(tank_id)
+            if tank is None:
+                continue
+            slot = self._slots[tank_id]
+            with locks.get_lock(tank_id):
+                level = min(max(self.level[slot], 0.0), tank.get_capacity())
+                if level != tank.get_fuel_level() and tank.set_fuel_level(level):
+                    written += 1
+                self._seen[slot] = tank.get_fuel_level()
+        return written
+
+    def step(self, values, indices=None, mask=None, dt=0.0, flow_rates=None):
+        """
+        Run one tick: predict, fuse the readings and write the updated tanks.
+
+        Returns:
+            int: Number of tanks written
+        """
+        if dt:
+            self.predict(dt, flow_rates)
+        return self.apply(self.update(values, indices, mask))
+
+    # Queries
+
+    def get_estimate(self, tank_id):
+        """
+        Get a tank's fused level estimate.
+
+        Returns:
+            tuple: (level in liters, variance) or None for unknown tanks
+        """
+        self._sync()
+        slot = self._slots.get(tank_id)
+        if slot is None:
+            return None
+        return self.level[slot], self.variance[slot]
+
+    def get_confidence(self, tank_id):
+        """Return the estimate's standard deviation in liters (None for unknown tanks)"""
+        estimate = self.get_estimate(tank_id)
+        return None if estimate is None else estimate[1] ** 0.5
+
+    def __str__(self):
+        return f"LevelEstimator: {len(self._tank_ids)} tanks"
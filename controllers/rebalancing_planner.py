@@ -0,0 +1,216 @@
+from collections import deque
+
+INFINITY = float("inf")
+
+
+class RebalancingPlanner:
+    """
+    Plans the transfers that bring tanks to target levels in one solve.
+
+    The plan is a transportation problem: tanks above target supply fuel,
+    tanks below target demand it. Costs are per tank (drawing from an
+    auxiliary tank is cheaper than from a main tank, and a reserve tank is
+    a last resort), and the plan is the minimum-cost maximum flow from
+    sources to destinations, found by successive shortest paths. A source
+    is re-routed when that lets fuel reach a destination only it can
+    supply, so the plan moves as much fuel as the connected pairs allow.
+    Reserve tanks only supply fuel in emergency mode, and fuel only moves
+    between tanks holding the same fuel type.
+
+    When the FuelSystem has a PlumbingTopology, only pairs with an open
+    route are matched, and with a planning window each move is capped at
+    what the route's capacity delivers in that time.
+
+    The resulting batch can be run with FuelTransferController.execute_transfers.
+    """
+
+    # Relative cost per liter drawn from / delivered to each tank type
+    SOURCE_COSTS = {"AUXILIARY": 0.0, "MAIN": 1.0, "RESERVE": 10.0}
+    DEST_COSTS = {"MAIN": 0.0, "AUXILIARY": 1.0, "RESERVE": 2.0}
+    MIN_TRANSFER = 0.1  # Liters; smaller imbalances are left alone
+
+    def __init__(self, fuel_system, source_costs=None, dest_costs=None, window_seconds=None):
+        """
+        Initialize planner.
+
+        Args:
+            fuel_system: FuelSystem whose tanks are planned
+            source_costs (dict): Optional tank type -> cost of drawing fuel
+            dest_costs (dict): Optional tank type -> cost of delivering fuel
+            window_seconds (float): Time the moves may take; each move is capped at
+                                    route capacity * window (default: no cap)
+        """
+        if window_seconds is not None and window_seconds <= 0:
+            raise ValueError("Planning window must be positive")
+        self._fuel_system = fuel_system
+        self._window = window_seconds
+        self._source_costs = source_costs if source_costs is not None else self.SOURCE_COSTS
+        self._dest_costs = dest_costs if dest_costs is not None else self.DEST_COSTS
+
+    def plan(self, targets):
+        """
+        Plan transfers that move the given tanks towards target levels.
+
+        Tanks not in targets are left alone. When supply and demand differ,
+        the cheapest sources are drained and the cheapest destinations
+        filled first; the rest is reported as unmet.
+
+        Args:
+            targets (dict): tank_id -> target fuel level in liters
+
+        Returns:
+            tuple: (list of (source_id, dest_id, amount) transfers,
+                    dict of tank_id -> liters still above (+) or below (-) target)
+        """
+        by_fuel_type = {}
+        unmet = {}
+        for tank_id, target in targets.items():
+            tank = self._fuel_system.get_tank(tank_id)
+            if tank is None:
+                raise ValueError(f"Tank {tank_id} not found")
+            if target < 0 or target > tank.get_capacity():
+                raise ValueError(f"Target {target:.1f}L for {tank_id} outside 0-{tank.get_capacity():.1f}L")
+            delta = tank.get_fuel_level() - target
+            if abs(delta) < self.MIN_TRANSFER:
+                continue
+            sources, dests = by_fuel_type.setdefault(tank.get_fuel_type(), ([], []))
+            tank_type = tank.get_tank_type()
+            if delta > 0:
+                if not self._can_supply(tank):
+                    unmet[tank_id] = delta  # Reserve fuel is locked outside emergencies
+                    continue
+                sources.append((self._source_costs.get(tank_type, 1.0), tank_id, delta))
+            else:
+                dests.append((self._dest_costs.get(tank_type, 1.0), tank_id, -delta))
+
+        transfers = []
+        for sources, dests in by_fuel_type.values():
+            self._match(sorted(sources), sorted(dests), transfers, unmet)
+        return transfers, unmet
+
+    def _match(self, sources, dests, transfers, unmet):
+        """
+        Route supplies to demands as a minimum-cost maximum flow.
+
+        Network: super source -> source (its supply, at its cost) ->
+        destination (connected pairs only, capped by the planning window) ->
+        super sink (its demand, at its cost). Each round augments along the
+        cheapest residual path; paths may undo an earlier match, whose
+        reverse edge has negative cost, so Bellman-Ford (SPFA) is used.
+        """
+        topology = self._fuel_system.get_topology()
+        window = self._window
+        # Nodes: 0 super source, 1..S sources, S+1..S+D destinations, S+D+1 super sink
+        first_dest = len(sources) + 1
+        sink = first_dest + len(dests)
+        edges = [[] for _ in range(sink + 1)]  # node -> edge indices
+        head, capacity, cost = [], [], []  # per edge; edge ^ 1 is its reverse
+
+        def add_edge(u, v, edge_capacity, edge_cost):
+            edges[u].append(len(head))
+            head.extend((v, u))
+            capacity.extend((edge_capacity, 0.0))
+            cost.extend((edge_cost, -edge_cost))
+            edges[v].append(len(head) - 1)
+            return len(head) - 2
+
+        source_edges = [add_edge(0, i, supply, source_cost)
+                        for i, (source_cost, _, supply) in enumerate(sources, 1)]
+        dest_edges = [add_edge(j, sink, demand, dest_cost)
+                      for j, (dest_cost, _, demand) in enumerate(dests, first_dest)]
+        pair_edges = []
+        for i, (_, source_id, _) in enumerate(sources, 1):
+            for j, (_, dest_id, _) in enumerate(dests, first_dest):
+                limit = INFINITY
+                if topology is not None:
+                    rate = topology.get_route_capacity(source_id, dest_id)
+                    if not rate:
+                        continue
+                    if window is not None:
+                        limit = rate * window
+                pair_edges.append((source_id, dest_id, add_edge(i, j, limit, 0.0)))
+
+        epsilon = 1e-9
+        while True:
+            dist = [INFINITY] * (sink + 1)
+            via = [-1] * (sink + 1)
+            queued = [False] * (sink + 1)
+            dist[0] = 0.0
+            queue = deque([0])
+            while queue:
+                u = queue.popleft()
+                queued[u] = False
+                for edge in edges[u]:
+                    v = head[edge]
+                    if capacity[edge] > epsilon and dist[u] + cost[edge] < dist[v] - epsilon:
+                        dist[v] = dist[u] + cost[edge]
+                        via[v] = edge
+                        if not queued[v]:
+                            queued[v] = True
+                            queue.append(v)
+            if dist[sink] == INFINITY:
+                break
+            path = []
+            node = sink
+            while node:
+                path.append(via[node])
+                node = head[via[node] ^ 1]
+            push = min(capacity[edge] for edge in path)
+            for edge in path:
+                capacity[edge] -= push
+                capacity[edge ^ 1] += push
+
+        for source_id, dest_id, edge in pair_edges:
+            amount = capacity[edge ^ 1]  # Flow on the pair
+            if amount >= self.MIN_TRANSFER:
+                transfers.append((source_id, dest_id, round(amount, 6)))
+        # Whatever is left could not be routed
+        for (_, tank_id, _), edge in zip(sources, source_edges):
+            if capacity[edge] >= self.MIN_TRANSFER:
+                unmet[tank_id] = capacity[edge]
+        for (_, tank_id, _), edge in zip(dests, dest_edges):
+            if capacity[edge] >= self.MIN_TRANSFER:
+                unmet[tank_id] = -capacity[edge]
+
+    def balance_targets(self, groups, drain=()):
+        """
+        Build targets that level groups of tanks, topping them up from drain tanks.
+
+        Tanks in a group end at the same fill percentage. Fuel in the drain
+        tanks (e.g. auxiliary tanks) is moved into the groups first, as far
+        as the groups have room.
+
+        Args:
+            groups: Sequence of tank ID sequences, e.g. [("LEFT_MAIN", "RIGHT_MAIN")]
+            drain: Tank IDs to empty into the groups
+
+        Returns:
+            dict: tank_id -> target level, for plan()
+        """
+        get_tank = self._fuel_system.get_tank
+        drained = [get_tank(tank_id) for tank_id in drain]
+        drained = [tank for tank in drained if self._can_supply(tank)]
+        targets = {tank.get_tank_id(): 0.0 for tank in drained}
+        available = sum(tank.get_fuel_level() for tank in drained)
+
+        for group in groups:
+            tanks = [get_tank(tank_id) for tank_id in group]
+            fuel = sum(tank.get_fuel_level() for tank in tanks)
+            capacity = sum(tank.get_capacity() for tank in tanks)
+            topped_up = min(available, capacity - fuel)
+            available -= topped_up
+            fill = (fuel + topped_up) / capacity if capacity else 0.0
+            for tank in tanks:
+                targets[tank.get_tank_id()] = fill * tank.get_capacity()
+        return targets
+
+    @staticmethod
+    def _can_supply(tank):
+        return not hasattr(tank, 'is_emergency_mode') or tank.is_emergency_mode()
+
+    def plan_balance(self, groups, drain=()):
+        """Shortcut for plan(balance_targets(groups, drain))"""
+        return self.plan(self.balance_targets(groups, drain))
+
+    def __str__(self):
+        return f"RebalancingPlanner: {len(self._fuel_system.get_all_tanks())} tanks"
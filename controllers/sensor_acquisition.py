@@ -0,0 +1,266 @@
+import asyncio
+import heapq
+import inspect
+import time
+
+
+class AcquisitionService:
+    """
+    asyncio service that samples registered sensors at per-sensor rates.
+
+    One scheduler task keeps a heap of sensor deadlines and polls every
+    sensor that is due; readings go through a bounded queue to a consumer
+    task that routes them into the SensorRegistry in batches. When the
+    consumer falls behind, the queue fills and either blocks the scheduler
+    (backpressure) or drops samples, depending on the overflow policy.
+    Pushed readings (e.g. from a network bridge) use submit().
+    """
+
+    OVERFLOW_POLICIES = ("BLOCK", "DROP_NEWEST", "DROP_OLDEST")
+
+    def __init__(self, registry, read_sensor=None, queue_size=1024, overflow="BLOCK",
+                 batch_size=256, clock=time.monotonic):
+        """
+        Initialize service.
+
+        Args:
+            registry: SensorRegistry receiving the readings
+            read_sensor: Callable (or coroutine function) sensor -> raw value,
+                         used for polled sensors
+            queue_size (int): Maximum readings waiting for the consumer
+            overflow (str): BLOCK, DROP_NEWEST or DROP_OLDEST when the queue is full
+            batch_size (int): Maximum readings routed per consumer batch
+            clock: Monotonic time source in seconds
+        """
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._registry = registry
+        self._read_sensor = read_sensor
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._batch_size = batch_size
+        self._clock = clock
+
+        self._schedule = []  # Heap of (deadline, generation, sensor_id)
+        self._periods = {}  # sensor_id -> period in seconds
+        self._generations = {}  # sensor_id -> generation of its live heap entry
+        self._queue = None
+        self._stop_event = None
+        self._running = False
+
+        self._samples_acquired = 0
+        self._samples_routed = 0
+        self._samples_dropped = 0
+        self._deadlines_missed = 0
+        self._route_errors = 0
+        self._read_errors = 0
+        self._max_lateness = 0.0
+        self._queue_high_water = 0
+
+    # Scheduling
+
+    def schedule(self, sensor_id, rate_hz):
+        """
+        Poll a sensor at the given rate (replaces any previous rate).
+
+        Returns:
+            tuple: (success, message)
+        """
+        if self._registry.get_sensor(sensor_id) is None:
+            return False, f"Sensor {sensor_id} not registered"
+        if rate_hz <= 0:
+            return False, "Rate must be positive"
+        first = sensor_id not in self._periods
+        self._periods[sensor_id] = 1.0 / rate_hz
+        if first:
+            generation = self._generations.get(sensor_id, 0) + 1
+            self._generations[sensor_id] = generation
+            heapq.heappush(self._schedule, (self._clock(), generation, sensor_id))
+        return True, "Scheduled"
+
+    def schedule_all(self, rate_hz):
+        """Poll every registered sensor at the same rate"""
+        for sensor_id in self._registry.get_sensor_ids():
+            self.schedule(sensor_id, rate_hz)
+
+    def unschedule(self, sensor_id):
+        """Stop polling a sensor (its heap entry is dropped when it comes due)"""
+        self._periods.pop(sensor_id, None)
+
+    def get_scheduled_count(self):
+        return len(self._periods)
+
+    # Running
+
+    async def run(self, duration=None):
+        """
+        Run the scheduler and consumer until stop() is called or duration elapses.
+
+        Args:
+            duration (float): Optional run time in seconds
+        """
+        self._queue = asyncio.Queue(self._queue_size)
+        self._stop_event = asyncio.Event()
+        self._running = True
+        scheduler = asyncio.create_task(self._scheduler_loop())
+        consumer = asyncio.create_task(self._consumer_loop())
+        try:
+            if duration is None:
+                await self._stop_event.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), duration)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._running = False
+            scheduler.cancel()
+            await asyncio.gather(scheduler, return_exceptions=True)
+            # Let the consumer drain what is already queued
+            await self._queue.join()
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+
+    def stop(self):
+        """Ask a running service to stop"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def is_running(self):
+        return self._running
+
+    async def submit(self, sensor_id, value, timestamp=None):
+        """
+        Push a reading from an external source.
+
+        Waits for queue space under the BLOCK policy (backpressure).
+
+        Returns:
+            bool: True if the reading was queued
+        """
+        sensor = self._registry.get_sensor(sensor_id)
+        if sensor is None or self._queue is None:
+            return False
+        self._samples_acquired += 1
+        return await self._enqueue((sensor.get_row(), time.time() if timestamp is None else timestamp, value))
+
+    async def _enqueue(self, item):
+        queue = self._queue
+        if queue.full():
+            if self._overflow == "BLOCK":
+                await queue.put(item)
+            elif self._overflow == "DROP_NEWEST":
+                self._samples_dropped += 1
+                return False
+            else:
+                queue.get_nowait()
+                queue.task_done()
+                self._samples_dropped += 1
+                queue.put_nowait(item)
+        else:
+            queue.put_nowait(item)
+        self._queue_high_water = max(self._queue_high_water, queue.qsize())
+        return True
+
+    async def _scheduler_loop(self):
+        clock = self._clock
+        schedule = self._schedule
+        while True:
+            if not schedule:
+                await asyncio.sleep(0.01)
+                continue
+
+            delay = schedule[0][0] - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            now = clock()
+            while schedule and schedule[0][0] <= now:
+                deadline, generation, sensor_id = heapq.heappop(schedule)
+                period = self._periods.get(sensor_id)
+                if period is None or generation != self._generations[sensor_id]:
+                    continue  # Unscheduled (or rescheduled with a newer entry)
+
+                lateness = now - deadline
+                if lateness > self._max_lateness:
+                    self._max_lateness = lateness
+                next_deadline = deadline + period
+                if next_deadline <= now:
+                    # Skip the periods we could not service instead of bursting
+                    missed = int(lateness // period)
+                    self._deadlines_missed += missed
+                    next_deadline = deadline + (missed + 1) * period
+                heapq.heappush(schedule, (next_deadline, generation, sensor_id))
+
+                await self._poll(sensor_id)
+
+    async def _poll(self, sensor_id):
+        if self._read_sensor is None:
+            return
+        sensor = self._registry.get_sensor(sensor_id)
+        if sensor is None:
+            self._periods.pop(sensor_id, None)
+            return
+        try:
+            value = self._read_sensor(sensor)
+            if inspect.isawaitable(value):
+                value = await value
+        except Exception as e:
+            # One failing sensor must not stop the scheduler; it stays scheduled
+            self._read_errors += 1
+            print(f"Error reading sensor {sensor_id}: {e}")
+            return
+        if value is None:
+            return
+        self._samples_acquired += 1
+        await self._enqueue((sensor.get_row(), time.time(), value))
+
+    async def _consumer_loop(self):
+        queue = self._queue
+        while True:
+            rows, timestamps, values = [], [], []
+            row, timestamp, value = await queue.get()
+            rows.append(row)
+            timestamps.append(timestamp)
+            values.append(value)
+            while len(rows) < self._batch_size and not queue.empty():
+                row, timestamp, value = queue.get_nowait()
+                rows.append(row)
+                timestamps.append(timestamp)
+                values.append(value)
+            try:
+                self._registry.route_batch(values, indices=rows, timestamps=timestamps)
+                self._samples_routed += len(rows)
+            except Exception as e:
+                self._route_errors += 1
+                print(f"Error routing sensor readings: {e}")
+            for _ in rows:
+                queue.task_done()
+            # Yield so the scheduler keeps its deadlines under load
+            await asyncio.sleep(0)
+
+    # Metrics
+
+    def get_metrics(self):
+        """
+        Get acquisition metrics.
+
+        Returns:
+            Dictionary with sample counts, missed deadlines, errors and queue usage
+        """
+        return {
+            "scheduled_sensors": len(self._periods),
+            "samples_acquired": self._samples_acquired,
+            "samples_routed": self._samples_routed,
+            "samples_dropped": self._samples_dropped,
+            "deadlines_missed": self._deadlines_missed,
+            "route_errors": self._route_errors,
+            "read_errors": self._read_errors,
+            "max_lateness": self._max_lateness,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_high_water": self._queue_high_water
+        }
+
+    def __str__(self):
+        return (f"AcquisitionService: {len(self._periods)} sensors, "
+                f"{self._samples_routed} samples routed, {self._deadlines_missed} deadlines missed")
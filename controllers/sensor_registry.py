@@ -0,0 +1,251 @@
+from array import array
+
+from models.sensor_bank import DEFAULT_BANK, SensorBank, SENSOR_TYPES
+from models.sensor_faults import SensorFaultDetector
+
+
+class ReadingPolicy:
+    """
+    Policy for turning calibrated sensor readings into tank updates.
+
+    By default LEVEL readings (liters) set the fuel level, PRESSURE readings
+    set the pressure and TEMPERATURE readings set the temperature. Each
+    sensor type's handler can be replaced or disabled.
+    """
+
+    def __init__(self, level_units="LITERS", ignore=()):
+        """
+        Initialize policy.
+
+        Args:
+            level_units (str): "LITERS" or "PERCENT" for LEVEL readings
+            ignore: Sensor types whose readings should not update tanks
+        """
+        if level_units not in ("LITERS", "PERCENT"):
+            raise ValueError(f"Unknown level units: {level_units}")
+        self._handlers = {
+            "LEVEL": self._apply_level_percent if level_units == "PERCENT" else self._apply_level,
+            "PRESSURE": self._apply_pressure,
+            "TEMPERATURE": self._apply_temperature
+        }
+        for sensor_type in ignore:
+            self._handlers[sensor_type] = None
+
+    def set_handler(self, sensor_type, handler):
+        """
+        Replace the handler for a sensor type.
+
+        Args:
+            sensor_type (str): Sensor type name
+            handler: Callable (tank, value) -> result, or None to ignore the type
+        """
+        self._handlers[sensor_type] = handler
+
+    def get_handler(self, sensor_type):
+        return self._handlers.get(sensor_type)
+
+    def apply(self, tank, sensor_type, value):
+        """
+        Apply one reading to a tank.
+
+        Returns:
+            Handler result (True or a Rejection), or None if the type is ignored
+        """
+        handler = self._handlers.get(sensor_type)
+        if handler is None:
+            return None
+        return handler(tank, value)
+
+    @staticmethod
+    def _apply_level(tank, value):
+        return tank.set_fuel_level(value)
+
+    @staticmethod
+    def _apply_level_percent(tank, value):
+        return tank.set_fuel_level(tank.get_capacity() * value / 100)
+
+    @staticmethod
+    def _apply_pressure(tank, value):
+        return tank.set_pressure(value)
+
+    @staticmethod
+    def _apply_temperature(tank, value):
+        return tank.set_temperature(value)
+
+
+class SensorRegistry:
+    """
+    Registry of the sensors attached to a FuelSystem.
+
+    Sensors share one SensorBank and are indexed by sensor ID, tank ID and
+    sensor type. Each bank row caches the tank it reports on, so a reading
+    is routed to its tank with O(1) lookups. With fault detection enabled,
+    routed readings pass through streaming stuck, spike and drift checks
+    before reaching a tank. Readings are applied under the tank's lock
+    from the FuelSystem's TankLocks so they cannot interleave with a
+    transfer on the same tank.
+    """
+
+    def __init__(self, fuel_system, policy=None, detect_faults=False):
+        """
+        Initialize registry.
+
+        Args:
+            fuel_system: FuelSystem whose tanks receive the readings
+            policy: ReadingPolicy (default: ReadingPolicy())
+            detect_faults (bool): Run a SensorFaultDetector over routed readings (opt-in)
+        """
+        self._fuel_system = fuel_system
+        self._locks = fuel_system.get_tank_locks()
+        self._policy = policy if policy is not None else ReadingPolicy()
+        self._bank = SensorBank()
+        self._detector = SensorFaultDetector(self._bank) if detect_faults else None
+        self._by_id = {}
+        self._by_tank = {}
+        self._by_type = {}
+        self._row_tanks = []  # Bank row -> cached tank (None until resolved)
+
+    def add_sensor(self, sensor):
+        """Register a sensor, moving its state into the registry's bank"""
+        sensor_id = sensor.get_sensor_id()
+        existing = self._by_id.get(sensor_id)
+        if existing is sensor:
+            return
+        if existing is not None:
+            self.remove_sensor(sensor_id)
+
+        row = self._bank.adopt(sensor)
+        if len(self._row_tanks) < len(self._bank):
+            self._row_tanks.extend([None] * (len(self._bank) - len(self._row_tanks)))
+        self._row_tanks[row] = None
+
+        self._by_id[sensor_id] = sensor
+        self._by_tank.setdefault(sensor.get_tank_id(), []).append(sensor)
+        self._by_type.setdefault(sensor.get_sensor_type(), []).append(sensor)
+        if self._detector is not None:
+            self._detector.invalidate_groups()
+
+    def remove_sensor(self, sensor_id):
+        """Unregister a sensor; returns the sensor or None"""
+        sensor = self._by_id.pop(sensor_id, None)
+        if sensor is None:
+            return None
+        self._by_tank[sensor.get_tank_id()].remove(sensor)
+        self._by_type[sensor.get_sensor_type()].remove(sensor)
+        row = sensor.get_row()
+        self._row_tanks[row] = None
+        if self._detector is not None:
+            self._detector.invalidate_groups()
+        # Move the sensor back to the shared bank so it stays usable
+        DEFAULT_BANK.adopt(sensor)
+        return sensor
+
+    # Lookups
+
+    def get_sensor(self, sensor_id):
+        return self._by_id.get(sensor_id)
+
+    def get_sensors_for_tank(self, tank_id):
+        return list(self._by_tank.get(tank_id, []))
+
+    def get_sensors_by_type(self, sensor_type):
+        return list(self._by_type.get(sensor_type, []))
+
+    def get_sensor_ids(self):
+        return list(self._by_id.keys())
+
+    def get_bank(self):
+        """Return the SensorBank holding all registered sensor state"""
+        return self._bank
+
+    def get_policy(self):
+        return self._policy
+
+    def set_policy(self, policy):
+        self._policy = policy
+
+    def get_fault_detector(self):
+        """Return the SensorFaultDetector (None if fault detection is off)"""
+        return self._detector
+
+    def set_fault_detector(self, detector):
+        self._detector = detector
+
+    def get_sensor_count(self):
+        return len(self._by_id)
+
+    def _tank_for_row(self, row):
+        tank = self._row_tanks[row]
+        if tank is None:
+            sensor = self._bank.get_sensor(row)
+            if sensor is None:
+                return None
+            tank = self._fuel_system.get_tank(sensor.get_tank_id())
+            self._row_tanks[row] = tank
+        return tank
+
+    def invalidate_tank(self, tank_id):
+        """Forget cached routes to a tank (called when the tank is added or replaced)"""
+        for sensor in self._by_tank.get(tank_id, []):
+            self._row_tanks[sensor.get_row()] = None
+
+    # Routing
+
+    def route_reading(self, sensor_id, value, timestamp=None):
+        """
+        Record a raw reading and apply it to the sensor's tank.
+
+        The reading is range-checked and fault-checked first; a failing
+        reading marks the sensor non-operational and is not applied.
+
+        Returns:
+            Policy result (True or a Rejection), or None if the sensor is
+            unknown, faulty, ignored by the policy or its tank is missing
+        """
+        sensor = self._by_id.get(sensor_id)
+        if sensor is None:
+            return None
+        row = sensor.get_row()
+        bank = self._bank
+        bank.set_reading(row, value, timestamp)
+        if not bank.check_range(row):
+            bank.operational[row] = 0
+            return None
+        bank.operational[row] = not bank.fault[row]
+        calibrated = value + bank.offset[row]
+        if self._detector is not None and not self._detector.update(
+                array('d', [calibrated]), array('b', [1]), [row])[0]:
+            return None
+        return self._apply_row(row, calibrated)
+
+    def route_batch(self, values, indices=None, timestamps=None, record_history=True):
+        """
+        Ingest a batch of raw readings by bank row and apply them to tanks.
+
+        Args:
+            values, indices, timestamps, record_history: As for SensorBank.ingest
+
+        Returns:
+            tuple: (calibrated readings, operational mask) from the bank
+        """
+        calibrated, mask = self._bank.ingest(values, indices=indices, timestamps=timestamps,
+                                             record_history=record_history)
+        if self._detector is not None:
+            self._detector.update(calibrated, mask, indices)
+        rows = range(len(calibrated)) if indices is None else indices
+        apply_row = self._apply_row
+        for row, value, operational in zip(rows, calibrated, mask):
+            if operational:
+                apply_row(row, value)
+        return calibrated, mask
+
+    def _apply_row(self, row, calibrated_value):
+        tank = self._tank_for_row(row)
+        if tank is None:
+            return None
+        sensor_type = SENSOR_TYPES[self._bank.sensor_type[row]]
+        with self._locks.get_lock(tank.get_tank_id()):
+            return self._policy.apply(tank, sensor_type, calibrated_value)
+
+    def __str__(self):
+        return f"SensorRegistry: {len(self._by_id)} sensors on {len(self._by_tank)} tanks"
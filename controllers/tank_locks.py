@@ -0,0 +1,44 @@
+import threading
+from contextlib import contextmanager
+
+
+class TankLocks:
+    """
+    One lock per tank, always acquired in tank_id order.
+
+    Taking the locks of every tank an operation touches in a single
+    canonical order rules out deadlock between concurrent transfers,
+    while transfers on disjoint tanks never wait for each other.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._guard = threading.Lock()  # Protects lock creation only
+
+    def get_lock(self, tank_id):
+        """Return the lock for a tank, creating it on first use"""
+        lock = self._locks.get(tank_id)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(tank_id, threading.Lock())
+        return lock
+
+    @contextmanager
+    def hold(self, tank_ids):
+        """
+        Hold the locks of the given tanks for the duration of a with block.
+
+        Args:
+            tank_ids: Iterable of tank IDs (duplicates are ignored)
+        """
+        locks = [self.get_lock(tank_id) for tank_id in sorted(set(tank_ids))]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def __len__(self):
+        return len(self._locks)
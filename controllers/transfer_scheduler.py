@@ -0,0 +1,339 @@
+import heapq
+
+from models.status_classifier import classify_status, get_thresholds
+
+INFINITY = float("inf")
+
+
+class RateTransfer:
+    """A pump moving fuel from one tank to another at a constant rate"""
+
+    __slots__ = ('_transfer_id', '_source_id', '_dest_id', '_rate', '_amount',
+                 '_started', '_stopped', '_stop_reason')
+
+    def __init__(self, transfer_id, source_id, dest_id, rate, amount, started):
+        self._transfer_id = transfer_id
+        self._source_id = source_id
+        self._dest_id = dest_id
+        self._rate = rate
+        self._amount = amount  # Liters to move (inf: until stopped)
+        self._started = started
+        self._stopped = None
+        self._stop_reason = None
+
+    def get_transfer_id(self):
+        return self._transfer_id
+
+    def get_source_id(self):
+        return self._source_id
+
+    def get_dest_id(self):
+        return self._dest_id
+
+    def get_rate(self):
+        return self._rate
+
+    def get_amount(self):
+        return self._amount
+
+    def get_moved(self, now):
+        """Liters moved up to simulated time now"""
+        end = now if self._stopped is None else self._stopped
+        return min(self._rate * (end - self._started), self._amount)
+
+    def is_active(self):
+        return self._stopped is None
+
+    def get_stop_reason(self):
+        return self._stop_reason
+
+    def __str__(self):
+        return (f"Transfer {self._transfer_id}: {self._source_id} -> {self._dest_id} "
+                f"at {self._rate:.1f}L/s")
+
+
+class TransferScheduler:
+    """
+    Rate-based fuel transfers on an event-driven simulation clock.
+
+    Each tank's level is linear in time between events, so instead of
+    ticking the scheduler keeps a heap of the next moment something happens:
+    a transfer has moved its amount, a source runs dry, a destination fills
+    up or a tank crosses a status threshold. advance() jumps from event to
+    event; tanks are only written when their flow changes, when one of
+    their events fires and at the end of advance().
+
+    Fuel moved outside the scheduler (e.g. a FuelTransferController
+    transfer) is kept: a flowing tank's anchor is shifted by the tank's
+    level change since the scheduler last wrote it, and its events are
+    rescheduled.
+    """
+
+    def __init__(self, fuel_system, data_logger=None):
+        """
+        Initialize scheduler.
+
+        Args:
+            fuel_system: FuelSystem whose tanks are pumped
+            data_logger: Optional DataLogger receiving one record per finished transfer
+        """
+        self._fuel_system = fuel_system
+        self._logger = data_logger
+        self._locks = fuel_system.get_tank_locks()
+        self._now = 0.0
+        self._next_id = 1
+        self._transfers = {}  # Active transfers by ID
+        self._finished = []
+
+        # Per tank: net flow (L/s), anchor (time, level), level last written
+        # into the tank and event version
+        self._flow = {}
+        self._anchor = {}
+        self._written = {}
+        self._version = {}
+        self._events = []  # Heap of (time, seq, kind, key, version, target)
+        self._seq = 0
+        self._event_count = 0
+
+    def get_time(self):
+        """Current simulated time in seconds"""
+        return self._now
+
+    def get_event_count(self):
+        return self._event_count
+
+    # Transfers
+
+    def start_transfer(self, source_id, dest_id, rate, amount=None):
+        """
+        Start pumping fuel at a constant rate.
+
+        Args:
+            source_id (str): Source tank ID
+            dest_id (str): Destination tank ID
+            rate (float): Flow rate in liters per second
+            amount (float): Liters to move (default: until a tank stops it)
+
+        Returns:
+            tuple: (success, transfer ID or error message)
+        """
+        source = self._fuel_system.get_tank(source_id)
+        dest = self._fuel_system.get_tank(dest_id)
+        if not source:
+            return False, f"Source tank {source_id} not found"
+        if not dest:
+            return False, f"Destination tank {dest_id} not found"
+        if source_id == dest_id:
+            return False, "Source and destination must be different"
+        if rate <= 0:
+            return False, "Rate must be positive"
+        if amount is not None and amount <= 0:
+            return False, "Amount must be positive"
+        topology = self._fuel_system.get_topology()
+        if topology is not None:
+            route_capacity = topology.get_route_capacity(source_id, dest_id)
+            if not route_capacity:
+                return False, f"No fuel route from {source_id} to {dest_id}"
+            if rate > route_capacity:
+                return False, f"Rate exceeds route capacity ({route_capacity:.1f}L/s)"
+        if hasattr(source, 'is_emergency_mode') and not source.is_emergency_mode():
+            return False, "Reserve tank requires emergency mode activation"
+        if self._level(source_id, source) <= 0:
+            return False, "Source tank is empty"
+        if self._level(dest_id, dest) >= dest.get_capacity():
+            return False, "Destination tank is full"
+
+        transfer = RateTransfer(self._next_id, source_id, dest_id, rate,
+                                INFINITY if amount is None else amount, self._now)
+        self._next_id += 1
+        self._transfers[transfer.get_transfer_id()] = transfer
+        self._push(self._now + transfer.get_amount() / rate, "TRANSFER", transfer.get_transfer_id())
+        self._change_flow(source_id, -rate)
+        self._change_flow(dest_id, rate)
+        return True, transfer.get_transfer_id()
+
+    def stop_transfer(self, transfer_id, reason="STOPPED"):
+        """
+        Stop an active transfer.
+
+        Returns:
+            RateTransfer or None if the transfer is not active
+        """
+        transfer = self._transfers.pop(transfer_id, None)
+        if transfer is None:
+            return None
+        transfer._stopped = self._now
+        transfer._stop_reason = reason
+        self._finished.append(transfer)
+        self._change_flow(transfer.get_source_id(), transfer.get_rate())
+        self._change_flow(transfer.get_dest_id(), -transfer.get_rate())
+        if self._logger is not None:
+            self._logger.log_transfer(transfer.get_source_id(), transfer.get_dest_id(),
+                                      round(transfer.get_moved(self._now), 1), reason == "COMPLETE")
+        return transfer
+
+    def get_active_transfers(self):
+        return list(self._transfers.values())
+
+    def get_finished_transfers(self):
+        return list(self._finished)
+
+    def get_flow(self, tank_id):
+        """Net flow into a tank in liters per second"""
+        return self._flow.get(tank_id, 0.0)
+
+    # Simulation
+
+    def advance(self, duration):
+        """
+        Advance simulated time, handling every event on the way.
+
+        Returns:
+            list: Event dicts (time, event, tank or transfer ID, details) in time order
+        """
+        until = self._now + duration
+        fired = []
+        for tank_id, flow in list(self._flow.items()):
+            if flow:
+                self._level(tank_id)  # Pick up fuel moved since the last call
+        events = self._events
+        while events and events[0][0] <= until:
+            time, _, kind, key, version, target = heapq.heappop(events)
+            if kind == "TANK":
+                if version != self._version.get(key):
+                    continue  # Flow changed since the event was scheduled
+                self._now = max(self._now, time)
+                self._handle_tank_event(key, target, fired)
+            else:
+                if key not in self._transfers:
+                    continue
+                self._now = max(self._now, time)
+                transfer = self.stop_transfer(key, "COMPLETE")
+                fired.append({"time": self._now, "event": "TRANSFER_COMPLETE",
+                              "transfer_id": key, "moved": transfer.get_moved(self._now)})
+            self._event_count += 1
+
+        self._now = until
+        self.sync()
+        return fired
+
+    def run_until_idle(self, max_duration=INFINITY):
+        """
+        Advance until no transfer is active (or max_duration elapses).
+
+        Returns:
+            list: Event dicts, as for advance()
+        """
+        fired = []
+        limit = self._now + max_duration
+        events = self._events
+        while self._transfers:
+            # Drop stale entries so the heap top is the next real event
+            while events and not self._is_live(events[0]):
+                heapq.heappop(events)
+            if not events or events[0][0] > limit:
+                break
+            fired.extend(self.advance(events[0][0] - self._now))
+        return fired
+
+    def sync(self):
+        """Write the current simulated level of every flowing tank into the tank"""
+        for tank_id, flow in self._flow.items():
+            if flow:
+                self._materialize(tank_id)
+
+    # Internals
+
+    def _is_live(self, event):
+        _, _, kind, key, version, _ = event
+        if kind == "TANK":
+            return version == self._version.get(key)
+        return key in self._transfers
+
+    def _level(self, tank_id, tank=None):
+        tank = tank or self._fuel_system.get_tank(tank_id)
+        flow = self._flow.get(tank_id)
+        if not flow:
+            # Not pumping: the tank itself is authoritative
+            return tank.get_fuel_level()
+        time, level = self._anchor[tank_id]
+        if tank is not None:
+            drift = tank.get_fuel_level() - self._written[tank_id]
+            if drift:
+                # Fuel moved outside the scheduler: shift the anchor by it
+                # and reschedule the tank's events from the new level
+                level += drift
+                self._anchor[tank_id] = (time, level)
+                self._written[tank_id] = tank.get_fuel_level()
+                self._schedule_tank(tank_id, level + flow * (self._now - time), flow)
+        return level + flow * (self._now - time)
+
+    def _materialize(self, tank_id, level=None):
+        """Re-anchor a tank at the current time and write its level"""
+        tank = self._fuel_system.get_tank(tank_id)
+        if tank is None:
+            return 0.0
+        if level is None:
+            level = self._level(tank_id, tank)
+        level = min(max(level, 0.0), tank.get_capacity())
+        self._anchor[tank_id] = (self._now, level)
+        if level != tank.get_fuel_level():
+            with self._locks.hold((tank_id,)):
+                tank.set_fuel_level(level)
+        self._written[tank_id] = tank.get_fuel_level()
+        return level
+
+    def _change_flow(self, tank_id, delta):
+        level = self._materialize(tank_id)
+        flow = self._flow.get(tank_id, 0.0) + delta
+        if abs(flow) < 1e-12:
+            flow = 0.0
+        self._flow[tank_id] = flow
+        self._schedule_tank(tank_id, level, flow)
+
+    def _schedule_tank(self, tank_id, level, flow):
+        version = self._version.get(tank_id, 0) + 1
+        self._version[tank_id] = version
+        if not flow:
+            return
+        tank = self._fuel_system.get_tank(tank_id)
+        capacity = tank.get_capacity()
+        normal, low = get_thresholds(tank.get_tank_type(), self._fuel_system.get_status_thresholds())
+        marks = [capacity * low / 100, capacity * normal / 100]
+        if flow < 0:
+            target = max([mark for mark in marks if mark < level] + [0.0])
+        else:
+            target = min([mark for mark in marks if mark > level] + [capacity])
+        self._push(self._now + (target - level) / flow, "TANK", tank_id, version, target)
+
+    def _push(self, time, kind, key, version=None, target=None):
+        if time == INFINITY:
+            return
+        self._seq += 1
+        heapq.heappush(self._events, (time, self._seq, kind, key, version, target))
+
+    def _handle_tank_event(self, tank_id, target, fired):
+        tank = self._fuel_system.get_tank(tank_id)
+        flow = self._flow.get(tank_id, 0.0)
+        level = self._materialize(tank_id, target)
+        if level <= 0 and flow < 0:
+            # Source ran dry: its pumps stop
+            fired.append({"time": self._now, "event": "SOURCE_EMPTY", "tank_id": tank_id})
+            for transfer in [t for t in self._transfers.values() if t.get_source_id() == tank_id]:
+                self.stop_transfer(transfer.get_transfer_id(), "SOURCE_EMPTY")
+        elif level >= tank.get_capacity() and flow > 0:
+            fired.append({"time": self._now, "event": "DEST_FULL", "tank_id": tank_id})
+            for transfer in [t for t in self._transfers.values() if t.get_dest_id() == tank_id]:
+                self.stop_transfer(transfer.get_transfer_id(), "DEST_FULL")
+        else:
+            # Status of the band the tank is entering (a filling tank sitting
+            # exactly on a threshold is crossing into the band above it)
+            status = classify_status(level, tank.get_capacity(), tank.get_tank_type(),
+                                     self._fuel_system.get_status_thresholds(), rising=flow > 0)
+            fired.append({"time": self._now, "event": "THRESHOLD", "tank_id": tank_id,
+                          "status": status})
+            self._schedule_tank(tank_id, level, flow)
+
+    def __str__(self):
+        return (f"TransferScheduler: t={self._now:.1f}s, {len(self._transfers)} active transfers, "
+                f"{self._event_count} events")
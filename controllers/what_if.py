@@ -0,0 +1,299 @@
+from controllers.fuel_transfer_controller import FuelTransferController
+from controllers.tank_locks import TankLocks
+from models.rejection import Rejection
+from models.status_classifier import classify_status
+from utils.alert_system import AlertSystem
+
+
+class ScenarioTank:
+    """
+    Copy-on-write view of a tank inside a WhatIfScenario.
+
+    Fuel level, status, pressure, temperature and emergency mode come from
+    the scenario's overlay; only the static getters in STATIC_GETTERS are
+    read from the live tank, so no method of the view can change it. Fuel
+    and sensor-value setters write only to the overlay and return the same
+    results as FuelTank without logging anything.
+    """
+
+    __slots__ = ('_tank', '_scenario', '_tank_id')
+
+    # Read-only live tank methods the view exposes unchanged
+    STATIC_GETTERS = frozenset(('get_tank_id', 'get_name', 'get_capacity', 'get_fuel_type', 'get_tank_type',
+                                'get_max_pressure', 'get_max_temperature', 'get_low_fuel_threshold',
+                                'get_critical_fuel_threshold'))
+
+    def __init__(self, tank, scenario):
+        self._tank = tank
+        self._scenario = scenario
+        self._tank_id = tank.get_tank_id()
+
+    def __getattr__(self, name):
+        if name in ScenarioTank.STATIC_GETTERS:
+            return getattr(self._tank, name)
+        raise AttributeError(f"{type(self).__name__} has no attribute {name!r}")
+
+    def get_fuel_level(self):
+        return self._scenario._get_level(self._tank_id)
+
+    def get_fuel_percentage(self):
+        capacity = self._tank.get_capacity()
+        if capacity == 0:
+            return 0
+        return (self.get_fuel_level() / capacity) * 100
+
+    def get_available_capacity(self):
+        return self._tank.get_capacity() - self.get_fuel_level()
+
+    def get_status(self):
+        # Same table and comparison as FuelSystem.check_all_tanks()
+        return classify_status(self.get_fuel_level(), self._tank.get_capacity(), self._tank.get_tank_type(),
+                               self._scenario._fuel_system.get_status_thresholds())
+
+    def get_pressure(self):
+        return self._scenario._get_override('_pressures', self._tank_id, self._tank.get_pressure)
+
+    def get_temperature(self):
+        return self._scenario._get_override('_temperatures', self._tank_id, self._tank.get_temperature)
+
+    def set_pressure(self, pressure):
+        if pressure < 0:
+            return Rejection.NEGATIVE_PRESSURE
+        if pressure > self._tank.get_max_pressure() * 1.2:
+            return Rejection.PRESSURE_LIMIT
+        self._scenario._pressures[self._tank_id] = pressure
+        return True
+
+    def set_temperature(self, temperature):
+        if temperature < -50:
+            return Rejection.TEMPERATURE_TOO_LOW
+        if temperature > self._tank.get_max_temperature() * 1.2:
+            return Rejection.TEMPERATURE_LIMIT
+        self._scenario._temperatures[self._tank_id] = temperature
+        return True
+
+    def is_empty(self):
+        return self.get_fuel_level() <= 0
+
+    def is_full(self):
+        return self.get_fuel_level() >= self._tank.get_capacity() * 0.99
+
+    def add_fuel(self, amount):
+        if amount < 0:
+            return Rejection.NEGATIVE_AMOUNT
+        level = self.get_fuel_level()
+        if level + amount > self._tank.get_capacity():
+            return Rejection.EXCEEDS_CAPACITY
+        self._scenario._set_level(self._tank_id, level + amount)
+        return True
+
+    def remove_fuel(self, amount):
+        if hasattr(self, 'is_emergency_mode') and not self.is_emergency_mode():
+            return Rejection.EMERGENCY_MODE_REQUIRED
+        if amount < 0:
+            return Rejection.NEGATIVE_AMOUNT
+        level = self.get_fuel_level()
+        if level < amount:
+            return Rejection.INSUFFICIENT_FUEL
+        self._scenario._set_level(self._tank_id, level - amount)
+        return True
+
+    def set_fuel_level(self, level):
+        if level < 0 or level > self._tank.get_capacity():
+            return Rejection.INVALID_LEVEL
+        self._scenario._set_level(self._tank_id, level)
+        return True
+
+    def __str__(self):
+        return (f"{self._tank.get_name()} ({self._tank_id}) [what-if]: "
+                f"{self.get_fuel_level():.1f}L / {self._tank.get_capacity():.1f}L - {self.get_status()}")
+
+
+class ScenarioReserveTank(ScenarioTank):
+    """Scenario view of a reserve tank (emergency mode is part of the overlay)"""
+
+    __slots__ = ()
+
+    def is_emergency_mode(self):
+        return self._scenario._get_override('_emergency', self._tank_id, self._tank.is_emergency_mode)
+
+    def activate_emergency_mode(self, quiet=False):
+        self._scenario._emergency[self._tank_id] = True
+
+    def deactivate_emergency_mode(self, quiet=False):
+        self._scenario._emergency[self._tank_id] = False
+
+
+class _ScenarioLog:
+    """Collects the log records a scenario's controller and alert checks produce"""
+
+    def __init__(self):
+        self.entries = []
+
+    def log_transfer(self, source_tank, destination_tank, amount, success):
+        self.entries.append(("FUEL_TRANSFER", source_tank, destination_tank, amount, success))
+
+    def log_transfer_batch(self, applied, rejected, amount, tank_count, mode):
+        self.entries.append(("FUEL_TRANSFER_BATCH", applied, rejected, amount, tank_count, mode))
+
+    def log_alert(self, tank_id, alert_message):
+        pass  # Alerts are returned by get_alerts()
+
+
+class WhatIfScenario:
+    """
+    Dry-run overlay over a FuelSystem.
+
+    The scenario stands in for the FuelSystem (get_tank, get_all_tanks,
+    get_topology...), so the regular FuelTransferController and
+    AlertSystem run against it unchanged. Only the tanks a scenario
+    touches are recorded - dicts of overridden fuel levels, pressures,
+    temperatures and emergency modes - and every other read falls through to the parent scenario or
+    the live system, which is never modified. Scenarios can be forked to
+    branch candidate plans from a common prefix.
+    """
+
+    def __init__(self, fuel_system, parent=None):
+        """
+        Initialize scenario.
+
+        Args:
+            fuel_system: Live FuelSystem (read only)
+            parent: Optional WhatIfScenario this one branches from
+        """
+        self._fuel_system = fuel_system
+        self._parent = parent
+        self._levels = {}  # tank_id -> overridden fuel level
+        self._emergency = {}  # tank_id -> overridden emergency mode
+        self._pressures = {}  # tank_id -> overridden pressure
+        self._temperatures = {}  # tank_id -> overridden temperature
+        self._views = {}
+        self._log = _ScenarioLog()
+        self._controller = None
+        self._transfers = []  # Successful (source_id, dest_id, amount) in order
+
+    def fork(self):
+        """Return a child scenario that starts from this scenario's state"""
+        return WhatIfScenario(self._fuel_system, parent=self)
+
+    # Overlay storage
+
+    def _get_override(self, overlay, tank_id, live_getter):
+        """Nearest override in the named overlay dict of this scenario or a parent, else the live value"""
+        scenario = self
+        while scenario is not None:
+            value = getattr(scenario, overlay).get(tank_id)
+            if value is not None:
+                return value
+            scenario = scenario._parent
+        return live_getter()
+
+    def _get_level(self, tank_id):
+        return self._get_override('_levels', tank_id, self._fuel_system.get_tank(tank_id).get_fuel_level)
+
+    def _set_level(self, tank_id, level):
+        self._levels[tank_id] = level
+
+    # FuelSystem interface
+
+    def get_tank(self, tank_id):
+        view = self._views.get(tank_id)
+        if view is None:
+            tank = self._fuel_system.get_tank(tank_id)
+            if tank is None:
+                return None
+            view_class = ScenarioReserveTank if hasattr(tank, 'is_emergency_mode') else ScenarioTank
+            view = self._views[tank_id] = view_class(tank, self)
+        return view
+
+    def get_all_tanks(self):
+        return {tank_id: self.get_tank(tank_id) for tank_id in self._fuel_system.get_all_tanks()}
+
+    def get_tank_ids(self):
+        return self._fuel_system.get_tank_ids()
+
+    def get_topology(self):
+        return self._fuel_system.get_topology()
+
+    def get_tank_locks(self):
+        # Scenarios are private to their caller; keep their locks off the live tanks
+        return TankLocks()
+
+    def get_total_fuel(self):
+        """Live total adjusted by the overridden tanks (O(touched tanks))"""
+        total = self._fuel_system.get_total_fuel()
+        for tank_id in self.get_changes():
+            total += self._get_level(tank_id) - self._fuel_system.get_tank(tank_id).get_fuel_level()
+        return total
+
+    # Scenario actions
+
+    def activate_emergency_mode(self, tank_id):
+        """Assume a reserve tank's emergency mode is on in this scenario"""
+        self._emergency[tank_id] = True
+
+    def _get_controller(self):
+        if self._controller is None:
+            self._controller = FuelTransferController(self, self._log)
+        return self._controller
+
+    def transfer(self, source_id, dest_id, amount):
+        """
+        Dry-run one transfer with the regular validation rules.
+
+        Returns:
+            tuple: (success, message)
+        """
+        success, message = self._get_controller().execute_transfer(source_id, dest_id, amount)
+        if success:
+            self._transfers.append((source_id, dest_id, amount))
+        return success, message
+
+    def execute_transfers(self, batch, mode="ATOMIC"):
+        """
+        Dry-run a transfer batch (see FuelTransferController.execute_transfers).
+
+        Returns:
+            tuple: (number of transfers applied, list of (batch index, error message))
+        """
+        applied, rejected = self._get_controller().execute_transfers(batch, mode)
+        if applied:
+            failed = {index for index, _ in rejected}
+            self._transfers.extend(t for i, t in enumerate(batch) if i not in failed)
+        return applied, rejected
+
+    # Results
+
+    def get_fuel_level(self, tank_id):
+        return self._get_level(tank_id)
+
+    def get_status(self, tank_id):
+        return self.get_tank(tank_id).get_status()
+
+    def get_changes(self):
+        """
+        Get the tanks this scenario (and its parents) changed.
+
+        Returns:
+            dict: tank_id -> (live level, scenario level)
+        """
+        touched = set()
+        scenario = self
+        while scenario is not None:
+            touched.update(scenario._levels)
+            scenario = scenario._parent
+        get_tank = self._fuel_system.get_tank
+        return {tank_id: (get_tank(tank_id).get_fuel_level(), self._get_level(tank_id))
+                for tank_id in touched if self._get_level(tank_id) != get_tank(tank_id).get_fuel_level()}
+
+    def get_alerts(self):
+        """Run the regular alert checks against the scenario's tank states"""
+        return AlertSystem(self, self._log).check_all_tanks()
+
+    def get_transfers(self):
+        """Successful transfers of this scenario and its parents, ready for execute_transfers"""
+        inherited = self._parent.get_transfers() if self._parent is not None else []
+        return inherited + self._transfers
+
+    def __str__(self):
+        return f"WhatIfScenario: {len(self._levels)} tanks overridden, {len(self._transfers)} transfers"
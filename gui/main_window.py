@@ -1,18 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import json
 import sys
 
 sys.path.append('models')
 sys.path.append('controllers')
 sys.path.append('utils')
 
-from models.main_fuel_tank import MainFuelTank
-from models.auxiliary_tank import AuxiliaryTank
-from models.reserve_tank import ReserveTank
 from utils.data_logger import DataLogger
+from utils.transfer_journal import TransferJournal
+from utils.system_config import load_config, build_fuel_system
+from utils.alert_system import AlertSystem
 from controllers.fuel_transfer_controller import FuelTransferController
+from controllers.rebalancing_planner import RebalancingPlanner
 from controllers.fuel_system import FuelSystem
+from models.tank_events import FUEL_LEVEL, CAPACITY, STATUS, RELOADED
 
 
 class FuelManagementGUI:
@@ -28,7 +29,17 @@ class FuelManagementGUI:
         self.logger = DataLogger()
         self.fuel_system = FuelSystem()
         self.load_tanks_from_config()
-        self.transfer_controller = FuelTransferController(self.fuel_system, self.logger)
+        self.journal = TransferJournal(fuel_system=self.fuel_system)
+        self.recover_transfers()
+        self.transfer_controller = FuelTransferController(self.fuel_system, self.logger, self.journal)
+        self.planner = RebalancingPlanner(self.fuel_system)
+        self.alert_system = AlertSystem(self.fuel_system, self.logger)
+        self.alert_system.watch_events()
+
+        # Gauges are redrawn only for tanks named in change events
+        self.dirty_gauges = set()
+        self.fuel_system.get_event_bus().subscribe(self.mark_gauges_dirty,
+                                                   kinds=(FUEL_LEVEL, CAPACITY, STATUS, RELOADED))
 
         self.setup_styles()
         self.setup_header()
@@ -36,6 +47,7 @@ class FuelManagementGUI:
         self.setup_footer()
 
         self.logger.log_event("SYSTEM_START", "Fuel Management GUI initialized")
+        self.dirty_gauges.update(self.gauge_widgets)
         self.update_displays()
 
     # --------------------------- Setup & Config ----------------------------
@@ -50,28 +62,13 @@ class FuelManagementGUI:
                         arrowcolor='#00d4ff')
 
     def load_tanks_from_config(self):
-        """Load tank data from config file"""
+        """Load tanks and sensors from config file"""
         try:
-            with open('data/logs/tank_config.json', 'r') as f:
-                config = json.load(f)
-
-            for t in config.get("tanks", []):
-                tank_type = t.get("type")
-                tank_id, name = t.get("tank_id"), t.get("name")
-                capacity, initial = t.get("capacity"), t.get("initial_fuel", 0)
-
-                if tank_type == "MainFuelTank":
-                    tank = MainFuelTank(tank_id, name, capacity, initial)
-                elif tank_type == "AuxiliaryTank":
-                    tank = AuxiliaryTank(tank_id, name, capacity, initial)
-                elif tank_type == "ReserveTank":
-                    tank = ReserveTank(tank_id, name, capacity, initial)
-                else:
-                    continue
-
-                self.fuel_system.add_tank(tank)
+            build_fuel_system(load_config(), self.fuel_system)
 
-            self.logger.log_event("CONFIG_LOADED", f"Loaded {len(self.fuel_system.get_tank_ids())} tanks")
+            registry = self.fuel_system.get_sensor_registry()
+            self.logger.log_event("CONFIG_LOADED", f"Loaded {len(self.fuel_system.get_tank_ids())} tanks, "
+                                                   f"{registry.get_sensor_count()} sensors")
 
         except Exception as e:
             messagebox.showerror("Config Error", f"Failed to load configuration:\n{e}")
@@ -197,7 +194,10 @@ class FuelManagementGUI:
 
         tk.Button(frame, text="INITIATE TRANSFER", command=self.initiate_transfer,
                   bg='#00d4ff', fg='#000', font=('Arial', 10, 'bold'), relief='raised').grid(
-            row=2, column=0, columnspan=5, pady=10)
+            row=2, column=0, columnspan=3, pady=10)
+        tk.Button(frame, text="AUTO BALANCE", command=self.auto_balance,
+                  bg='#0f3460', fg='#fff', font=('Arial', 10, 'bold'), relief='raised').grid(
+            row=2, column=3, columnspan=2, pady=10)
 
         self.transfer_status_label = tk.Label(panel, text="Ready for transfer",
                                               bg='#0f1419', fg='#888888', pady=5)
@@ -243,6 +243,31 @@ class FuelManagementGUI:
         if self.logger.save_to_file():
             messagebox.showinfo("Export", "Logs exported to data/logs/system_log.json")
 
+    def recover_transfers(self):
+        """Offer to replay the transfer journal over the last snapshot"""
+        info = self.journal.get_recovery_info()
+        if not info["records"] and not info["snapshot_seq"]:
+            return
+        if not messagebox.askyesno("Transfer Journal",
+                                   f"Restore tank levels from the transfer journal "
+                                   f"(snapshot #{info['snapshot_seq']}, {info['records']} transfers since)?\n"
+                                   f"No starts a new journal from the configured levels."):
+            self.journal.checkpoint(self.fuel_system)
+            self.logger.log_event("JOURNAL_DISCARDED",
+                                  f"Started a new journal; {info['records']} journaled transfers not replayed")
+            return
+
+        stats = self.journal.recover(self.fuel_system)
+        self.logger.log_event("JOURNAL_RECOVERY",
+                              f"Replayed {stats['records_replayed']} transfers over snapshot "
+                              f"#{stats['snapshot_seq']} in {stats['seconds'] * 1000:.1f}ms")
+        if stats["rejected"]:
+            tanks = ", ".join(stats["rejected"])
+            self.logger.log_event("JOURNAL_RECOVERY", f"Levels out of range, not restored: {tanks}")
+            messagebox.showwarning("Transfer Journal",
+                                   f"Journaled levels do not fit the configured tanks: {tanks}. "
+                                   f"These tanks keep their configured levels.")
+
     # --------------------------- Transfer Logic ----------------------------
 
     def initiate_transfer(self):
@@ -271,7 +296,29 @@ class FuelManagementGUI:
             if success:
                 self.add_log_entry(f"Transfer {amt:.1f}L from {src} → {dest}", "INFO")
 
-            self.update_displays()
+            self.refresh_displays()
+
+        except Exception as e:
+            self.show_transfer_status(f"Error: {e}", "error")
+
+    def auto_balance(self):
+        """Level the main tanks, feeding them from the auxiliary tanks first"""
+        try:
+            mains = [t.get_tank_id() for t in self.fuel_system.get_tanks_by_type("MAIN")]
+            auxiliaries = [t.get_tank_id() for t in self.fuel_system.get_tanks_by_type("AUXILIARY")]
+            transfers, _ = self.planner.plan_balance([mains], drain=auxiliaries)
+            if not transfers:
+                return self.show_transfer_status("Tanks already balanced", "success")
+
+            applied, rejected = self.transfer_controller.execute_transfers(transfers)
+            if rejected:
+                self.show_transfer_status(f"Balance failed: {rejected[0][1]}", "error")
+            else:
+                self.show_transfer_status(f"Balanced with {applied} transfers", "success")
+                for src, dest, amt in transfers:
+                    self.add_log_entry(f"Transfer {amt:.1f}L from {src} → {dest}", "INFO")
+
+            self.refresh_displays()
 
         except Exception as e:
             self.show_transfer_status(f"Error: {e}", "error")
@@ -294,24 +341,45 @@ class FuelManagementGUI:
         self.total_label = tk.Label(footer, text="", bg='#16213e', fg='#ffffff', font=('Arial', 10))
         self.total_label.pack(side='right', padx=20)
 
-    def update_displays(self):
-        for tid, gf in self.gauge_widgets.items():
-            t = self.fuel_system.get_tank(tid)
-            perc = t.get_fuel_percentage()
-            color = self.status_color(t.get_status())
-
-            gf.canvas.delete(f"{tid}_fuel")
-            fuel_h = int(120 * (perc / 100))
-            gf.canvas.create_rectangle(50, 160 - fuel_h, 110, 160, fill=color, outline='', tags=f"{tid}_fuel")
-
-            gf.fuel_label.config(text=f"{t.get_fuel_level():.0f}L / {t.get_capacity():.0f}L")
-            gf.percentage_label.config(text=f"{perc:.1f}%", fg=color)
+    def mark_gauges_dirty(self, events):
+        for event in events:
+            if event.kind == RELOADED:
+                self.dirty_gauges.update(self.gauge_widgets)
+            else:
+                self.dirty_gauges.add(event.tank_id)
+
+    def draw_gauge(self, tid):
+        gf = self.gauge_widgets.get(tid)
+        t = self.fuel_system.get_tank(tid)
+        if gf is None or t is None:
+            return
+        perc = t.get_fuel_percentage()
+        color = self.status_color(t.get_status())
+
+        gf.canvas.delete(f"{tid}_fuel")
+        fuel_h = int(120 * (perc / 100))
+        gf.canvas.create_rectangle(50, 160 - fuel_h, 110, 160, fill=color, outline='', tags=f"{tid}_fuel")
+
+        gf.fuel_label.config(text=f"{t.get_fuel_level():.0f}L / {t.get_capacity():.0f}L")
+        gf.percentage_label.config(text=f"{perc:.1f}%", fg=color)
+
+    def refresh_displays(self):
+        """Deliver pending tank events and redraw only the gauges that changed"""
+        self.fuel_system.get_event_bus().flush()
+        if not self.dirty_gauges:
+            return
+        for tid in self.dirty_gauges:
+            self.draw_gauge(tid)
+        self.dirty_gauges.clear()
 
         total = self.fuel_system.get_total_fuel()
         cap = self.fuel_system.get_total_capacity()
         self.total_label.config(text=f"Total: {total:.0f}L / {cap:.0f}L")
-        self.root.after(1000, self.update_displays)
 
+    def update_displays(self):
+        self.refresh_displays()
+        self.journal.commit_if_due()
+        self.root.after(1000, self.update_displays)
 
 def main():
     root = tk.Tk()
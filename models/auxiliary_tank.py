@@ -2,7 +2,10 @@ from .fuel_tank import FuelTank
 
 class AuxiliaryTank(FuelTank):
     
-    def __init__(self, tank_id, name, capacity=3000, initial_fuel=0):
+    __slots__ = ()
+    _tank_type = "AUXILIARY"
+    
+    def __init__(self, tank_id, name, capacity=3000, initial_fuel=0, store=None):
         """
         Initialize an auxiliary fuel tank.
         
@@ -11,6 +14,7 @@ class AuxiliaryTank(FuelTank):
             name (str): Display name (e.g., "Center Auxiliary Tank")
             capacity (float): Maximum capacity in liters (default: 3000L)
             initial_fuel (float): Starting fuel amount in liters
+            store (TankStore): Optional shared store to allocate the tank's row in
         """
         # Call parent class constructor
         super().__init__(
@@ -18,11 +22,9 @@ class AuxiliaryTank(FuelTank):
             name=name,
             capacity=capacity,
             fuel_type="Jet-A",
-            initial_fuel=initial_fuel
+            initial_fuel=initial_fuel,
+            store=store
         )
-        
-        # Auxiliary tank specific attributes
-        self._tank_type = "AUXILIARY"
     
     def get_tank_type(self):
         return self._tank_type
@@ -42,9 +44,9 @@ class AuxiliaryTank(FuelTank):
         """
         percentage = self.get_fuel_percentage()
         
-        if percentage > 50:
+        if percentage > self._normal_threshold:
             return "NORMAL"
-        elif percentage > 20:
+        elif percentage > self._low_threshold:
             return "LOW"
         else:
             return "CRITICAL"
@@ -1,21 +1,79 @@
+from .rejection import notify
+from .sensor_bank import DEFAULT_BANK, SENSOR_TYPES
+
 class FuelSensor:
     
-    def __init__(self, sensor_id, sensor_type, tank_id):
+    __slots__ = ('_sensor_id', '_tank_id', '_bank', '_row', '__weakref__')
+    
+    # Reading history defaults
+    DEFAULT_HISTORY_SIZE = 64
+    EWMA_ALPHA = 0.2
+    
+    def __init__(self, sensor_id, sensor_type, tank_id, history_size=DEFAULT_HISTORY_SIZE, bank=None):
         """
         Initialize a fuel sensor.
         
+        Reading, calibration offset and operational flag live in a row of a
+        SensorBank; the sensor object is a view onto that row.
+        
         Args:
             sensor_id (str): Unique sensor identifier (e.g., "SENSOR_001")
             sensor_type (str): Type of sensor ("LEVEL", "PRESSURE", "TEMPERATURE")
             tank_id (str): ID of the tank this sensor monitors
+            history_size (int): Readings kept in the ring buffer (0 disables history)
+            bank (SensorBank): Bank to allocate the row in (default: the shared DEFAULT_BANK)
         """
         # Private attributes (encapsulation)
         self._sensor_id = sensor_id
-        self._sensor_type = sensor_type
         self._tank_id = tank_id
-        self._current_reading = 0.0
-        self._calibration_offset = 0.0
-        self._is_operational = True
+        
+        if bank is None:
+            bank = DEFAULT_BANK
+        self._bank = bank
+        self._row = bank.add_row(self, sensor_type, history_size)
+    
+    # Row-backed state (view onto the SensorBank columns)
+    
+    @property
+    def _sensor_type(self):
+        return SENSOR_TYPES[self._bank.sensor_type[self._row]]
+    
+    @property
+    def _current_reading(self):
+        return self._bank.reading[self._row]
+    
+    @_current_reading.setter
+    def _current_reading(self, value):
+        self._bank.reading[self._row] = value
+    
+    @property
+    def _calibration_offset(self):
+        return self._bank.offset[self._row]
+    
+    @_calibration_offset.setter
+    def _calibration_offset(self, value):
+        self._bank.offset[self._row] = value
+    
+    @property
+    def _is_operational(self):
+        return bool(self._bank.operational[self._row])
+    
+    @_is_operational.setter
+    def _is_operational(self, value):
+        self._bank.operational[self._row] = bool(value)
+    
+    def _bind(self, bank, row):
+        """Point this sensor at a new bank row (used by SensorBank.adopt)"""
+        self._bank = bank
+        self._row = row
+    
+    def get_bank(self):
+        """Return the SensorBank holding this sensor's state"""
+        return self._bank
+    
+    def get_row(self):
+        """Return this sensor's row index in its bank"""
+        return self._row
     
     # Getters
     def get_sensor_id(self):
@@ -35,9 +93,25 @@ class FuelSensor:
     def is_operational(self):
         return self._is_operational
     
+    def get_history(self):
+        """
+        Return the ReadingHistory of raw (uncalibrated) readings.
+        
+        Returns:
+            ReadingHistory, or None if history is disabled or no reading yet
+        """
+        return self._bank.get_history(self._row)
+    
     # Setters
-    def set_reading(self, value):
-        self._current_reading = value
+    def set_reading(self, value, timestamp=None):
+        """
+        Record a raw reading.
+        
+        Args:
+            value (float): Raw sensor value
+            timestamp (float): Sample time in seconds (default: time.time())
+        """
+        self._bank.set_reading(self._row, value, timestamp)
     
     def calibrate(self, offset):
         """
@@ -47,28 +121,21 @@ class FuelSensor:
             offset (float): Calibration adjustment value
         """
         self._calibration_offset = offset
-        print(f"Sensor {self._sensor_id} calibrated with offset: {offset}")
+        notify("Sensor {} calibrated with offset: {}", self._sensor_id, offset)
     
     def set_operational_status(self, status):
         self._is_operational = status
         if not status:
-            print(f"WARNING: Sensor {self._sensor_id} marked as non-operational")
+            notify("WARNING: Sensor {} marked as non-operational", self._sensor_id)
     
     def perform_self_test(self):
-        # Simple validation - check if reading is within reasonable bounds
-        if self._sensor_type == "LEVEL":
-            # Fuel level should be 0-100% or 0-capacity liters
-            is_valid = 0 <= self._current_reading <= 10000
-        elif self._sensor_type == "PRESSURE":
-            # Pressure typically 0-100 PSI
-            is_valid = 0 <= self._current_reading <= 100
-        elif self._sensor_type == "TEMPERATURE":
-            # Temperature typically -50 to 100°C
-            is_valid = -50 <= self._current_reading <= 100
-        else:
-            is_valid = True
+        # Simple validation - check if reading is within the sensor type's
+        # range (see SENSOR_RANGES: LEVEL 0-10000L, PRESSURE 0-100 PSI,
+        # TEMPERATURE -50 to 100°C)
+        is_valid = self._bank.check_range(self._row)
         
-        self._is_operational = is_valid
+        # A fault found by the fault detector keeps the sensor out of service
+        self._is_operational = is_valid and not self._bank.fault[self._row]
         return is_valid
     
     def to_dict(self):
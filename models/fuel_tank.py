@@ -1,31 +1,119 @@
 from abc import ABC, abstractmethod
 
+from .tank_store import DEFAULT_STORE, STATUS_NAMES, STATUS_CODES, FUEL_TYPES, fuel_type_code
+from .rejection import Rejection, reject
+
 class FuelTank(ABC):
     
-    def __init__(self, tank_id, name, capacity, fuel_type="Jet-A", initial_fuel=0):
+    # Per-instance state is limited to identity and the store row; everything
+    # shared by a tank type lives on the class.
+    __slots__ = ('_tank_id', '_name', '_store', '_row', '__weakref__')
+    
+    # Maximum safe limits
+    _max_pressure = 50.0  # PSI
+    _max_temperature = 60.0  # Celsius
+    
+    # Tank type and status thresholds (percent of capacity), set by subclasses
+    _tank_type = None
+    _normal_threshold = 50.0  # Above this: NORMAL
+    _low_threshold = 20.0  # Above this: LOW, otherwise CRITICAL
+    
+    def __init__(self, tank_id, name, capacity, fuel_type="Jet-A", initial_fuel=0, store=None):
         """
         Initialize a fuel tank.
         
+        Fuel level, capacity, pressure, temperature and status live in a
+        row of a TankStore; the tank object is a view onto that row.
+        
         Args:
             tank_id (str): Unique identifier (e.g., "LEFT_MAIN")
             name (str): Display name (e.g., "Left Wing Main Tank")
             capacity (float): Maximum fuel capacity in liters
             fuel_type (str): Type of fuel (default: Jet-A)
             initial_fuel (float): Starting fuel amount in liters
+            store (TankStore): Store to allocate the row in (default: the shared DEFAULT_STORE)
         """
         # Private attributes (encapsulation)
         self._tank_id = tank_id
         self._name = name
-        self._capacity = capacity
-        self._fuel_type = fuel_type
-        self._fuel_level = min(initial_fuel, capacity)  # Don't exceed capacity
-        self._pressure = 45.0  # PSI (pounds per square inch)
-        self._temperature = 25.0  # Celsius
-        self._status = "NORMAL"
         
-        # Maximum safe limits
-        self._max_pressure = 50.0  # PSI 
-        self._max_temperature = 60.0  # Celsius
+        if store is None:
+            store = DEFAULT_STORE
+        self._store = store
+        self._row = store.add_row(
+            self,
+            capacity=capacity,
+            fuel_level=min(initial_fuel, capacity),  # Don't exceed capacity
+            pressure=45.0,  # PSI (pounds per square inch)
+            temperature=25.0,  # Celsius
+            status="NORMAL",
+            fuel_type=fuel_type,
+            tank_type=self._tank_type
+        )
+        self._update_status()
+    
+    # Row-backed state (view onto the TankStore columns)
+    
+    @property
+    def _capacity(self):
+        return self._store.capacity[self._row]
+    
+    @_capacity.setter
+    def _capacity(self, value):
+        self._store.set_capacity(self._row, value)
+    
+    @property
+    def _fuel_level(self):
+        return self._store.fuel_level[self._row]
+    
+    @_fuel_level.setter
+    def _fuel_level(self, value):
+        self._store.set_fuel_level(self._row, value)
+    
+    @property
+    def _pressure(self):
+        return self._store.pressure[self._row]
+    
+    @_pressure.setter
+    def _pressure(self, value):
+        self._store.set_pressure(self._row, value)
+    
+    @property
+    def _temperature(self):
+        return self._store.temperature[self._row]
+    
+    @_temperature.setter
+    def _temperature(self, value):
+        self._store.set_temperature(self._row, value)
+    
+    @property
+    def _status(self):
+        return STATUS_NAMES[self._store.status[self._row]]
+    
+    @_status.setter
+    def _status(self, value):
+        self._store.set_status(self._row, STATUS_CODES[value])
+    
+    @property
+    def _fuel_type(self):
+        return FUEL_TYPES[self._store.fuel_type[self._row]]
+    
+    @_fuel_type.setter
+    def _fuel_type(self, value):
+        self._store.set_fuel_type(self._row, fuel_type_code(value))
+    
+    def _bind(self, store, row):
+        """Point this tank at a new store row (used by TankStore.adopt)"""
+        self._store = store
+        self._row = row
+    
+    def get_store(self):
+        """Return the TankStore holding this tank's state"""
+        return self._store
+    
+    def get_row(self):
+        """Return this tank's row index in its store"""
+        return self._row
     
     # getters (Encapsulation) 
     
@@ -82,57 +170,86 @@ class FuelTank(ABC):
     
     # setters 
     def set_pressure(self, pressure):
-        """Set pressure with validation (0 to 120% of max)"""
+        """
+        Set pressure with validation (0 to 120% of max).
+        
+        Returns:
+            True on success, otherwise a (falsy) Rejection reason
+        """
         if pressure < 0:
-            print(f"Error: Pressure cannot be negative")
-            return False
+            return reject(Rejection.NEGATIVE_PRESSURE, "Error: Pressure cannot be negative")
         if pressure > self._max_pressure * 1.2:
-            print(f"Error: Pressure {pressure} PSI exceeds safe limit")
-            return False
+            return reject(Rejection.PRESSURE_LIMIT, "Error: Pressure {} PSI exceeds safe limit", pressure)
         self._pressure = pressure
         return True
     
     def set_temperature(self, temperature):
-        """Set temperature with validation (-50°C to 120% of max)"""
+        """
+        Set temperature with validation (-50°C to 120% of max).
+        
+        Returns:
+            True on success, otherwise a (falsy) Rejection reason
+        """
         if temperature < -50:
-            print(f"Error: Temperature too low for fuel operation")
-            return False
+            return reject(Rejection.TEMPERATURE_TOO_LOW, "Error: Temperature too low for fuel operation")
         if temperature > self._max_temperature * 1.2:
-            print(f"Error: Temperature {temperature}°C exceeds safe limit")
-            return False
+            return reject(Rejection.TEMPERATURE_LIMIT, "Error: Temperature {}°C exceeds safe limit", temperature)
         self._temperature = temperature
         return True
     
     # Fuel management methods
     def add_fuel(self, amount):
-        """Add fuel with overflow protection"""
+        """
+        Add fuel with overflow protection.
+        
+        Returns:
+            True on success, otherwise a (falsy) Rejection reason
+        """
         if amount < 0:
-            print(f"Error: Cannot add negative fuel amount")
-            return False
+            return reject(Rejection.NEGATIVE_AMOUNT, "Error: Cannot add negative fuel amount")
         
         if self._fuel_level + amount > self._capacity:
             available = self._capacity - self._fuel_level
-            print(f"Error: Cannot add {amount}L - only {available:.1f}L space available")
-            return False
+            return reject(Rejection.EXCEEDS_CAPACITY,
+                          "Error: Cannot add {}L - only {:.1f}L space available", amount, available)
         
         self._fuel_level += amount
         self._update_status()
         return True
     
     def remove_fuel(self, amount):
-        """Remove fuel with validation"""
+        """
+        Remove fuel with validation.
+        
+        Returns:
+            True on success, otherwise a (falsy) Rejection reason
+        """
         if amount < 0:
-            print(f"Error: Cannot remove negative fuel amount")
-            return False
+            return reject(Rejection.NEGATIVE_AMOUNT, "Error: Cannot remove negative fuel amount")
         
         if self._fuel_level < amount:
-            print(f"Error: Insufficient fuel - only {self._fuel_level:.1f}L available")
-            return False
+            return reject(Rejection.INSUFFICIENT_FUEL,
+                          "Error: Insufficient fuel - only {:.1f}L available", self._fuel_level)
         
         self._fuel_level -= amount
         self._update_status()
         return True
     
+    def set_fuel_level(self, level):
+        """
+        Set the fuel level directly (e.g. from a level sensor reading).
+        
+        Returns:
+            True on success, otherwise a (falsy) Rejection reason
+        """
+        if level < 0 or level > self._capacity:
+            return reject(Rejection.INVALID_LEVEL,
+                          "Error: Fuel level {:.1f}L outside 0-{:.1f}L", level, self._capacity)
+        
+        self._fuel_level = level
+        self._update_status()
+        return True
+    
     def get_available_capacity(self):
         """Return remaining space in tank"""
         return self._capacity - self._fuel_level
@@ -155,8 +272,13 @@ class FuelTank(ABC):
         pass
     
     def _update_status(self):
-        """Update tank status after fuel changes"""
-        self._status = self.check_status()
+        """Update tank status after fuel changes, with the store's threshold table if it has one"""
+        thresholds = self._store.status_thresholds
+        if thresholds is None:
+            self._status = self.check_status()
+        else:
+            from .status_classifier import classify_status  # status_classifier imports this module
+            self._status = classify_status(self._fuel_level, self._capacity, self._tank_type, thresholds)
     
     def to_dict(self):
         """Convert tank data to dictionary for JSON export"""
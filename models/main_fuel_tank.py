@@ -3,16 +3,19 @@ from .fuel_tank import FuelTank
 class MainFuelTank(FuelTank):
     """Main fuel tank for primary aircraft fuel storage."""
     
-    def __init__(self, tank_id, name, capacity=5000, initial_fuel=0):
+    __slots__ = ()
+    _tank_type = "MAIN"
+    
+    def __init__(self, tank_id, name, capacity=5000, initial_fuel=0, store=None):
         # Initialize main tank with standard capacity
         super().__init__(
             tank_id=tank_id,
             name=name,
             capacity=capacity,
             fuel_type="Jet-A",
-            initial_fuel=initial_fuel
+            initial_fuel=initial_fuel,
+            store=store
         )
-        self._tank_type = "MAIN"
     
     def get_tank_type(self):
         return self._tank_type
@@ -21,9 +24,9 @@ class MainFuelTank(FuelTank):
         """Check status: >50% NORMAL, 20-50% LOW, <20% CRITICAL"""
         percentage = self.get_fuel_percentage()
         
-        if percentage > 50:
+        if percentage > self._normal_threshold:
             return "NORMAL"
-        elif percentage > 20:
+        elif percentage > self._low_threshold:
             return "LOW"
         else:
             return "CRITICAL"
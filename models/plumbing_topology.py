@@ -0,0 +1,219 @@
+INFINITY = float("inf")
+
+
+class PlumbingTopology:
+    """
+    Pipes and valves connecting tanks (and junctions such as manifolds).
+
+    Each pipe has a maximum flow rate and may be gated by a valve; several
+    pipes can share one valve. Route capacity is the bottleneck rate of the
+    widest single route between two nodes: the largest, over all routes,
+    of the smallest pipe rate along the route. Parallel pipes between the
+    same two nodes are alternative routes, not added together, so this is
+    not a max-flow. Routes start and end at any node but only pass through
+    junctions: a node marked as a tank (mark_tanks) is never a waypoint.
+
+    The widest path between every pair of nodes is computed with one
+    O(n^3) Floyd-Warshall pass and cached, so reachability and route
+    capacity are O(1) lookups. Opening or closing a valve only marks the
+    cache stale; warm_cache() recomputes it up front. The cached rates and
+    next hops are published together as one tuple, so a query running
+    alongside a rebuild never mixes the two.
+    """
+
+    def __init__(self):
+        self._pipes = {}  # pipe_id -> (node_a, node_b, max_rate, valve_id, bidirectional)
+        self._valves = {}  # valve_id -> open flag
+        self._nodes = {}  # node_id -> matrix index
+        self._tanks = set()  # Node IDs that routes may not pass through
+        self._routes = None  # Cached (widest rates, next hops), each [from][to]
+        self._generation = 0  # Bumped whenever the cache goes stale
+        self._rebuilds = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Build a topology from the "valves" and "pipes" sections of a tank config.
+
+        Pipes: {"pipe_id", "from", "to", "max_rate", optional "valve" and "bidirectional"}
+        Valves: {"valve_id", optional "open"}
+
+        Pipes are bidirectional unless "bidirectional" is false; other keys
+        (e.g. a "note") are ignored. The config's "tanks" are marked as tanks.
+        """
+        topology = cls()
+        topology.mark_tanks(t.get("tank_id") for t in config.get("tanks", []))
+        for v in config.get("valves", []):
+            topology.add_valve(v.get("valve_id"), v.get("open", True))
+        for p in config.get("pipes", []):
+            topology.add_pipe(p.get("pipe_id"), p.get("from"), p.get("to"), p.get("max_rate"),
+                              valve_id=p.get("valve"), bidirectional=p.get("bidirectional", True))
+        return topology
+
+    # Building
+
+    def _invalidate(self):
+        self._routes = None
+        self._generation += 1
+
+    def add_node(self, node_id):
+        if node_id not in self._nodes:
+            self._nodes[node_id] = len(self._nodes)
+            self._invalidate()
+
+    def mark_tanks(self, tank_ids):
+        """Mark nodes as tanks: routes may start or end at them but not pass through"""
+        new = set(tank_ids) - self._tanks
+        if new:
+            self._tanks |= new
+            self._invalidate()
+
+    def add_valve(self, valve_id, is_open=True):
+        self._valves[valve_id] = bool(is_open)
+        self._invalidate()
+
+    def add_pipe(self, pipe_id, node_a, node_b, max_rate, valve_id=None, bidirectional=True):
+        """
+        Add a pipe between two nodes.
+
+        Args:
+            pipe_id (str): Unique pipe identifier
+            node_a, node_b (str): Tank or junction IDs (flow runs a -> b)
+            max_rate (float): Maximum flow rate in liters per second
+            valve_id (str): Optional valve gating the pipe (registered as open if new)
+            bidirectional (bool): Whether fuel may also flow b -> a
+        """
+        if max_rate <= 0:
+            raise ValueError(f"Pipe {pipe_id} must have a positive max rate")
+        self.add_node(node_a)
+        self.add_node(node_b)
+        if valve_id is not None and valve_id not in self._valves:
+            self._valves[valve_id] = True
+        self._pipes[pipe_id] = (node_a, node_b, max_rate, valve_id, bidirectional)
+        self._invalidate()
+
+    def remove_pipe(self, pipe_id):
+        if self._pipes.pop(pipe_id, None) is not None:
+            self._invalidate()
+
+    # Valves
+
+    def set_valve(self, valve_id, is_open):
+        """
+        Open or close a valve.
+
+        Returns:
+            bool: False if the valve is unknown
+        """
+        if valve_id not in self._valves:
+            return False
+        if self._valves[valve_id] != bool(is_open):
+            self._valves[valve_id] = bool(is_open)
+            self._invalidate()
+        return True
+
+    def open_valve(self, valve_id):
+        return self.set_valve(valve_id, True)
+
+    def close_valve(self, valve_id):
+        return self.set_valve(valve_id, False)
+
+    def is_valve_open(self, valve_id):
+        return self._valves.get(valve_id, False)
+
+    # Route queries
+
+    def _rebuild(self):
+        """
+        Widest-path Floyd-Warshall over the pipes whose valves are open.
+
+        Returns:
+            tuple: (widest, next_hop); cached unless the topology changed meanwhile
+        """
+        generation = self._generation
+        count = len(self._nodes)
+        widest = [[0.0] * count for _ in range(count)]
+        next_hop = [[None] * count for _ in range(count)]
+        for i in range(count):
+            widest[i][i] = INFINITY
+            next_hop[i][i] = i
+
+        nodes = self._nodes
+        for node_a, node_b, max_rate, valve_id, bidirectional in self._pipes.values():
+            if valve_id is not None and not self._valves[valve_id]:
+                continue
+            a, b = nodes[node_a], nodes[node_b]
+            for i, j in ((a, b), (b, a)) if bidirectional else ((a, b),):
+                # Parallel pipes are separate routes: keep the widest
+                if max_rate > widest[i][j]:
+                    widest[i][j] = max_rate
+                    next_hop[i][j] = j
+
+        # Only junctions are relaxed through, so no route passes a tank
+        for node_id, k in list(nodes.items()):
+            if node_id in self._tanks:
+                continue
+            row_k = widest[k]
+            for i in range(count):
+                through = widest[i][k]
+                if not through:
+                    continue
+                row_i, hops_i = widest[i], next_hop[i]
+                hop = hops_i[k]
+                for j in range(count):
+                    rate = row_k[j] if row_k[j] < through else through
+                    if rate > row_i[j]:
+                        row_i[j] = rate
+                        hops_i[j] = hop
+
+        routes = (widest, next_hop)
+        if generation == self._generation:
+            self._routes = routes
+        self._rebuilds += 1
+        return routes
+
+    def _get_routes(self):
+        routes = self._routes
+        return routes if routes is not None else self._rebuild()
+
+    def warm_cache(self):
+        """Recompute the route cache now if it is stale, instead of on the next query"""
+        self._get_routes()
+
+    def get_route_capacity(self, source_id, dest_id):
+        """
+        Bottleneck rate of the widest single route between two nodes.
+
+        Returns:
+            float: Liters per second (0.0 if unreachable or unknown)
+        """
+        widest = self._get_routes()[0]
+        a, b = self._nodes.get(source_id), self._nodes.get(dest_id)
+        if a is None or b is None or a >= len(widest) or b >= len(widest):
+            return 0.0
+        return widest[a][b]
+
+    def is_reachable(self, source_id, dest_id):
+        return self.get_route_capacity(source_id, dest_id) > 0
+
+    def get_route(self, source_id, dest_id):
+        """Return the node IDs along the widest route, or None if unreachable"""
+        widest, next_hop = self._get_routes()
+        a, b = self._nodes.get(source_id), self._nodes.get(dest_id)
+        if a is None or b is None or a >= len(widest) or b >= len(widest) or not widest[a][b]:
+            return None
+        names = list(self._nodes)
+        route = [source_id]
+        while a != b:
+            a = next_hop[a][b]
+            route.append(names[a])
+        return route
+
+    def get_rebuild_count(self):
+        """Number of times the route cache was recomputed"""
+        return self._rebuilds
+
+    def __str__(self):
+        open_count = sum(self._valves.values())
+        return (f"PlumbingTopology: {len(self._nodes)} nodes, {len(self._pipes)} pipes, "
+                f"{open_count}/{len(self._valves)} valves open")
@@ -0,0 +1,179 @@
+import math
+from array import array
+
+
+class ReadingHistory:
+    """
+    Fixed-capacity ring buffer of timestamped sensor readings.
+
+    Timestamps and values live in float64 arrays that start small and
+    double until they reach the capacity, so a sensor with a few readings
+    does not pay for a full window, and memory is bounded by the capacity
+    however long the system runs. Rolling mean, variance, min, max and an
+    EWMA are updated in O(1) (amortized for min/max) per sample, and
+    window queries return array slices rather than per-sample Python
+    objects.
+    """
+
+    __slots__ = ('_capacity', '_times', '_values', '_next', '_count', '_seq',
+                 '_mean', '_m2', '_ewma', '_alpha', '_min_queue', '_max_queue', '_min_head', '_max_head')
+
+    INITIAL_SLOTS = 4
+
+    def __init__(self, capacity=64, ewma_alpha=0.2):
+        """
+        Initialize an empty history.
+
+        Args:
+            capacity (int): Number of most recent samples kept
+            ewma_alpha (float): Smoothing factor for the EWMA (0-1)
+        """
+        if capacity <= 0:
+            raise ValueError("History capacity must be positive")
+        self._capacity = capacity
+        slots = min(capacity, self.INITIAL_SLOTS)
+        self._times = array('d', bytes(8 * slots))
+        self._values = array('d', bytes(8 * slots))
+        self._next = 0  # Slot the next sample is written to
+        self._count = 0  # Samples currently in the window
+        self._seq = 0  # Total samples ever added
+        self._mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations over the window
+        self._ewma = None
+        self._alpha = ewma_alpha
+        # Sequence numbers of window samples with increasing / decreasing
+        # values; entries before the head have left the window
+        self._min_queue = []
+        self._max_queue = []
+        self._min_head = 0
+        self._max_head = 0
+
+    def add(self, timestamp, value):
+        """Append a sample, evicting the oldest once the buffer is full"""
+        slot = self._next
+        if self._count == self._capacity:
+            # Sliding-window Welford update: replace the evicted value
+            old = self._values[slot]
+            old_mean = self._mean
+            self._mean = old_mean + (value - old) / self._count
+            self._m2 += (value - old) * (value - self._mean + old - old_mean)
+            if self._m2 < 0.0:
+                self._m2 = 0.0
+        else:
+            if slot == len(self._values):
+                # Not wrapped yet: grow the buffers towards the capacity
+                grow = bytes(8 * (min(self._capacity, 2 * slot) - slot))
+                self._times.frombytes(grow)
+                self._values.frombytes(grow)
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+
+        self._times[slot] = timestamp
+        self._values[slot] = value
+        self._next = (slot + 1) % self._capacity
+
+        seq = self._seq
+        self._seq = seq + 1
+        oldest = self._seq - self._count
+        self._min_head = self._push_extreme(self._min_queue, self._min_head, seq, value, oldest, True)
+        self._max_head = self._push_extreme(self._max_queue, self._max_head, seq, value, oldest, False)
+
+        if self._ewma is None:
+            self._ewma = value
+        else:
+            self._ewma += self._alpha * (value - self._ewma)
+
+    def _push_extreme(self, queue, head, seq, value, oldest, is_min):
+        """Append seq to a monotonic queue and return its new head"""
+        values, capacity = self._values, self._capacity
+        while head < len(queue) and queue[head] < oldest:
+            head += 1
+        if head and 2 * head >= len(queue):
+            del queue[:head]  # Compact once half the list has expired (amortized O(1))
+            head = 0
+        if is_min:
+            while len(queue) > head and values[queue[-1] % capacity] >= value:
+                queue.pop()
+        else:
+            while len(queue) > head and values[queue[-1] % capacity] <= value:
+                queue.pop()
+        queue.append(seq)
+        return head
+
+    def clear(self):
+        """Drop all samples (capacity and EWMA factor are kept)"""
+        self.__init__(self._capacity, self._alpha)
+
+    # Rolling statistics
+
+    def get_capacity(self):
+        return self._capacity
+
+    def get_count(self):
+        """Number of samples currently in the window"""
+        return self._count
+
+    def get_total_samples(self):
+        """Number of samples added since creation"""
+        return self._seq
+
+    def get_latest(self):
+        """Return (timestamp, value) of the newest sample, or None"""
+        if self._count == 0:
+            return None
+        slot = (self._next - 1) % self._capacity
+        return self._times[slot], self._values[slot]
+
+    def get_mean(self):
+        return self._mean if self._count else None
+
+    def get_variance(self):
+        """Population variance over the window"""
+        return self._m2 / self._count if self._count else None
+
+    def get_std(self):
+        variance = self.get_variance()
+        return None if variance is None else math.sqrt(variance)
+
+    def get_min(self):
+        if not self._count:
+            return None
+        return self._values[self._min_queue[self._min_head] % self._capacity]
+
+    def get_max(self):
+        if not self._count:
+            return None
+        return self._values[self._max_queue[self._max_head] % self._capacity]
+
+    def get_ewma(self):
+        return self._ewma
+
+    # Window queries
+
+    def get_window(self, n=None):
+        """
+        Return the newest n samples in chronological order.
+
+        Args:
+            n (int): Number of samples (default: whole window)
+
+        Returns:
+            tuple: (timestamps, values) as float64 arrays
+        """
+        count = self._count if n is None else max(0, min(n, self._count))
+        end = self._next
+        start = (end - count) % self._capacity
+        if count == 0:
+            return array('d'), array('d')
+        if start < end:
+            return self._times[start:end], self._values[start:end]
+        return (self._times[start:] + self._times[:end],
+                self._values[start:] + self._values[:end])
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"ReadingHistory(count={self._count}/{self._capacity})"
@@ -0,0 +1,91 @@
+import threading
+from contextlib import contextmanager
+from enum import IntEnum
+
+
+class Rejection(IntEnum):
+    """
+    Reason a tank or sensor operation was rejected.
+
+    Members are falsy so callers that test `if not tank.add_fuel(x)` keep
+    working, while callers that need the reason can inspect the result.
+    """
+    NEGATIVE_AMOUNT = 1
+    EXCEEDS_CAPACITY = 2
+    INSUFFICIENT_FUEL = 3
+    NEGATIVE_PRESSURE = 4
+    PRESSURE_LIMIT = 5
+    TEMPERATURE_TOO_LOW = 6
+    TEMPERATURE_LIMIT = 7
+    EMERGENCY_MODE_REQUIRED = 8
+    INVALID_LEVEL = 9
+
+    def __bool__(self):
+        return False
+
+
+# Printing is on by default; high-rate loops can switch it off. The
+# setting is per thread, so a quiet batch job does not silence the GUI.
+_local = threading.local()
+_counts = [0] * (max(Rejection) + 1)
+_counts_lock = threading.Lock()
+
+
+def set_verbose(verbose):
+    """Enable or disable printing of rejections and sensor notices in this thread"""
+    _local.verbose = verbose
+
+
+def is_verbose():
+    return getattr(_local, 'verbose', True)
+
+
+@contextmanager
+def quiet():
+    """Suppress rejection and notice printing in this thread for a block"""
+    verbose = is_verbose()
+    _local.verbose = False
+    try:
+        yield
+    finally:
+        _local.verbose = verbose
+
+
+def reject(reason, message, *args):
+    """
+    Record a rejection and return its reason.
+
+    The message is a str.format template that is only formatted and
+    printed in verbose mode.
+
+    Args:
+        reason (Rejection): Why the operation was rejected
+        message (str): Format template for the console message
+        *args: Values for the template
+
+    Returns:
+        Rejection: The reason (falsy)
+    """
+    with _counts_lock:
+        _counts[reason] += 1
+    if getattr(_local, 'verbose', True):
+        print(message.format(*args))
+    return reason
+
+
+def notify(message, *args):
+    """Print an informational notice in verbose mode only"""
+    if getattr(_local, 'verbose', True):
+        print(message.format(*args))
+
+
+def get_rejection_counts():
+    """Return rejection counts keyed by reason name"""
+    with _counts_lock:
+        return {reason.name: _counts[reason] for reason in Rejection}
+
+
+def reset_rejection_counts():
+    with _counts_lock:
+        for i in range(len(_counts)):
+            _counts[i] = 0
@@ -1,8 +1,14 @@
 from .fuel_tank import FuelTank
+from .rejection import Rejection, reject, notify
 
 class ReserveTank(FuelTank):
 
-    def __init__(self, tank_id, name, capacity=1000, initial_fuel=0):
+    __slots__ = ('_emergency_mode',)
+    _tank_type = "RESERVE"
+    _normal_threshold = 70.0
+    _low_threshold = 30.0
+
+    def __init__(self, tank_id, name, capacity=1000, initial_fuel=0, store=None):
         """
         Initialize a reserve fuel tank.
         
@@ -11,15 +17,16 @@ class ReserveTank(FuelTank):
             name (str): Display name (e.g., "Emergency Reserve Tank")
             capacity (float): Maximum capacity in liters (default: 1000L - smaller than main tanks)
             initial_fuel (float): Starting fuel amount in liters
+            store (TankStore): Optional shared store to allocate the tank's row in
         """
         super().__init__(
             tank_id=tank_id,
             name=name,
             capacity=capacity,
             fuel_type="Jet-A",
-            initial_fuel=initial_fuel
+            initial_fuel=initial_fuel,
+            store=store
         )
-        self._tank_type = "RESERVE"
         self._emergency_mode = False
     
     def get_tank_type(self):
@@ -28,13 +35,19 @@ class ReserveTank(FuelTank):
     def is_emergency_mode(self):
         return self._emergency_mode
     
-    def activate_emergency_mode(self):
-        self._emergency_mode = True
-        print(f"WARNING: {self._name} emergency mode ACTIVATED")
+    def activate_emergency_mode(self, quiet=False):
+        if not self._emergency_mode:
+            self._emergency_mode = True
+            self._store.notify_emergency_mode(self._row, True)
+        if not quiet:
+            notify("WARNING: {} emergency mode ACTIVATED", self._name)
     
-    def deactivate_emergency_mode(self):
-        self._emergency_mode = False
-        print(f"{self._name} emergency mode deactivated")
+    def deactivate_emergency_mode(self, quiet=False):
+        if self._emergency_mode:
+            self._emergency_mode = False
+            self._store.notify_emergency_mode(self._row, False)
+        if not quiet:
+            notify("{} emergency mode deactivated", self._name)
     
     def check_status(self):
         """
@@ -49,9 +62,9 @@ class ReserveTank(FuelTank):
         """
         percentage = self.get_fuel_percentage()
         
-        if percentage > 70:
+        if percentage > self._normal_threshold:
             return "NORMAL"
-        elif percentage > 30:
+        elif percentage > self._low_threshold:
             return "LOW"
         else:
             return "CRITICAL"
@@ -65,8 +78,8 @@ class ReserveTank(FuelTank):
     
     def remove_fuel(self, amount):
         if not self._emergency_mode:
-            print(f"Error: Cannot access reserve fuel - emergency mode not activated")
-            return False
+            return reject(Rejection.EMERGENCY_MODE_REQUIRED,
+                          "Error: Cannot access reserve fuel - emergency mode not activated")
         
         # Call parent class method if emergency mode is active
         return super().remove_fuel(amount)
@@ -0,0 +1,335 @@
+from array import array
+from collections import deque
+from itertools import repeat
+from operator import add, and_, gt, le
+import threading
+import time
+
+from .reading_history import ReadingHistory
+from .tank_store import MAX_TYPE_CODE, _RowRef
+
+# Valid raw reading ranges per sensor type (used by self-tests and ingestion)
+SENSOR_RANGES = {
+    "LEVEL": (0.0, 10000.0),  # Liters
+    "PRESSURE": (0.0, 100.0),  # PSI
+    "TEMPERATURE": (-50.0, 100.0)  # Celsius
+}
+_UNBOUNDED = (float("-inf"), float("inf"))
+
+# Sensor types stored as int8 codes (shared by all banks)
+SENSOR_TYPES = list(SENSOR_RANGES)
+_SENSOR_TYPE_CODES = {name: code for code, name in enumerate(SENSOR_TYPES)}
+
+
+def sensor_type_code(sensor_type):
+    """Return the int8 code for a sensor type name, registering it if new"""
+    code = _SENSOR_TYPE_CODES.get(sensor_type)
+    if code is None:
+        code = len(SENSOR_TYPES)
+        if code > MAX_TYPE_CODE:
+            raise ValueError(f"Too many sensor types (int8 code table holds {MAX_TYPE_CODE + 1})")
+        SENSOR_TYPES.append(sensor_type)
+        _SENSOR_TYPE_CODES[sensor_type] = code
+    return code
+
+
+def _range_tables():
+    """Return (low, high) lists indexed by sensor type code"""
+    ranges = [SENSOR_RANGES.get(name, _UNBOUNDED) for name in SENSOR_TYPES]
+    return [r[0] for r in ranges], [r[1] for r in ranges]
+
+
+class SensorBank:
+    """
+    Columnar storage for sensor state - one row per sensor.
+
+    Raw readings and calibration offsets are float64 columns, operational
+    flags, fault codes and sensor types int8 columns. The fault column is
+    owned by a SensorFaultDetector (0: no fault); a row with a fault stays
+    non-operational when later range checks pass. FuelSensor objects are views onto
+    a row; whole batches of readings are ingested by row index with
+    calibration and range checks applied over the arrays.
+    """
+
+    __slots__ = ('reading', 'offset', 'operational', 'fault', 'sensor_type', 'history_size',
+                 '_sensors', '_histories', '_history_count', '_vacant_rows')
+
+    def __init__(self):
+        self.reading = array('d')
+        self.offset = array('d')
+        self.operational = array('b')
+        self.fault = array('b')
+        self.sensor_type = array('b')
+        self.history_size = array('l')
+        self._sensors = []  # row -> sensor view (None for vacant rows)
+        self._histories = []  # row -> ReadingHistory (None until first reading)
+        self._history_count = 0  # Rows with history enabled
+        self._vacant_rows = []
+
+    def add_row(self, sensor, sensor_type, history_size=0):
+        """
+        Append a row for a sensor.
+
+        Returns:
+            int: Index of the new row
+        """
+        self.reading.append(0.0)
+        self.offset.append(0.0)
+        self.operational.append(1)
+        self.fault.append(0)
+        self.sensor_type.append(sensor_type_code(sensor_type))
+        self.history_size.append(history_size)
+        self._sensors.append(sensor)
+        self._histories.append(None)
+        if history_size:
+            self._history_count += 1
+        return len(self._sensors) - 1
+
+    def adopt(self, sensor):
+        """
+        Move a sensor's row from its current bank into this bank.
+
+        Returns:
+            int: Index of the sensor's row in this bank
+        """
+        old_bank, old_row = sensor.get_bank(), sensor.get_row()
+        if old_bank is self:
+            return old_row
+
+        row = len(self._sensors)
+        self.reading.append(old_bank.reading[old_row])
+        self.offset.append(old_bank.offset[old_row])
+        self.operational.append(old_bank.operational[old_row])
+        self.fault.append(0)  # Fault state belongs to the old bank's detector
+        self.sensor_type.append(old_bank.sensor_type[old_row])
+        self.history_size.append(old_bank.history_size[old_row])
+        self._sensors.append(sensor)
+        self._histories.append(old_bank._histories[old_row])
+        if self.history_size[row]:
+            self._history_count += 1
+
+        old_bank.release_row(old_row)
+        sensor._bind(self, row)
+        return row
+
+    def release_row(self, row):
+        """Mark a row as vacant (non-operational, no history)"""
+        if self.history_size[row]:
+            self._history_count -= 1
+        self.operational[row] = 0
+        self.fault[row] = 0
+        self.history_size[row] = 0
+        self._sensors[row] = None
+        self._histories[row] = None
+        self._vacant_rows.append(row)
+
+    def get_sensor(self, row):
+        """Return the sensor viewing a row (None if vacant)"""
+        return self._sensors[row]
+
+    def get_history(self, row):
+        return self._histories[row]
+
+    def __len__(self):
+        return len(self._sensors)
+
+    # Single-row access
+
+    def set_reading(self, row, value, timestamp=None):
+        """Write one raw reading and record it in the row's history"""
+        self.reading[row] = value
+        if self.history_size[row]:
+            self._record(row, time.time() if timestamp is None else timestamp, value)
+
+    def _record(self, row, timestamp, value):
+        history = self._histories[row]
+        if history is None:
+            sensor = self.get_sensor(row)
+            history = self._histories[row] = ReadingHistory(self.history_size[row], sensor.EWMA_ALPHA)
+        history.add(timestamp, value)
+
+    def check_range(self, row):
+        """Return True if the row's raw reading is inside its type's range"""
+        low, high = SENSOR_RANGES.get(SENSOR_TYPES[self.sensor_type[row]], _UNBOUNDED)
+        return low <= self.reading[row] <= high
+
+    # Batch operations
+
+    def ingest(self, values, indices=None, timestamps=None, record_history=True):
+        """
+        Ingest a batch of raw readings.
+
+        Readings are written to the reading column and range-checked against
+        their sensor type. The operational column is set for rows in range
+        and without a detected fault. Calibration offsets are applied to produce calibrated values.
+
+        Args:
+            values: Sequence of raw readings
+            indices: Row index per reading (default: one reading per row, in order)
+            timestamps: Sample time, either one value for the batch or one per reading
+                        (default: time.time())
+            record_history (bool): Also append the readings to sensor histories
+
+        Returns:
+            tuple: (calibrated readings as float64 array, range mask as int8 array)
+        """
+        readings = values if isinstance(values, array) and values.typecode == 'd' else array('d', values)
+        low_by_type, high_by_type = _range_tables()
+
+        if indices is None:
+            if len(readings) != len(self.reading):
+                raise ValueError("Expected one reading per sensor")
+            self.reading[:] = readings
+            types = self.sensor_type
+            offsets = self.offset
+        else:
+            if len(indices) != len(readings):
+                raise ValueError("Expected one index per reading")
+            deque(map(self.reading.__setitem__, indices, readings), maxlen=0)
+            types = array('b', map(self.sensor_type.__getitem__, indices))
+            offsets = map(self.offset.__getitem__, indices)
+
+        calibrated = array('d', map(add, readings, offsets))
+        in_low = map(le, map(low_by_type.__getitem__, types), readings)
+        in_high = map(le, readings, map(high_by_type.__getitem__, types))
+        mask = array('b', map(and_, in_low, in_high))
+
+        self._write_operational(mask, indices)
+
+        if record_history and self._history_count:
+            rows = range(len(readings)) if indices is None else indices
+            if timestamps is None:
+                timestamps = time.time()
+            if not hasattr(timestamps, '__len__'):
+                timestamps = repeat(timestamps)
+            history_size = self.history_size
+            for row, timestamp, value in zip(rows, timestamps, readings):
+                if history_size[row]:
+                    self._record(row, timestamp, value)
+
+        return calibrated, mask
+
+    def get_calibrated_readings(self, indices=None):
+        """
+        Return calibrated readings (reading + offset) as a float64 array.
+
+        Non-operational rows are included; use the operational column to mask them.
+        """
+        if indices is None:
+            return array('d', map(add, self.reading, self.offset))
+        return array('d', map(add, map(self.reading.__getitem__, indices),
+                              map(self.offset.__getitem__, indices)))
+
+    def calibrate(self, offsets, indices=None):
+        """Set calibration offsets for all rows, or for the given rows"""
+        if indices is None:
+            self.offset[:] = array('d', offsets)
+        else:
+            deque(map(self.offset.__setitem__, indices, offsets), maxlen=0)
+
+    def self_test(self, indices=None):
+        """
+        Range-check current raw readings and update operational flags.
+
+        Returns:
+            array: int8 operational mask for the tested rows
+        """
+        low_by_type, high_by_type = _range_tables()
+        if indices is None:
+            readings, types = self.reading, self.sensor_type
+        else:
+            readings = array('d', map(self.reading.__getitem__, indices))
+            types = array('b', map(self.sensor_type.__getitem__, indices))
+        mask = array('b', map(and_, map(le, map(low_by_type.__getitem__, types), readings),
+                              map(le, readings, map(high_by_type.__getitem__, types))))
+        self._write_operational(mask, indices)
+        return mask
+
+    def _write_operational(self, mask, indices):
+        # mask is 0/1 and fault codes are >= 0, so mask > fault means
+        # "in range and not faulty"
+        if indices is None:
+            self.operational[:] = array('b', map(gt, mask, self.fault))
+            for row in self._vacant_rows:
+                self.operational[row] = 0
+        else:
+            deque(map(self.operational.__setitem__, indices,
+                      map(gt, mask, map(self.fault.__getitem__, indices))), maxlen=0)
+
+    def __repr__(self):
+        return f"SensorBank(rows={len(self._sensors)})"
+
+
+class SharedSensorBank(SensorBank):
+    """
+    Bank for sensors created without one (see DEFAULT_BANK).
+
+    Sensors are held weakly; a dropped or adopted sensor releases its row,
+    which is reused, as in SharedTankStore.
+    """
+
+    __slots__ = ('_lock',)
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.RLock()
+
+    def add_row(self, sensor, sensor_type, history_size=0):
+        return self._place(sensor, 0.0, 0.0, 1, sensor_type_code(sensor_type), history_size, None)
+
+    def adopt(self, sensor):
+        old_bank, old_row = sensor.get_bank(), sensor.get_row()
+        if old_bank is self:
+            return old_row
+        row = self._place(sensor, old_bank.reading[old_row], old_bank.offset[old_row],
+                          old_bank.operational[old_row], old_bank.sensor_type[old_row],
+                          old_bank.history_size[old_row], old_bank._histories[old_row])
+        old_bank.release_row(old_row)
+        sensor._bind(self, row)
+        return row
+
+    def _place(self, sensor, reading, offset, operational, type_code, history_size, history):
+        with self._lock:
+            if self._vacant_rows:
+                row = self._vacant_rows.pop()
+                self.reading[row] = reading
+                self.offset[row] = offset
+                self.operational[row] = operational
+                self.fault[row] = 0
+                self.sensor_type[row] = type_code
+                self.history_size[row] = history_size
+                self._sensors[row] = _RowRef(sensor, self._collect, row)
+                self._histories[row] = history
+            else:
+                row = len(self._sensors)
+                self.reading.append(reading)
+                self.offset.append(offset)
+                self.operational.append(operational)
+                self.fault.append(0)
+                self.sensor_type.append(type_code)
+                self.history_size.append(history_size)
+                self._sensors.append(_RowRef(sensor, self._collect, row))
+                self._histories.append(history)
+            if history_size:
+                self._history_count += 1
+        return row
+
+    def _collect(self, ref):
+        with self._lock:
+            if self._sensors[ref.row] is ref:
+                self.release_row(ref.row)
+
+    def release_row(self, row):
+        with self._lock:
+            super().release_row(row)
+
+    def get_sensor(self, row):
+        ref = self._sensors[row]
+        return ref() if ref is not None else None
+
+    def __repr__(self):
+        return f"SharedSensorBank(rows={len(self._sensors)}, vacant={len(self._vacant_rows)})"
+
+
+# Bank of every sensor created without a bank argument
+DEFAULT_BANK = SharedSensorBank()
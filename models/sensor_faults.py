@@ -0,0 +1,236 @@
+from array import array
+from enum import IntEnum
+
+from .sensor_bank import SENSOR_TYPES
+
+# Minimum deviation treated as a spike, per sensor type (guards against a
+# zero MAD when a sensor reads the same value for a whole window)
+SPIKE_FLOORS = {
+    "LEVEL": 20.0,  # Liters
+    "PRESSURE": 1.0,  # PSI
+    "TEMPERATURE": 1.0  # Celsius
+}
+# Maximum distance of a sensor's smoothed reading from its siblings' median
+DRIFT_LIMITS = {
+    "LEVEL": 100.0,  # Liters
+    "PRESSURE": 3.0,  # PSI
+    "TEMPERATURE": 5.0  # Celsius
+}
+_NO_LIMIT = float("inf")
+
+
+class SensorFault(IntEnum):
+    """Fault currently detected on a sensor row"""
+    NONE = 0
+    STUCK = 1
+    SPIKE = 2
+    DRIFT = 3
+
+
+class SensorFaultDetector:
+    """
+    Streaming stuck-at, spike and drift detection over a SensorBank.
+
+    All state is kept in per-row columns of constant size, so each sample
+    costs O(1) regardless of history length:
+
+    - stuck: run length of identical consecutive readings, flagged only
+      while a sibling sensor (same type, same tank) is still moving, so a
+      line that is genuinely steady is not taken out of service. Sensors
+      without siblings are never flagged stuck.
+    - spike: distance from the median of the last few readings, scaled by
+      their median absolute deviation (a Hampel filter)
+    - drift: EWMA of each sensor against the median EWMA of the other
+      sensors of the same type on the same tank (needs three or more)
+
+    Fault codes are kept in the bank's fault column, so range checks done
+    by the bank (ingest, self-tests) cannot put a faulty sensor back in
+    service. A faulty reading clears the row's operational flag; the flag
+    is set again by the next reading that passes every check.
+    """
+
+    def __init__(self, bank, stuck_samples=50, spike_window=9, spike_threshold=5.0,
+                 drift_alpha=0.05, drift_min_samples=20):
+        """
+        Initialize detector.
+
+        Args:
+            bank: SensorBank whose readings are checked
+            stuck_samples (int): Identical readings in a row after which a sensor is
+                                 stuck if a sibling changed within as many readings
+            spike_window (int): Recent readings used for the spike median
+            spike_threshold (float): Spike limit in scaled MADs
+            drift_alpha (float): Smoothing factor of the drift EWMA
+            drift_min_samples (int): Readings before a sensor takes part in drift checks
+        """
+        self._bank = bank
+        self._stuck_samples = stuck_samples
+        self._window = spike_window
+        self._spike_threshold = spike_threshold
+        self._drift_alpha = drift_alpha
+        self._drift_min_samples = drift_min_samples
+
+        self._rows = 0
+        self.last = array('d')
+        self.run = array('l')
+        self.samples = array('l')
+        self.ewma = array('d')
+        self._recent = array('d')  # spike_window readings per row, ring order
+        self._groups = None  # row -> list of sibling rows (same tank and type)
+        self._fault_counts = [0] * len(SensorFault)
+
+    def _ensure_rows(self):
+        rows = len(self._bank)
+        added = rows - self._rows
+        if added <= 0:
+            return
+        self.last.extend([0.0] * added)
+        self.run.extend([0] * added)
+        self.samples.extend([0] * added)
+        self.ewma.extend([0.0] * added)
+        self._recent.extend([0.0] * (added * self._window))
+        self._rows = rows
+        self._groups = None
+
+    def invalidate_groups(self):
+        """Rebuild sibling groups on the next update (sensors were added or removed)"""
+        self._groups = None
+
+    def _build_groups(self):
+        bank = self._bank
+        by_key = {}
+        groups = [None] * self._rows
+        for row in range(self._rows):
+            sensor = bank.get_sensor(row)
+            if sensor is not None:
+                key = (sensor.get_tank_id(), bank.sensor_type[row])
+                groups[row] = by_key.setdefault(key, [])
+                groups[row].append(row)
+        self._groups = groups
+        return groups
+
+    def reset_row(self, row):
+        """Forget a row's state (e.g. after recalibration or replacement)"""
+        self._ensure_rows()
+        self.run[row] = 0
+        self.samples[row] = 0
+        self._bank.fault[row] = SensorFault.NONE
+
+    def update(self, values, mask, indices=None):
+        """
+        Check a batch of calibrated readings.
+
+        Readings already masked out (e.g. out of range) are not fed to the
+        detectors. Rows found faulty are cleared in the mask and in the
+        bank's operational column; rows that pass are set operational again.
+
+        Args:
+            values: Calibrated readings, as returned by SensorBank.ingest
+            mask: int8 operational mask from SensorBank.ingest (updated in place)
+            indices: Row index per reading (default: one reading per row, in order)
+
+        Returns:
+            array: The updated mask
+        """
+        self._ensure_rows()
+        groups = self._groups if self._groups is not None else self._build_groups()
+        rows = range(len(values)) if indices is None else indices
+        types = self._bank.sensor_type
+        operational = self._bank.operational
+        fault = self._bank.fault
+        last, run, samples, ewma = self.last, self.run, self.samples, self.ewma
+        recent, window = self._recent, self._window
+        stuck_samples, alpha = self._stuck_samples, self._drift_alpha
+        spike_threshold = self._spike_threshold
+        floors = [SPIKE_FLOORS.get(name, 0.0) for name in SENSOR_TYPES]
+
+        touched = {}
+        flat = []  # Rows whose run reached stuck_samples in this batch
+        for i, (row, value) in enumerate(zip(rows, values)):
+            if not mask[i]:
+                continue
+            count = samples[row]
+            code = SensorFault.NONE
+
+            # Stuck-at: run of identical readings
+            if count and value == last[row]:
+                run[row] += 1
+                if run[row] >= stuck_samples:
+                    flat.append(row)
+            else:
+                run[row] = 1
+            last[row] = value
+
+            # Spike: Hampel filter over the recent readings
+            base = row * window
+            if count >= window:
+                ordered = sorted(recent[base:base + window])
+                median = ordered[window // 2]
+                mad = sorted(abs(x - median) for x in ordered)[window // 2]
+                scale = max(1.4826 * mad, floors[types[row]])
+                if abs(value - median) > spike_threshold * scale:
+                    code = SensorFault.SPIKE
+            recent[base + count % window] = value
+
+            # Drift: smoothed reading, compared with siblings below
+            ewma[row] = value if count == 0 else ewma[row] + alpha * (value - ewma[row])
+            samples[row] = count + 1
+
+            fault[row] = code
+            group = groups[row]
+            if group is not None and len(group) >= 3:
+                touched[id(group)] = group
+
+        for row in flat:
+            group = groups[row]
+            if group is not None and not fault[row] and any(
+                    run[other] < stuck_samples for other in group if other != row and samples[other]):
+                fault[row] = SensorFault.STUCK
+
+        for group in touched.values():
+            self._check_drift(group, types[group[0]])
+
+        for i, row in enumerate(rows):
+            if not mask[i]:
+                continue
+            if fault[row]:
+                mask[i] = 0
+                operational[row] = 0
+                self._fault_counts[fault[row]] += 1
+            else:
+                operational[row] = 1
+        return mask
+
+    def _check_drift(self, group, type_code):
+        ewma, samples, fault = self.ewma, self.samples, self._bank.fault
+        operational = self._bank.operational
+        ready = [row for row in group if samples[row] >= self._drift_min_samples]
+        if len(ready) < 3:
+            return
+        limit = DRIFT_LIMITS.get(SENSOR_TYPES[type_code], _NO_LIMIT)
+        ordered = sorted(ewma[row] for row in ready)
+        median = ordered[len(ordered) // 2]
+        for row in ready:
+            if abs(ewma[row] - median) > limit:
+                if not fault[row]:
+                    fault[row] = SensorFault.DRIFT
+                    operational[row] = 0
+            elif fault[row] == SensorFault.DRIFT:
+                fault[row] = SensorFault.NONE
+
+    def get_fault(self, row):
+        """Return the SensorFault last detected on a row"""
+        if row >= self._rows:
+            return SensorFault.NONE
+        return SensorFault(self._bank.fault[row])
+
+    def get_faulty_rows(self):
+        fault = self._bank.fault
+        return [row for row in range(self._rows) if fault[row]]
+
+    def get_fault_counts(self):
+        """Return rejected readings per fault type as a dict"""
+        return {fault.name: self._fault_counts[fault] for fault in SensorFault if fault}
+
+    def __repr__(self):
+        return f"SensorFaultDetector(rows={self._rows}, faulty={len(self.get_faulty_rows())})"
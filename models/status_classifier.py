@@ -0,0 +1,102 @@
+from array import array
+from itertools import repeat
+from operator import add, ge, gt, mul, sub
+
+from .tank_store import STATUS_CODES, TANK_TYPES, VACANT
+from .fuel_tank import FuelTank
+from .main_fuel_tank import MainFuelTank
+from .auxiliary_tank import AuxiliaryTank
+from .reserve_tank import ReserveTank
+
+# Per-type (NORMAL above %, LOW above %) thresholds, matching check_status()
+DEFAULT_STATUS_THRESHOLDS = {
+    cls._tank_type: (cls._normal_threshold, cls._low_threshold)
+    for cls in (MainFuelTank, AuxiliaryTank, ReserveTank)
+}
+_FALLBACK_THRESHOLDS = (FuelTank._normal_threshold, FuelTank._low_threshold)
+_CRITICAL = STATUS_CODES["CRITICAL"]
+
+
+def get_thresholds(tank_type, thresholds=None):
+    """
+    Return the (normal_above, low_above) percentages for a tank type.
+
+    Args:
+        tank_type (str): Tank type name (MAIN, AUXILIARY, RESERVE)
+        thresholds (dict): Tank type -> (normal_above, low_above) in percent
+                           (default: DEFAULT_STATUS_THRESHOLDS)
+    """
+    if thresholds is None:
+        thresholds = DEFAULT_STATUS_THRESHOLDS
+    return thresholds.get(tank_type, _FALLBACK_THRESHOLDS)
+
+
+def classify_status(fuel_level, capacity, tank_type, thresholds=None, rising=False):
+    """
+    Classify a single tank the same way classify_statuses() does.
+
+    Args:
+        fuel_level (float): Fuel in liters
+        capacity (float): Tank capacity in liters
+        tank_type (str): Tank type name
+        thresholds (dict): As for classify_statuses
+        rising (bool): The level is climbing through a threshold, so a
+                       level exactly on it already counts as above it
+
+    Returns:
+        str: NORMAL, LOW or CRITICAL
+    """
+    normal, low = get_thresholds(tank_type, thresholds)
+    percent_scaled = fuel_level * 100.0
+    above = ge if rising else gt
+    if above(percent_scaled, normal * capacity):
+        return "NORMAL"
+    if above(percent_scaled, low * capacity):
+        return "LOW"
+    return "CRITICAL"
+
+
+def classify_statuses(store, thresholds=None):
+    """
+    Classify every row of a TankStore in one pass over its columns.
+
+    A row is NORMAL above its type's normal threshold, LOW above its low
+    threshold and CRITICAL otherwise (thresholds are percent of capacity).
+
+    Args:
+        store: TankStore to classify
+        thresholds (dict): Tank type -> (normal_above, low_above) in percent
+                           (default: DEFAULT_STATUS_THRESHOLDS)
+
+    Returns:
+        array: int8 status codes, one per row (vacant rows stay VACANT)
+    """
+    # Threshold lookup tables indexed by tank type code
+    normal_by_type = []
+    low_by_type = []
+    for tank_type in TANK_TYPES:
+        normal, low = get_thresholds(tank_type, thresholds)
+        normal_by_type.append(normal)
+        low_by_type.append(low)
+
+    # Compare fuel * 100 against threshold * capacity to avoid dividing
+    # by zero-capacity rows
+    percent_scaled = array('d', map(mul, store.fuel_level, repeat(100.0)))
+    normal_limit = map(mul, map(normal_by_type.__getitem__, store.tank_type), store.capacity)
+    low_limit = map(mul, map(low_by_type.__getitem__, store.tank_type), store.capacity)
+    above = map(add, map(gt, percent_scaled, normal_limit), map(gt, percent_scaled, low_limit))
+    codes = array('b', map(sub, repeat(_CRITICAL), above))
+
+    for row in store.get_vacant_rows():
+        codes[row] = VACANT
+    return codes
+
+
+def update_statuses(store, thresholds=None):
+    """
+    Reclassify all rows and write the results into the store's status column.
+
+    Returns:
+        list: Rows whose status changed
+    """
+    return store.replace_statuses(classify_statuses(store, thresholds))
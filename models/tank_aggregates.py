@@ -0,0 +1,131 @@
+import math
+import threading
+from itertools import compress, repeat
+from operator import eq
+
+from .tank_store import StoreListener, STATUS_NAMES, STATUS_CODES, VACANT
+
+
+class TankAggregates(StoreListener):
+    """
+    Running totals and status membership for a TankStore.
+
+    Totals and per-status buckets are updated from the store's change hooks
+    as deltas, so totals are O(1) and status queries are O(result) no matter
+    how many tanks the store holds. Total and membership updates are
+    serialized by a small internal lock, so transfers on disjoint tanks
+    may run in different threads.
+    """
+
+    def __init__(self, store, check_consistency=False):
+        """
+        Initialize aggregates and register with the store.
+
+        Args:
+            store: TankStore to track
+            check_consistency (bool): Verify against a full rescan on every
+                                      query (for tests)
+        """
+        self._store = store
+        self._check_consistency = check_consistency
+        self._lock = threading.Lock()
+        self.rebuild()
+        store.add_listener(self)
+
+    def rebuild(self):
+        """Recompute all aggregates from the store columns"""
+        store = self._store
+        self._total_fuel = math.fsum(store.fuel_level)
+        self._total_capacity = math.fsum(store.capacity)
+        # Dicts used as insertion-ordered sets of rows
+        rows = range(len(store.status))
+        self._members = {code: dict.fromkeys(compress(rows, map(eq, store.status, repeat(code))))
+                         for code in range(len(STATUS_NAMES))}
+
+    # StoreListener hooks
+
+    def row_added(self, row):
+        store = self._store
+        with self._lock:
+            self._total_fuel += store.fuel_level[row]
+            self._total_capacity += store.capacity[row]
+            self._members[store.status[row]][row] = None
+
+    def row_released(self, row, fuel_level, capacity, status):
+        with self._lock:
+            self._total_fuel -= fuel_level
+            self._total_capacity -= capacity
+            self._members[status].pop(row, None)
+
+    def fuel_changed(self, row, old_level, new_level):
+        with self._lock:
+            self._total_fuel += new_level - old_level
+
+    def capacity_changed(self, row, old_capacity, new_capacity):
+        with self._lock:
+            self._total_capacity += new_capacity - old_capacity
+
+    def status_changed(self, row, old_code, new_code):
+        with self._lock:
+            if old_code != VACANT:
+                self._members[old_code].pop(row, None)
+            if new_code != VACANT:
+                self._members[new_code][row] = None
+
+    def store_reloaded(self):
+        with self._lock:
+            self.rebuild()
+
+    # Queries
+
+    def get_total_fuel(self):
+        if self._check_consistency:
+            self.verify()
+        return self._total_fuel
+
+    def get_total_capacity(self):
+        if self._check_consistency:
+            self.verify()
+        return self._total_capacity
+
+    def count_status(self, status):
+        if self._check_consistency:
+            self.verify()
+        with self._lock:
+            return len(self._members[STATUS_CODES[status]])
+
+    def get_tanks_by_status(self, status):
+        """Return tanks with the given status, in store row order"""
+        return self.get_tanks_by_statuses((status,))
+
+    def get_tanks_by_statuses(self, statuses):
+        """Return tanks whose status is any of the given names, in store row order"""
+        if self._check_consistency:
+            self.verify()
+        with self._lock:
+            rows = [row for status in statuses for row in self._members[STATUS_CODES[status]]]
+        rows.sort()  # O(k log k) in the result size, not the store size
+        get_tank = self._store.get_tank
+        return [get_tank(row) for row in rows]
+
+    def verify(self):
+        """
+        Compare the running aggregates against a full rescan of the store.
+
+        Raises:
+            RuntimeError: If any aggregate has drifted from the store
+        """
+        store = self._store
+        total_fuel = math.fsum(store.fuel_level)
+        total_capacity = math.fsum(store.capacity)
+        if not math.isclose(self._total_fuel, total_fuel, rel_tol=1e-9, abs_tol=1e-6):
+            raise RuntimeError(f"Total fuel drifted: {self._total_fuel} != {total_fuel}")
+        if not math.isclose(self._total_capacity, total_capacity, rel_tol=1e-9, abs_tol=1e-6):
+            raise RuntimeError(f"Total capacity drifted: {self._total_capacity} != {total_capacity}")
+        with self._lock:
+            buckets = {code: list(members) for code, members in self._members.items()}
+        for code, members in buckets.items():
+            expected = {row for row, status in enumerate(store.status) if status == code}
+            if set(members) != expected:
+                raise RuntimeError(f"{STATUS_NAMES[code]} membership out of sync with store")
+        return True
@@ -0,0 +1,197 @@
+import threading
+from collections import namedtuple
+
+from .tank_store import StoreListener, FUEL_TYPES, STATUS_NAMES, VACANT
+
+# Event kinds
+FUEL_LEVEL = "FUEL_LEVEL"
+CAPACITY = "CAPACITY"
+STATUS = "STATUS"
+FUEL_TYPE = "FUEL_TYPE"
+PRESSURE = "PRESSURE"
+TEMPERATURE = "TEMPERATURE"
+EMERGENCY_MODE = "EMERGENCY_MODE"
+TANK_ADDED = "TANK_ADDED"
+TANK_REMOVED = "TANK_REMOVED"
+RELOADED = "RELOADED"  # Bulk write (e.g. snapshot restore): re-read everything
+
+EVENT_KINDS = (FUEL_LEVEL, CAPACITY, STATUS, FUEL_TYPE, PRESSURE, TEMPERATURE, EMERGENCY_MODE,
+               TANK_ADDED, TANK_REMOVED, RELOADED)
+_VALUE_KINDS = frozenset((FUEL_LEVEL, CAPACITY, STATUS, FUEL_TYPE, PRESSURE, TEMPERATURE, EMERGENCY_MODE))
+
+# old/new are the values before and after the change (status and fuel type as names);
+# both are None for TANK_ADDED, TANK_REMOVED and RELOADED
+TankEvent = namedtuple("TankEvent", ["kind", "tank_id", "old", "new"])
+
+
+class TankEventBus(StoreListener):
+    """
+    In-process change notifications for the tanks of a TankStore.
+
+    Store change hooks are recorded as pending events, coalesced per
+    (kind, tank): ten fuel changes on one tank between flushes become one
+    FUEL_LEVEL event carrying the first old value and the last new value,
+    and changes that end where they started are dropped. flush() delivers
+    the pending events to each subscriber as one list, so consumers such
+    as the GUI or the alert system react only to what changed.
+
+    Hooks are cheap no-ops while nobody is subscribed, so transfers pay
+    nothing for an idle bus.
+    """
+
+    def __init__(self, store):
+        """
+        Initialize the bus and register with the store.
+
+        Args:
+            store: TankStore to watch
+        """
+        self._store = store
+        self._lock = threading.Lock()
+        self._subscribers = {}  # subscription ID -> (callback, kinds, tank_ids)
+        self._next_id = 1
+        self._pending = {}  # (kind, tank ID) -> [old, new]
+        self._published = 0
+        self._delivered = 0
+        store.add_listener(self)
+
+    def subscribe(self, callback, kinds=None, tank_ids=None):
+        """
+        Register a callback for change events.
+
+        Args:
+            callback: Called with a list of TankEvents on each flush
+            kinds: Event kinds to receive (None: all)
+            tank_ids: Tank IDs to receive events for (None: all). RELOADED
+                      is delivered regardless, since it concerns every tank.
+
+        Returns:
+            int: Subscription ID for unsubscribe()
+        """
+        if kinds is not None:
+            kinds = frozenset(kinds)
+            unknown = kinds.difference(EVENT_KINDS)
+            if unknown:
+                raise ValueError(f"Unknown event kinds: {sorted(unknown)}")
+        if tank_ids is not None:
+            tank_ids = frozenset(tank_ids)
+        with self._lock:
+            subscription = self._next_id
+            self._next_id += 1
+            self._subscribers[subscription] = (callback, kinds, tank_ids)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription. Returns True if it existed."""
+        with self._lock:
+            removed = self._subscribers.pop(subscription, None) is not None
+            if not self._subscribers:
+                self._pending = {}
+        return removed
+
+    def _publish(self, kind, row, old, new):
+        tank_id = self._store.get_tank_id(row)
+        key = (kind, tank_id)
+        with self._lock:
+            self._published += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = [old, new]
+            else:
+                pending[1] = new
+
+    # StoreListener hooks
+
+    def row_added(self, row):
+        if self._subscribers:
+            self._publish(TANK_ADDED, row, None, None)
+
+    def row_released(self, row, fuel_level, capacity, status):
+        if self._subscribers:
+            self._publish(TANK_REMOVED, row, None, None)
+
+    def fuel_changed(self, row, old_level, new_level):
+        if self._subscribers:
+            self._publish(FUEL_LEVEL, row, old_level, new_level)
+
+    def capacity_changed(self, row, old_capacity, new_capacity):
+        if self._subscribers:
+            self._publish(CAPACITY, row, old_capacity, new_capacity)
+
+    def status_changed(self, row, old_code, new_code):
+        if self._subscribers and VACANT not in (old_code, new_code):
+            self._publish(STATUS, row, STATUS_NAMES[old_code], STATUS_NAMES[new_code])
+
+    def fuel_type_changed(self, row, old_code, new_code):
+        if self._subscribers:
+            self._publish(FUEL_TYPE, row, FUEL_TYPES[old_code], FUEL_TYPES[new_code])
+
+    def pressure_changed(self, row, old_pressure, new_pressure):
+        if self._subscribers:
+            self._publish(PRESSURE, row, old_pressure, new_pressure)
+
+    def temperature_changed(self, row, old_temperature, new_temperature):
+        if self._subscribers:
+            self._publish(TEMPERATURE, row, old_temperature, new_temperature)
+
+    def emergency_mode_changed(self, row, active):
+        if self._subscribers:
+            self._publish(EMERGENCY_MODE, row, not active, active)
+
+    def store_reloaded(self):
+        if self._subscribers:
+            with self._lock:
+                self._published += 1
+                self._pending[(RELOADED, None)] = [None, None]
+
+    # Delivery
+
+    def has_pending(self):
+        """Check if any events are waiting for flush()"""
+        return bool(self._pending)
+
+    def flush(self):
+        """
+        Deliver pending events to subscribers.
+
+        Callbacks run outside the bus lock, so they may read tanks or
+        trigger further changes (delivered on the next flush). A failing
+        callback is reported and does not stop delivery to the others.
+
+        Returns:
+            int: Number of events delivered after coalescing
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            subscribers = list(self._subscribers.values())
+        events = [TankEvent(kind, tank_id, old, new)
+                  for (kind, tank_id), (old, new) in pending.items()
+                  if kind not in _VALUE_KINDS or old != new]
+        if not events:
+            return 0
+
+        for callback, kinds, tank_ids in subscribers:
+            selected = [event for event in events
+                        if (kinds is None or event.kind in kinds)
+                        and (tank_ids is None or event.tank_id in tank_ids or event.kind == RELOADED)]
+            if selected:
+                try:
+                    callback(selected)
+                except Exception as e:
+                    print(f"Error in tank event subscriber: {e}")
+        with self._lock:
+            self._delivered += len(events)
+        return len(events)
+
+    def get_metrics(self):
+        """Return raw and coalesced event counts"""
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self._published,
+                "delivered": self._delivered,
+                "pending": len(self._pending),
+            }
+
+    def __str__(self):
+        return f"TankEventBus({len(self._subscribers)} subscribers, {len(self._pending)} pending)"
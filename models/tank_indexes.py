@@ -0,0 +1,316 @@
+import threading
+from bisect import bisect_left, insort
+from itertools import chain, compress, islice, repeat, takewhile
+from operator import eq, mul, ne, sub, truediv
+
+from .tank_store import StoreListener, TANK_TYPES, VACANT, _TANK_TYPE_CODES, _FUEL_TYPE_CODES
+
+
+class SortedKeys:
+    """
+    Sorted sequence of keys stored as a list of chunks.
+
+    Inserting or removing a key touches one chunk of at most 2 * LOAD
+    keys, so updates cost O(log n + LOAD) instead of shifting one list of n.
+    """
+
+    LOAD = 256
+
+    def __init__(self, keys=()):
+        keys = sorted(keys)
+        load = self.LOAD
+        self._chunks = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._length = len(keys)
+
+    def add(self, key):
+        chunks, maxes = self._chunks, self._maxes
+        self._length += 1
+        if not chunks:
+            chunks.append([key])
+            maxes.append(key)
+            return
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            i -= 1
+            chunks[i].append(key)
+            maxes[i] = key
+        else:
+            insort(chunks[i], key)
+        chunk = chunks[i]
+        if len(chunk) > 2 * self.LOAD:
+            half = self.LOAD
+            chunks[i:i + 1] = [chunk[:half], chunk[half:]]
+            maxes[i:i + 1] = [chunk[half - 1], chunk[-1]]
+
+    def remove(self, key):
+        """Remove a key that is known to be present"""
+        chunks, maxes = self._chunks, self._maxes
+        i = bisect_left(maxes, key)
+        chunk = chunks[i]
+        del chunk[bisect_left(chunk, key)]
+        self._length -= 1
+        if chunk:
+            maxes[i] = chunk[-1]
+        else:
+            del chunks[i]
+            del maxes[i]
+
+    def iter_from(self, low):
+        """Iterate keys >= low in ascending order"""
+        i = bisect_left(self._maxes, low)
+        if i == len(self._maxes):
+            return iter(())
+        chunk = self._chunks[i]
+        return chain(chunk[bisect_left(chunk, low):], chain.from_iterable(self._chunks[i + 1:]))
+
+    def __iter__(self):
+        return chain.from_iterable(self._chunks)
+
+    def __reversed__(self):
+        return chain.from_iterable(map(reversed, reversed(self._chunks)))
+
+    def __len__(self):
+        return self._length
+
+
+class TankIndexes(StoreListener):
+    """
+    Secondary indexes over a TankStore.
+
+    Tank type and fuel type are hash indexes (code -> rows). Fuel
+    percentage - overall and per tank type - and available capacity are
+    kept as sorted lists of (key, row) pairs, so range and top-k queries
+    are a bisect plus the k results. Keys are updated from the store's
+    change hooks. Fuel and capacity changes only mark the row dirty, so
+    transfers stay cheap; the next query moves the dirty rows' keys, or
+    rebuilds everything if many rows changed or the store was bulk-written.
+    A rebuild costs O(n log n) but only follows more than
+    REBUILD_FRACTION * n changes (or a reload, itself O(n)), so queries
+    are O(log n + k) amortized over those changes, not in the worst case.
+    """
+
+    REBUILD_FRACTION = 0.125  # Dirty-row share above which a query rebuilds instead
+
+    def __init__(self, store):
+        """
+        Initialize indexes and register with the store.
+
+        Args:
+            store: TankStore to index
+        """
+        self._store = store
+        self._lock = threading.Lock()
+        self.rebuild()
+        store.add_listener(self)
+
+    def rebuild(self):
+        """Recompute all indexes from the store columns"""
+        store = self._store
+        rows = list(compress(range(len(store.status)), map(ne, store.status, repeat(VACANT))))
+        levels = list(map(store.fuel_level.__getitem__, rows))
+        capacities = list(map(store.capacity.__getitem__, rows))
+        if 0.0 in capacities:
+            percentages = [self._keys(row)[0] for row in rows]
+        else:
+            # Same expression as _keys(), so keys found later compare equal
+            percentages = list(map(mul, map(truediv, levels, capacities), repeat(100)))
+        available = list(map(sub, capacities, levels))
+        tank_types = list(map(store.tank_type.__getitem__, rows))
+        fuel_types = list(map(store.fuel_type.__getitem__, rows))
+
+        self._percentage = dict(zip(rows, percentages))  # row -> current percentage key
+        self._available = dict(zip(rows, available))  # row -> current available capacity key
+        self._by_tank_type = {code: dict.fromkeys(compress(rows, map(eq, tank_types, repeat(code))))
+                              for code in set(tank_types)}
+        self._by_fuel_type = {code: dict.fromkeys(compress(rows, map(eq, fuel_types, repeat(code))))
+                              for code in set(fuel_types)}
+        # Tank type code (None: all tanks) -> sorted (percentage, row)
+        keys = list(zip(percentages, rows))
+        self._by_percentage = {None: SortedKeys(keys)}
+        for code in set(tank_types):
+            self._by_percentage[code] = SortedKeys(compress(keys, map(eq, tank_types, repeat(code))))
+        self._by_available = SortedKeys(zip(available, rows))
+        self._dirty = {}
+        self._stale = False
+
+    def _add_row(self, row):
+        store = self._store
+        tank_type = store.tank_type[row]
+        self._by_tank_type.setdefault(tank_type, {})[row] = None
+        self._by_fuel_type.setdefault(store.fuel_type[row], {})[row] = None
+        percentage, available = self._keys(row)
+        self._percentage[row] = percentage
+        self._available[row] = available
+        self._by_percentage[None].add((percentage, row))
+        self._by_percentage.setdefault(tank_type, SortedKeys()).add((percentage, row))
+        self._by_available.add((available, row))
+
+    def _keys(self, row):
+        store = self._store
+        capacity = store.capacity[row]
+        level = store.fuel_level[row]
+        return (level / capacity * 100 if capacity else 0.0), capacity - level
+
+    @staticmethod
+    def _move(keys, old, new):
+        keys.remove(old)
+        keys.add(new)
+
+    def _update_keys(self, row):
+        percentage, available = self._keys(row)
+        old_percentage = self._percentage.get(row)
+        if old_percentage is None:
+            return  # Row not indexed (vacant)
+        if percentage != old_percentage:
+            self._move(self._by_percentage[None], (old_percentage, row), (percentage, row))
+            self._move(self._by_percentage[self._store.tank_type[row]],
+                       (old_percentage, row), (percentage, row))
+            self._percentage[row] = percentage
+        old_available = self._available[row]
+        if available != old_available:
+            self._move(self._by_available, (old_available, row), (available, row))
+            self._available[row] = available
+
+    # StoreListener hooks
+
+    def row_added(self, row):
+        with self._lock:
+            if not self._stale:
+                self._refresh_dirty()
+                self._add_row(row)
+
+    def row_released(self, row, fuel_level, capacity, status):
+        with self._lock:
+            if self._stale:
+                return
+            self._refresh_dirty()
+            percentage = self._percentage.pop(row, None)
+            if percentage is None:
+                return
+            available = self._available.pop(row)
+            tank_type = self._store.tank_type[row]
+            self._by_tank_type[tank_type].pop(row, None)
+            self._by_fuel_type[self._store.fuel_type[row]].pop(row, None)
+            self._by_percentage[None].remove((percentage, row))
+            self._by_percentage[tank_type].remove((percentage, row))
+            self._by_available.remove((available, row))
+
+    def fuel_changed(self, row, old_level, new_level):
+        with self._lock:
+            self._dirty[row] = None
+
+    def capacity_changed(self, row, old_capacity, new_capacity):
+        with self._lock:
+            self._dirty[row] = None
+
+    def fuel_type_changed(self, row, old_code, new_code):
+        with self._lock:
+            if self._stale or row not in self._percentage:
+                return
+            self._by_fuel_type[old_code].pop(row, None)
+            self._by_fuel_type.setdefault(new_code, {})[row] = None
+
+    def store_reloaded(self):
+        with self._lock:
+            self._stale = True
+
+    # Queries
+
+    def _fresh(self):
+        """Bring the indexes up to date (call with the lock held)"""
+        if self._stale or len(self._dirty) > self.REBUILD_FRACTION * len(self._percentage):
+            self.rebuild()
+        else:
+            self._refresh_dirty()
+
+    def _refresh_dirty(self):
+        if self._dirty:
+            for row in self._dirty:
+                self._update_keys(row)
+            self._dirty = {}
+
+    def _tanks(self, rows):
+        get_tank = self._store.get_tank
+        return [get_tank(row) for row in rows]
+
+    def get_tanks_by_type(self, tank_type):
+        """Tanks of a tank type (MAIN, AUXILIARY, RESERVE)"""
+        with self._lock:
+            self._fresh()
+            rows = list(self._by_tank_type.get(_TANK_TYPE_CODES.get(tank_type), ()))
+        return self._tanks(rows)
+
+    def get_tanks_by_fuel_type(self, fuel_type):
+        with self._lock:
+            self._fresh()
+            rows = list(self._by_fuel_type.get(_FUEL_TYPE_CODES.get(fuel_type), ()))
+        return self._tanks(rows)
+
+    def _percentage_keys(self, tank_type):
+        self._fresh()
+        if tank_type is None:
+            return self._by_percentage[None]
+        return self._by_percentage.get(_TANK_TYPE_CODES.get(tank_type), SortedKeys())
+
+    def get_tanks_in_percentage_range(self, low=0.0, high=100.0, tank_type=None):
+        """
+        Tanks whose fuel percentage is in [low, high), emptiest first.
+
+        Args:
+            low (float): Lower bound in percent (inclusive)
+            high (float): Upper bound in percent (exclusive)
+            tank_type (str): Optional tank type filter
+        """
+        with self._lock:
+            keys = self._percentage_keys(tank_type)
+            in_range = takewhile(lambda key: key[0] < high, keys.iter_from((low, -1)))
+            rows = [row for _, row in in_range]
+        return self._tanks(rows)
+
+    def get_tanks_below_percentage(self, percentage, tank_type=None):
+        """Tanks below a fuel percentage, emptiest first"""
+        return self.get_tanks_in_percentage_range(float("-inf"), percentage, tank_type)
+
+    def get_fullest_tanks(self, count, tank_type=None):
+        """The count fullest tanks (by percentage), fullest first"""
+        with self._lock:
+            keys = self._percentage_keys(tank_type)
+            rows = [row for _, row in islice(reversed(keys), count)]
+        return self._tanks(rows)
+
+    def get_emptiest_tanks(self, count, tank_type=None):
+        """The count emptiest tanks (by percentage), emptiest first"""
+        with self._lock:
+            keys = self._percentage_keys(tank_type)
+            rows = [row for _, row in islice(keys, count)]
+        return self._tanks(rows)
+
+    def get_tanks_with_available_capacity(self, liters):
+        """Tanks that can take at least the given liters, least room first"""
+        with self._lock:
+            self._fresh()
+            rows = [row for _, row in self._by_available.iter_from((liters, -1))]
+        return self._tanks(rows)
+
+    def verify(self):
+        """
+        Compare the indexes against a full rescan of the store.
+
+        Raises:
+            RuntimeError: If an index has drifted from the store
+        """
+        with self._lock:
+            self._fresh()
+        store = self._store
+        expected = sorted((self._keys(row)[0], row) for row, status in enumerate(store.status)
+                          if status != VACANT)
+        if expected != list(self._by_percentage[None]):
+            raise RuntimeError("Percentage index out of sync with store")
+        expected = sorted((self._keys(row)[1], row) for row, status in enumerate(store.status)
+                          if status != VACANT)
+        if expected != list(self._by_available):
+            raise RuntimeError("Available capacity index out of sync with store")
+        for code, rows in self._by_tank_type.items():
+            if any(store.tank_type[row] != code or store.status[row] == VACANT for row in rows):
+                raise RuntimeError(f"{TANK_TYPES[code]} type index out of sync with store")
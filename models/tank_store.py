@@ -0,0 +1,492 @@
+import threading
+import weakref
+from array import array
+from collections import deque
+from itertools import compress, repeat
+from operator import eq, ne
+
+# Status codes stored in the int8 status column
+STATUS_NAMES = ("NORMAL", "LOW", "CRITICAL")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+VACANT = -1  # Status code for rows whose tank has moved to another store
+
+# Per-row columns, in snapshot order
+COLUMNS = ('fuel_level', 'capacity', 'pressure', 'temperature', 'status', 'fuel_type', 'tank_type')
+
+# Fuel and tank types stored as int8 codes (code tables shared by all stores)
+FUEL_TYPES = ["Jet-A"]
+_FUEL_TYPE_CODES = {"Jet-A": 0}
+TANK_TYPES = []
+_TANK_TYPE_CODES = {}
+MAX_TYPE_CODE = 127  # Largest value an int8 column can hold
+
+
+def _intern_code(names, codes, name, kind):
+    code = codes.get(name)
+    if code is None:
+        if name is None:
+            raise ValueError(f"{kind} must not be None")
+        code = len(names)
+        if code > MAX_TYPE_CODE:
+            raise ValueError(f"Too many {kind}s (int8 code table holds {MAX_TYPE_CODE + 1})")
+        names.append(name)
+        codes[name] = code
+    return code
+
+
+def fuel_type_code(fuel_type):
+    """Return the int8 code for a fuel type name, registering it if new"""
+    return _intern_code(FUEL_TYPES, _FUEL_TYPE_CODES, fuel_type, "fuel type")
+
+
+def tank_type_code(tank_type):
+    """Return the int8 code for a tank type name, registering it if new"""
+    return _intern_code(TANK_TYPES, _TANK_TYPE_CODES, tank_type, "tank type")
+
+
+class StoreListener:
+    """
+    Base class for objects notified of TankStore row changes.
+
+    Subclasses override the hooks they need; all default to no-ops.
+    """
+
+    def row_added(self, row):
+        pass
+
+    def row_released(self, row, fuel_level, capacity, status):
+        pass
+
+    def fuel_changed(self, row, old_level, new_level):
+        pass
+
+    def capacity_changed(self, row, old_capacity, new_capacity):
+        pass
+
+    def status_changed(self, row, old_code, new_code):
+        pass
+
+    def fuel_type_changed(self, row, old_code, new_code):
+        pass
+
+    def pressure_changed(self, row, old_pressure, new_pressure):
+        pass
+
+    def temperature_changed(self, row, old_temperature, new_temperature):
+        pass
+
+    def emergency_mode_changed(self, row, active):
+        pass
+
+    def store_reloaded(self):
+        """Called after a bulk write (replace_columns / write_rows) instead of per-row hooks"""
+        pass
+
+
+class TankStore:
+    """
+    Columnar (struct-of-arrays) storage for tank state.
+
+    Each tank owns one row. Fuel level, capacity, pressure and temperature
+    are kept in contiguous float64 columns and the status in an int8 column,
+    so fleet-wide aggregates and scans run over the columns in a single pass
+    instead of calling methods on every tank object.
+
+    Fuel level, capacity, pressure, temperature and status should be
+    written through the set_* methods so that registered StoreListeners
+    see every change.
+
+    status_thresholds, if set, is the tank type -> (normal_above,
+    low_above) table tanks in this store are classified with when their
+    fuel changes; None leaves it to each tank's check_status().
+    """
+
+    __slots__ = ('fuel_level', 'capacity', 'pressure', 'temperature',
+                 'status', 'fuel_type', 'tank_type', 'status_thresholds',
+                 '_tanks', '_tank_ids', '_vacant_rows', '_listeners')
+
+    def __init__(self):
+        self.fuel_level = array('d')
+        self.capacity = array('d')
+        self.pressure = array('d')
+        self.temperature = array('d')
+        self.status = array('b')
+        self.fuel_type = array('b')
+        self.tank_type = array('b')
+        self.status_thresholds = None
+        self._tanks = []  # row -> tank view (None for vacant rows)
+        self._tank_ids = []  # row -> tank ID (None for vacant rows)
+        self._vacant_rows = []
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """Register a StoreListener for row changes"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Unregister a StoreListener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def add_row(self, tank, capacity, fuel_level, pressure, temperature, status="NORMAL",
+                fuel_type="Jet-A", tank_type=None):
+        """
+        Append a row for a tank.
+
+        Args:
+            tank: Tank object viewing this row
+            capacity (float): Maximum capacity in liters
+            fuel_level (float): Current fuel level in liters
+            pressure (float): Pressure in PSI
+            temperature (float): Temperature in Celsius
+            status (str): Status name (NORMAL, LOW, CRITICAL)
+            fuel_type (str): Fuel type name
+            tank_type (str): Tank type name (MAIN, AUXILIARY, RESERVE)
+
+        Returns:
+            int: Index of the new row
+        """
+        self.fuel_level.append(fuel_level)
+        self.capacity.append(capacity)
+        self.pressure.append(pressure)
+        self.temperature.append(temperature)
+        self.status.append(STATUS_CODES[status])
+        self.fuel_type.append(fuel_type_code(fuel_type))
+        self.tank_type.append(tank_type_code(tank_type))
+        self._tanks.append(tank)
+        self._tank_ids.append(tank.get_tank_id())
+        row = len(self._tanks) - 1
+        for listener in self._listeners:
+            listener.row_added(row)
+        return row
+
+    def adopt(self, tank):
+        """
+        Move a tank's row from its current store into this store.
+
+        The old row is released so it no longer counts towards the old
+        store's aggregates, and the tank is rebound to its new row.
+
+        Returns:
+            int: Index of the tank's row in this store
+        """
+        old_store, old_row = tank.get_store(), tank.get_row()
+        if old_store is self:
+            return old_row
+
+        row = len(self._tanks)
+        self.fuel_level.append(old_store.fuel_level[old_row])
+        self.capacity.append(old_store.capacity[old_row])
+        self.pressure.append(old_store.pressure[old_row])
+        self.temperature.append(old_store.temperature[old_row])
+        self.status.append(old_store.status[old_row])
+        self.fuel_type.append(old_store.fuel_type[old_row])
+        self.tank_type.append(old_store.tank_type[old_row])
+        self._tanks.append(tank)
+        self._tank_ids.append(tank.get_tank_id())
+        for listener in self._listeners:
+            listener.row_added(row)
+
+        old_store.release_row(old_row)
+        tank._bind(self, row)
+        return row
+
+    def release_row(self, row):
+        """Mark a row as vacant and exclude it from aggregates"""
+        fuel_level, capacity, status = self.fuel_level[row], self.capacity[row], self.status[row]
+        self.fuel_level[row] = 0.0
+        self.capacity[row] = 0.0
+        self.status[row] = VACANT
+        self._vacant_rows.append(row)
+        # Listeners run before the tank is unbound, so they can still see its ID
+        for listener in self._listeners:
+            listener.row_released(row, fuel_level, capacity, status)
+        self._tanks[row] = None
+        self._tank_ids[row] = None
+
+    # Notifying setters
+
+    def set_fuel_level(self, row, value):
+        """Write a fuel level and notify listeners"""
+        old = self.fuel_level[row]
+        self.fuel_level[row] = value
+        for listener in self._listeners:
+            listener.fuel_changed(row, old, self.fuel_level[row])
+
+    def set_capacity(self, row, value):
+        """Write a capacity and notify listeners"""
+        old = self.capacity[row]
+        self.capacity[row] = value
+        for listener in self._listeners:
+            listener.capacity_changed(row, old, self.capacity[row])
+
+    def set_pressure(self, row, value):
+        """Write a pressure and notify listeners"""
+        old = self.pressure[row]
+        self.pressure[row] = value
+        for listener in self._listeners:
+            listener.pressure_changed(row, old, value)
+
+    def set_temperature(self, row, value):
+        """Write a temperature and notify listeners"""
+        old = self.temperature[row]
+        self.temperature[row] = value
+        for listener in self._listeners:
+            listener.temperature_changed(row, old, value)
+
+    def notify_emergency_mode(self, row, active):
+        """Tell listeners a reserve tank's emergency mode changed (the flag lives on the tank)"""
+        for listener in self._listeners:
+            listener.emergency_mode_changed(row, active)
+
+    def set_fuel_type(self, row, code):
+        """Write a fuel type code and notify listeners if it changed"""
+        old = self.fuel_type[row]
+        if old == code:
+            return
+        self.fuel_type[row] = code
+        for listener in self._listeners:
+            listener.fuel_type_changed(row, old, code)
+
+    def set_status(self, row, code):
+        """Write a status code and notify listeners if it changed"""
+        old = self.status[row]
+        if old == code:
+            return
+        self.status[row] = code
+        for listener in self._listeners:
+            listener.status_changed(row, old, code)
+
+    def replace_statuses(self, codes):
+        """
+        Replace the whole status column (e.g. after batch classification).
+
+        Returns:
+            list: Rows whose status changed
+        """
+        changed = list(compress(range(len(codes)), map(ne, self.status, codes)))
+        if self._listeners:
+            old_codes = [self.status[row] for row in changed]
+            self.status[:] = codes
+            for row, old in zip(changed, old_codes):
+                for listener in self._listeners:
+                    listener.status_changed(row, old, codes[row])
+        else:
+            self.status[:] = codes
+        return changed
+
+    # Bulk writes - one listener notification per call
+
+    def replace_columns(self, columns):
+        """
+        Overwrite whole columns, e.g. when restoring a snapshot.
+
+        Args:
+            columns (dict): Column name -> array with one value per row
+        """
+        rows = len(self._tanks)
+        for name, values in columns.items():
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown column: {name}")
+            if len(values) != rows:
+                raise ValueError(f"Column {name} has {len(values)} values for {rows} rows")
+        for name, values in columns.items():
+            column = getattr(self, name)
+            column[:] = values if isinstance(values, array) else array(column.typecode, values)
+        for listener in self._listeners:
+            listener.store_reloaded()
+
+    def write_rows(self, rows, columns):
+        """
+        Write values into selected rows of each given column.
+
+        Args:
+            rows: Row indices
+            columns (dict): Column name -> values, one per row index
+        """
+        for name, values in columns.items():
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown column: {name}")
+            deque(map(getattr(self, name).__setitem__, rows, values), maxlen=0)
+        for listener in self._listeners:
+            listener.store_reloaded()
+
+    def get_tank(self, row):
+        """Return the tank viewing a row (None if vacant)"""
+        return self._tanks[row]
+
+    def get_tank_id(self, row):
+        """Return the tank ID of a row (None if vacant)"""
+        return self._tank_ids[row]
+
+    def get_tank_ids(self):
+        """Return the tank ID of every row (None for vacant rows)"""
+        return list(self._tank_ids)
+
+    def get_vacant_rows(self):
+        """Return rows released by tanks that moved to another store"""
+        return self._vacant_rows
+
+    def get_row_count(self):
+        """Return number of rows, including vacant ones"""
+        return len(self._tanks)
+
+    # Aggregates - single pass over a column
+
+    def get_total_fuel(self):
+        """Sum of the fuel level column"""
+        return sum(self.fuel_level)
+
+    def get_total_capacity(self):
+        """Sum of the capacity column"""
+        return sum(self.capacity)
+
+    def count_status(self, status):
+        """Count rows with the given status name"""
+        return self.status.count(STATUS_CODES[status])
+
+    def get_tanks_by_status(self, status):
+        """Return tanks whose status column matches the given status name"""
+        code = STATUS_CODES[status]
+        return list(compress(self._tanks, map(eq, self.status, repeat(code))))
+
+    def get_tanks_by_type(self, tank_type):
+        """Return tanks whose tank type column matches the given type name"""
+        code = _TANK_TYPE_CODES.get(tank_type)
+        if code is None:
+            return []
+        return list(compress(self._tanks, map(eq, self.tank_type, repeat(code))))
+
+    def get_tanks_by_statuses(self, statuses):
+        """Return tanks whose status is any of the given status names"""
+        codes = {STATUS_CODES[status] for status in statuses}
+        return list(compress(self._tanks, map(codes.__contains__, self.status)))
+
+    # Export
+
+    def to_columns(self):
+        """
+        Export the store as plain lists, one per column.
+
+        Vacant rows are included so that indexes line up with row numbers;
+        their status is None.
+
+        Returns:
+            dict: Column name -> list of values
+        """
+        names = STATUS_NAMES + (None,)
+        return {
+            "tank_id": list(self._tank_ids),
+            "fuel_level": self.fuel_level.tolist(),
+            "capacity": self.capacity.tolist(),
+            "pressure": self.pressure.tolist(),
+            "temperature": self.temperature.tolist(),
+            "status": [names[code] for code in self.status],
+            "fuel_type": [FUEL_TYPES[code] for code in self.fuel_type],
+            "tank_type": [TANK_TYPES[code] for code in self.tank_type]
+        }
+
+    def __len__(self):
+        return len(self._tanks)
+
+    def __repr__(self):
+        return f"TankStore(rows={len(self._tanks)})"
+
+
+class _RowRef(weakref.ref):
+    """Weak reference to a view that remembers the row it views"""
+
+    __slots__ = ('row',)
+
+    def __new__(cls, view, callback, row):
+        ref = super().__new__(cls, view, callback)
+        ref.row = row
+        return ref
+
+    def __init__(self, view, callback, row):
+        super().__init__(view, callback)
+
+
+class SharedTankStore(TankStore):
+    """
+    Store for tanks created without one (see DEFAULT_STORE).
+
+    Tanks are held weakly: when a standalone tank is dropped, or adopted
+    by a FuelSystem's store, its row is released and later reused. So a
+    standalone tank costs one row rather than a store of its own, and
+    the shared store does not keep tanks alive or grow without bound.
+    """
+
+    __slots__ = ('_lock',)
+
+    def __init__(self):
+        super().__init__()
+        # Reentrant: a tank may be collected (and its row released) while
+        # this thread is placing another one
+        self._lock = threading.RLock()
+
+    def add_row(self, tank, capacity, fuel_level, pressure, temperature, status="NORMAL",
+                fuel_type="Jet-A", tank_type=None):
+        return self._place(tank, (fuel_level, capacity, pressure, temperature, STATUS_CODES[status],
+                                  fuel_type_code(fuel_type), tank_type_code(tank_type)))
+
+    def adopt(self, tank):
+        old_store, old_row = tank.get_store(), tank.get_row()
+        if old_store is self:
+            return old_row
+        row = self._place(tank, [getattr(old_store, name)[old_row] for name in COLUMNS])
+        old_store.release_row(old_row)
+        tank._bind(self, row)
+        return row
+
+    def _place(self, tank, values):
+        """Write a row (reusing a vacant one if possible) in COLUMNS order"""
+        with self._lock:
+            if self._vacant_rows:
+                row = self._vacant_rows.pop()
+                for name, value in zip(COLUMNS, values):
+                    getattr(self, name)[row] = value
+                self._tanks[row] = _RowRef(tank, self._collect, row)
+                self._tank_ids[row] = tank.get_tank_id()
+            else:
+                row = len(self._tanks)
+                for name, value in zip(COLUMNS, values):
+                    getattr(self, name).append(value)
+                self._tanks.append(_RowRef(tank, self._collect, row))
+                self._tank_ids.append(tank.get_tank_id())
+            for listener in self._listeners:
+                listener.row_added(row)
+        return row
+
+    def _collect(self, ref):
+        with self._lock:
+            if self._tanks[ref.row] is ref:
+                self.release_row(ref.row)
+
+    def release_row(self, row):
+        with self._lock:
+            super().release_row(row)
+
+    def get_tank(self, row):
+        ref = self._tanks[row]
+        return ref() if ref is not None else None
+
+    @staticmethod
+    def _live(refs):
+        return [tank for tank in (ref() for ref in refs if ref is not None) if tank is not None]
+
+    def get_tanks_by_status(self, status):
+        return self._live(super().get_tanks_by_status(status))
+
+    def get_tanks_by_type(self, tank_type):
+        return self._live(super().get_tanks_by_type(tank_type))
+
+    def get_tanks_by_statuses(self, statuses):
+        return self._live(super().get_tanks_by_statuses(statuses))
+
+    def __repr__(self):
+        return f"SharedTankStore(rows={len(self._tanks)}, vacant={len(self._vacant_rows)})"
+
+
+# Store of every tank created without a store argument
+DEFAULT_STORE = SharedTankStore()
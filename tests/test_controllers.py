@@ -1,6 +1,14 @@
+import asyncio
+import io
+import random
+import shutil
+import tempfile
+import threading
 import unittest
 import sys
 import os
+from contextlib import redirect_stdout
+from unittest import mock
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 sys.path.append('models')
@@ -13,9 +21,27 @@ from utils.alert_system import AlertSystem
 from utils.system_integration import SystemIntegration
 from utils.validation import *
 from utils.data_logger import DataLogger
+from utils.transfer_journal import TransferJournal
+from utils.state_snapshot import SnapshotManager, read_snapshot
+from utils.system_config import load_config, build_fuel_system
+from sensor_registry import ReadingPolicy
+from sensor_acquisition import AcquisitionService
+from level_estimator import LevelEstimator
+from transfer_scheduler import TransferScheduler
+from rebalancing_planner import RebalancingPlanner
+from what_if import WhatIfScenario
+from fleet_manager import FleetManager, FleetShard
+from flight_simulator import FlightSimulator
+from endurance_estimator import EnduranceEstimator, MetricHistogram
+from models.fuel_sensor import FuelSensor
+from utils.sensor_frames import FrameDecoder, decode_frames, encode_frames, load_sensors_from_config
+from models.fuel_tank import FuelTank
 from models.main_fuel_tank import MainFuelTank
+from models.plumbing_topology import PlumbingTopology
 from models.auxiliary_tank import AuxiliaryTank
 from models.reserve_tank import ReserveTank
+from models.rejection import Rejection
+from models.status_classifier import DEFAULT_STATUS_THRESHOLDS
 
 
 class TestFuelSystem(unittest.TestCase):
@@ -79,6 +105,82 @@ class TestFuelSystem(unittest.TestCase):
         statuses = self.system.check_all_tanks()
         self.assertEqual(len(statuses), 2)
         self.assertIn("T1", statuses)
+    
+    def test_tanks_share_system_store(self):
+        """Test ID: C45"""
+        store = self.system.get_store()
+        self.assertIs(self.tank1.get_store(), store)
+        self.assertIs(self.tank2.get_store(), store)
+        self.tank1.remove_fuel(1000)
+        self.assertEqual(self.system.get_total_fuel(), 5000)
+    
+    def test_replacing_tank_releases_row(self):
+        """Test ID: C46"""
+        self.system.add_tank(MainFuelTank("T1", "Tank 1", 5000, 1000))
+        self.assertEqual(self.system.get_total_fuel(), 3000)
+        self.assertEqual(self.system.get_total_capacity(), 8000)
+        self.assertEqual(len(self.system.get_tanks_by_status("NORMAL")), 1)
+    
+    def test_to_dict(self):
+        """Test ID: C47"""
+        state = self.system.to_dict()
+        self.assertEqual(state["current_total_fuel"], 6000)
+        self.assertEqual([t["tank_id"] for t in state["tanks"]], ["T1", "T2"])
+    
+    def test_check_all_tanks_uses_system_thresholds(self):
+        """Test ID: C48"""
+        system = FuelSystem(status_thresholds={"MAIN": (90.0, 85.0)})
+        system.add_tank(MainFuelTank("T1", "Tank 1", 5000, 4000))
+        self.assertEqual(system.check_all_tanks(), {"T1": "CRITICAL"})
+        self.assertEqual(len(system.get_low_fuel_tanks()), 1)
+    
+    def test_fuel_changes_use_system_thresholds(self):
+        """Test ID: C100"""
+        system = FuelSystem(status_thresholds={"MAIN": (80.0, 40.0)})
+        tank = MainFuelTank("T1", "Tank 1", 1000, 600)
+        system.add_tank(tank)
+        self.assertEqual(tank.get_status(), "LOW")  # Classified on adoption
+        self.assertEqual(system.check_all_tanks(), {"T1": "LOW"})
+        tank.add_fuel(10)
+        self.assertEqual(tank.get_status(), "LOW")
+        self.assertEqual(system.get_low_fuel_tanks(), [tank])
+        tank.set_fuel_level(350)
+        self.assertEqual(tank.get_status(), "CRITICAL")
+        tank.remove_fuel(0)
+        self.assertEqual(system.get_tanks_by_status("CRITICAL"), [tank])
+        self.assertEqual(MainFuelTank("T2", "Standalone", 1000, 600).get_status(), "NORMAL")
+    
+    def test_incremental_aggregates_consistent(self):
+        """Test ID: C49"""
+        system = FuelSystem(check_consistency=True)
+        tanks = [MainFuelTank(f"M{i}", "Main", 5000, 1000 * i) for i in range(5)]
+        for tank in tanks:
+            system.add_tank(tank)
+        tanks[0].add_fuel(4000.5)
+        tanks[4].remove_fuel(3900)
+        system.add_tank(MainFuelTank("M2", "Replacement", 2000, 1500))
+        
+        self.assertAlmostEqual(system.get_total_fuel(), 4000.5 + 1000 + 1500 + 3000 + 100)
+        self.assertEqual(system.get_total_capacity(), 22000)
+        self.assertEqual({t.get_tank_id() for t in system.get_tanks_by_status("NORMAL")},
+                         {"M0", "M2", "M3"})
+        self.assertEqual({t.get_tank_id() for t in system.get_low_fuel_tanks()}, {"M1", "M4"})
+    
+    def test_low_fuel_tanks_in_store_order(self):
+        """Test ID: C88"""
+        system = FuelSystem()
+        for i, level in enumerate([1500, 4000, 500, 4000, 2000]):
+            system.add_tank(MainFuelTank(f"M{i}", "Main", 5000, level))
+        self.assertEqual([t.get_tank_id() for t in system.get_low_fuel_tanks()],
+                         ["M0", "M2", "M4"])
+    
+    def test_consistency_check_detects_bypassed_writes(self):
+        """Test ID: C50"""
+        system = FuelSystem(check_consistency=True)
+        system.add_tank(MainFuelTank("M1", "Main", 5000, 1000))
+        system.get_store().fuel_level[0] = 2000  # Bypasses the change hooks
+        with self.assertRaises(RuntimeError):
+            system.get_total_fuel()
 
 
 class TestFuelTransferController(unittest.TestCase):
@@ -155,6 +257,118 @@ class TestFuelTransferController(unittest.TestCase):
         
         valid, msg = self.controller.validate_transfer("RES", "DST", 100)
         self.assertTrue(valid)
+    
+    def test_batch_transfers_use_net_deltas(self):
+        """Test ID: C65"""
+        third = MainFuelTank("MID", "Middle", 2000, 0)
+        self.system.add_tank(third)
+        # MID passes on fuel it only receives within the same batch
+        applied, rejected = self.controller.execute_transfers([("SRC", "MID", 1500), ("MID", "DST", 1000)])
+        self.assertEqual((applied, rejected), (2, []))
+        self.assertEqual(self.tank1.get_fuel_level(), 2500)
+        self.assertEqual(third.get_fuel_level(), 500)
+        self.assertEqual(self.tank2.get_fuel_level(), 2000)
+        self.assertEqual(self.system.get_total_fuel(), 5000)
+        self.assertEqual(self.logger.get_logs()[-1]["event_type"], "FUEL_TRANSFER_BATCH")
+    
+    def test_batch_transfers_atomic_and_best_effort(self):
+        """Test ID: C66"""
+        batch = [("SRC", "DST", 500), ("SRC", "DST", 1800), ("SRC", "SRC", 10)]
+        applied, rejected = self.controller.execute_transfers(batch)
+        self.assertEqual(applied, 0)
+        self.assertEqual([index for index, _ in rejected], [0, 1, 2])
+        self.assertIn("insufficient capacity", rejected[0][1].lower())
+        self.assertEqual(self.tank1.get_fuel_level(), 4000)
+        
+        applied, rejected = self.controller.execute_transfers(batch[:1] + batch[2:])
+        self.assertEqual(applied, 0)
+        self.assertEqual(self.tank2.get_fuel_level(), 1000)
+        
+        log_count = self.logger.get_log_count()
+        applied, rejected = self.controller.execute_transfers(batch, mode="BEST_EFFORT")
+        self.assertEqual(applied, 1)
+        self.assertEqual([index for index, _ in rejected], [1, 2])
+        self.assertEqual(self.tank1.get_fuel_level(), 3500)
+        self.assertEqual(self.tank2.get_fuel_level(), 1500)
+        self.assertEqual(self.logger.get_log_count(), log_count + 1)
+        with self.assertRaises(ValueError):
+            self.controller.execute_transfers(batch, mode="PARTIAL")
+    
+    def test_batch_rejected_write_not_counted(self):
+        """Test ID: C91"""
+        class SealedTank(MainFuelTank):
+            def set_fuel_level(self, level):
+                return Rejection.INVALID_LEVEL
+        
+        self.system.add_tank(SealedTank("SEALED", "Sealed", 2000, 500))
+        batch = [("SRC", "DST", 500), ("SRC", "SEALED", 100)]
+        applied, rejected = self.controller.execute_transfers(batch)
+        self.assertEqual((applied, [index for index, _ in rejected]), (0, [1]))
+        self.assertEqual((self.tank1.get_fuel_level(), self.tank2.get_fuel_level()), (4000, 1000))
+        
+        applied, rejected = self.controller.execute_transfers(batch, mode="BEST_EFFORT")
+        self.assertEqual((applied, [index for index, _ in rejected]), (1, [1]))
+        self.assertEqual((self.tank1.get_fuel_level(), self.tank2.get_fuel_level()), (3500, 1500))
+    
+    def test_concurrent_transfers_conserve_fuel(self):
+        """Test ID: C67"""
+        self.logger.log_transfer = lambda *args: None
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        
+        def worker(seed):
+            rng = random.Random(seed)
+            for _ in range(300):
+                source_id, dest_id = rng.sample(["SRC", "DST"], 2)
+                self.controller.execute_transfer(source_id, dest_id, float(rng.randint(1, 400)))
+        
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(4)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(self.tank1.get_fuel_level() + self.tank2.get_fuel_level(), 5000)
+        self.assertEqual(self.system.get_total_fuel(), 5000)
+    
+    def test_transfers_follow_plumbing(self):
+        """Test ID: C73"""
+        topology = PlumbingTopology()
+        topology.add_pipe("P1", "SRC", "DST", 10.0, valve_id="V1", bidirectional=False)
+        self.system.set_topology(topology)
+        self.assertTrue(self.controller.validate_transfer("SRC", "DST", 500)[0])
+        valid, msg = self.controller.validate_transfer("DST", "SRC", 500)
+        self.assertFalse(valid)
+        self.assertIn("no fuel route", msg.lower())
+        topology.close_valve("V1")
+        applied, rejected = self.controller.execute_transfers([("SRC", "DST", 500)])
+        self.assertEqual(applied, 0)
+        self.assertIn("no fuel route", rejected[0][1].lower())
+        topology.open_valve("V1")
+        scheduler = TransferScheduler(self.system)
+        self.assertFalse(scheduler.start_transfer("SRC", "DST", 20)[0])
+        self.assertTrue(scheduler.start_transfer("SRC", "DST", 10)[0])
+    
+    def test_tank_locks_ordered(self):
+        """Test ID: C68"""
+        locks = self.system.get_tank_locks()
+        with locks.hold(["SRC", "DST", "SRC"]):
+            self.assertTrue(locks.get_lock("SRC").locked())
+            self.assertTrue(locks.get_lock("DST").locked())
+            # Another thread taking the same tanks in the opposite order waits
+            def take_reversed():
+                with locks.hold(["DST", "SRC"]):
+                    pass
+            
+            waiter = threading.Thread(target=take_reversed)
+            waiter.start()
+            waiter.join(0.05)
+            self.assertTrue(waiter.is_alive())
+        waiter.join(1.0)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(len(locks), 2)
 
 class TestAlertSystem(unittest.TestCase):
     
@@ -231,6 +445,30 @@ class TestAlertSystem(unittest.TestCase):
         self.alert_system.check_all_tanks()
         temp_alerts = self.alert_system.get_alerts_by_type("TEMPERATURE")
         self.assertEqual(len(temp_alerts), 1)
+    
+    def test_alerts_follow_change_events(self):
+        """Test ID: C82"""
+        self.alert_system.watch_events()
+        alert_logs = lambda: [log for log in self.logger.get_logs() if log["event_type"] == "ALERT"]
+        self.assertEqual(len(alert_logs()), 2)
+        bus = self.system.get_event_bus()
+        
+        self.critical.add_fuel(4000)  # Alert clears
+        self.low.remove_fuel(100)  # Still LOW: not logged again
+        self.normal.set_pressure(55)  # New alert
+        bus.flush()
+        self.assertEqual(self.alert_system.get_alerts_by_tank("CRIT"), [])
+        self.assertEqual(self.alert_system.get_alerts_by_tank("LOW")[0]["value"], 900)
+        self.assertEqual(len(self.alert_system.get_alerts_by_type("PRESSURE")), 1)
+        self.assertEqual(len(alert_logs()), 3)
+        # Event-driven state matches a full rescan
+        watched = sorted(a["message"] for a in self.alert_system.get_active_alerts())
+        self.assertEqual(watched, sorted(a["message"] for a in AlertSystem(self.system, DataLogger()).check_all_tanks()))
+        
+        self.alert_system.stop_watching()
+        self.critical.remove_fuel(4000)
+        bus.flush()
+        self.assertEqual(self.alert_system.get_alerts_by_tank("CRIT"), [])
 
 
 class TestValidation(unittest.TestCase):
@@ -305,6 +543,825 @@ class TestValidation(unittest.TestCase):
         sanitized = sanitize_tank_name("  Left   Wing  ")
         self.assertEqual(sanitized, "Left Wing")
 
+class TestSensorFrames(unittest.TestCase):
+    
+    def setUp(self):
+        self.sensors = load_sensors_from_config("data/logs/tank_config.json")
+        self.bank = self.sensors[0].get_bank()
+        self.decoder = FrameDecoder(self.bank)
+    
+    def test_decode_round_trip(self):
+        """Test ID: C51"""
+        buffer = encode_frames([0, 3], [0, 0], [1.5, 2.5], [4500.0, 990.0])
+        indices, types, times, values = decode_frames(bytes(buffer) + b"\x00" * 5)
+        self.assertEqual(list(indices), [0, 3])
+        self.assertEqual(list(types), [0, 0])
+        self.assertEqual(list(times), [1.5, 2.5])
+        self.assertEqual(list(values), [4500.0, 990.0])
+    
+    def test_feed_config_sensors(self):
+        """Test ID: C52"""
+        self.assertEqual([s.get_sensor_id() for s in self.sensors],
+                         ["SENS_LM_LEVEL", "SENS_RM_LEVEL", "SENS_CA_LEVEL", "SENS_RES_LEVEL"])
+        buffer = encode_frames([0, 1, 2, 3], [0, 0, 0, 0], [1.0] * 4, [4400.0, 4300.0, 20000.0, 1000.0])
+        count, mask = self.decoder.feed(memoryview(buffer))
+        self.assertEqual(count, 4)
+        self.assertEqual(list(mask), [1, 1, 0, 1])
+        self.assertEqual(self.sensors[1].get_reading(), 4300.0)
+        self.assertFalse(self.sensors[2].is_operational())
+        self.assertEqual(self.sensors[0].get_history().get_latest(), (1.0, 4400.0))
+    
+    def test_feed_rejects_unknown_frames(self):
+        """Test ID: C53"""
+        buffer = encode_frames([0, 9, 1], [0, 0, 1], [1.0] * 3, [4400.0, 1.0, 45.0])
+        count, _ = self.decoder.feed(buffer)
+        self.assertEqual(count, 1)
+        self.assertEqual(self.decoder.get_frames_rejected(), 2)
+        self.assertEqual(self.sensors[0].get_reading(), 4400.0)
+        self.assertEqual(self.sensors[1].get_reading(), 0.0)
+
+
+class TestSensorRegistry(unittest.TestCase):
+    
+    def setUp(self):
+        self.system = FuelSystem(check_consistency=True, detect_sensor_faults=True)
+        self.tank = MainFuelTank("T1", "Tank 1", 5000, 4000)
+        self.system.add_tank(self.tank)
+        self.level = FuelSensor("S_LEVEL", "LEVEL", "T1")
+        self.pressure = FuelSensor("S_PRES", "PRESSURE", "T1")
+        self.system.add_sensor(self.level)
+        self.system.add_sensor(self.pressure)
+        self.registry = self.system.get_sensor_registry()
+    
+    def test_registry_indexes(self):
+        """Test ID: C54"""
+        self.assertIs(self.system.get_sensor("S_LEVEL"), self.level)
+        self.assertEqual(self.registry.get_sensors_for_tank("T1"), [self.level, self.pressure])
+        self.assertEqual(self.registry.get_sensors_by_type("PRESSURE"), [self.pressure])
+        self.assertIs(self.level.get_bank(), self.registry.get_bank())
+    
+    def test_route_reading_updates_tank(self):
+        """Test ID: C55"""
+        self.level.calibrate(-10.0)
+        self.assertTrue(self.system.route_reading("S_LEVEL", 1010.0))
+        self.assertEqual(self.tank.get_fuel_level(), 1000.0)
+        self.assertEqual(self.tank.get_status(), "CRITICAL")
+        self.assertEqual(self.system.get_total_fuel(), 1000.0)
+        self.assertTrue(self.system.route_reading("S_PRES", 48.0))
+        self.assertEqual(self.tank.get_pressure(), 48.0)
+    
+    def test_out_of_range_reading_not_applied(self):
+        """Test ID: C56"""
+        self.assertIsNone(self.system.route_reading("S_PRES", 500.0))
+        self.assertFalse(self.pressure.is_operational())
+        self.assertEqual(self.tank.get_pressure(), 45.0)
+        self.assertIsNone(self.system.route_reading("UNKNOWN", 1.0))
+    
+    def test_percent_policy_and_batch_routing(self):
+        """Test ID: C57"""
+        self.registry.set_policy(ReadingPolicy(level_units="PERCENT", ignore=["PRESSURE"]))
+        self.registry.route_batch([50.0, 30.0], timestamps=1.0)
+        self.assertEqual(self.tank.get_fuel_level(), 2500.0)
+        self.assertEqual(self.tank.get_pressure(), 45.0)
+    
+    def test_frames_routed_to_tanks(self):
+        """Test ID: C58"""
+        decoder = FrameDecoder(self.registry.get_bank(), self.registry)
+        decoder.feed(encode_frames([0, 1], [0, 1], [1.0, 1.0], [3000.0, 44.0]))
+        self.assertEqual(self.tank.get_fuel_level(), 3000.0)
+        self.assertEqual(self.tank.get_pressure(), 44.0)
+    
+    def test_spike_not_applied(self):
+        """Test ID: C62"""
+        for i in range(10):
+            self.assertTrue(self.system.route_reading("S_PRES", 45.0 + 0.1 * (i % 3)))
+        self.assertIsNone(self.system.route_reading("S_PRES", 90.0))
+        self.assertFalse(self.pressure.is_operational())
+        self.assertEqual(self.tank.get_pressure(), 45.0)
+        self.assertTrue(self.system.route_reading("S_PRES", 45.2))
+        self.assertIsNone(FuelSystem().get_sensor_registry().get_fault_detector())
+    
+    def test_reading_waits_for_tank_lock(self):
+        """Test ID: C89"""
+        router = threading.Thread(target=self.system.route_reading, args=("S_LEVEL", 3000.0))
+        with self.system.get_tank_locks().hold(["T1"]):
+            router.start()
+            router.join(0.05)
+            self.assertTrue(router.is_alive())
+            self.assertEqual(self.tank.get_fuel_level(), 4000)
+        router.join(1.0)
+        self.assertEqual(self.tank.get_fuel_level(), 3000.0)
+
+
+class TestAcquisitionService(unittest.TestCase):
+    
+    def setUp(self):
+        self.system = FuelSystem()
+        self.tank = MainFuelTank("T1", "Tank 1", 5000, 4000)
+        self.system.add_tank(self.tank)
+        self.system.add_sensor(FuelSensor("S_LEVEL", "LEVEL", "T1"))
+        self.system.add_sensor(FuelSensor("S_PRES", "PRESSURE", "T1"))
+        self.registry = self.system.get_sensor_registry()
+        readings = {"S_LEVEL": 3200.0, "S_PRES": 47.0}
+        self.read_sensor = lambda sensor: readings[sensor.get_sensor_id()]
+    
+    def test_schedule_validation(self):
+        """Test ID: C59"""
+        service = AcquisitionService(self.registry, self.read_sensor)
+        self.assertFalse(service.schedule("UNKNOWN", 10)[0])
+        self.assertFalse(service.schedule("S_LEVEL", 0)[0])
+        self.assertTrue(service.schedule("S_LEVEL", 10)[0])
+        self.assertEqual(service.get_scheduled_count(), 1)
+        with self.assertRaises(ValueError):
+            AcquisitionService(self.registry, overflow="SPILL")
+    
+    def test_polled_readings_reach_tanks(self):
+        """Test ID: C60"""
+        service = AcquisitionService(self.registry, self.read_sensor)
+        service.schedule_all(100)
+        asyncio.run(service.run(duration=0.05))
+        metrics = service.get_metrics()
+        self.assertFalse(service.is_running())
+        self.assertGreater(metrics["samples_routed"], 0)
+        self.assertEqual(metrics["samples_routed"], metrics["samples_acquired"])
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(self.tank.get_fuel_level(), 3200.0)
+        self.assertEqual(self.tank.get_pressure(), 47.0)
+    
+    def test_failing_read_keeps_sensors_scheduled(self):
+        """Test ID: C101"""
+        calls = []
+        
+        def read_sensor(sensor):
+            calls.append(sensor.get_sensor_id())
+            if len(calls) == 3:
+                raise IOError("bus timeout")
+            return self.read_sensor(sensor)
+        
+        service = AcquisitionService(self.registry, read_sensor)
+        service.schedule_all(100)
+        with redirect_stdout(io.StringIO()) as output:
+            asyncio.run(service.run(duration=0.2))
+        metrics = service.get_metrics()
+        self.assertEqual(metrics["read_errors"], 1)
+        self.assertEqual(metrics["route_errors"], 0)
+        self.assertGreater(metrics["samples_acquired"], 10)
+        self.assertEqual(metrics["samples_routed"], metrics["samples_acquired"])
+        self.assertGreater(calls[3:].count("S_LEVEL"), 3)
+        self.assertGreater(calls[3:].count("S_PRES"), 3)
+        self.assertIn("bus timeout", output.getvalue())
+    
+    def test_overflow_policies(self):
+        """Test ID: C61"""
+        async def fill(service):
+            service._queue = asyncio.Queue(2)
+            return [await service.submit("S_LEVEL", value, 1.0) for value in (1000.0, 2000.0, 3000.0)]
+        
+        service = AcquisitionService(self.registry, queue_size=2, overflow="DROP_NEWEST")
+        self.assertEqual(asyncio.run(fill(service)), [True, True, False])
+        self.assertEqual([item[2] for item in service._queue._queue], [1000.0, 2000.0])
+        
+        service = AcquisitionService(self.registry, queue_size=2, overflow="DROP_OLDEST")
+        self.assertEqual(asyncio.run(fill(service)), [True, True, True])
+        self.assertEqual([item[2] for item in service._queue._queue], [2000.0, 3000.0])
+        self.assertEqual(service.get_metrics()["samples_dropped"], 1)
+        self.assertEqual(service.get_metrics()["queue_high_water"], 2)
+
+
+class TestLevelEstimator(unittest.TestCase):
+    
+    def setUp(self):
+        self.system = FuelSystem(reading_policy=ReadingPolicy(ignore=["LEVEL"]))
+        self.tank1 = MainFuelTank("T1", "Tank 1", 5000, 4000)
+        self.tank2 = AuxiliaryTank("T2", "Tank 2", 3000, 2000)
+        self.system.add_tank(self.tank1)
+        self.system.add_tank(self.tank2)
+        for sensor_id, sensor_type, tank_id in [("L1A", "LEVEL", "T1"), ("L1B", "LEVEL", "T1"),
+                                                ("P1", "PRESSURE", "T1"), ("L2A", "LEVEL", "T2")]:
+            self.system.add_sensor(FuelSensor(sensor_id, sensor_type, tank_id, history_size=0))
+        self.registry = self.system.get_sensor_registry()
+        self.estimator = LevelEstimator(self.system)
+    
+    def test_fuses_sensors_per_tank(self):
+        """Test ID: C63"""
+        self.estimator.reset_tank("T1", variance=1e9)
+        self.estimator.reset_tank("T2", variance=1e9)
+        calibrated, mask = self.registry.route_batch([3000.0, 3100.0, 45.0, 1500.0])
+        self.assertEqual(self.estimator.step(calibrated, mask=mask), 2)
+        level, variance = self.estimator.get_estimate("T1")
+        self.assertAlmostEqual(level, 3050.0, places=3)
+        self.assertAlmostEqual(variance, 12.5, places=3)
+        self.assertAlmostEqual(self.tank1.get_fuel_level(), 3050.0, places=3)
+        self.assertAlmostEqual(self.tank2.get_fuel_level(), 1500.0, places=3)
+        self.assertLess(self.estimator.get_confidence("T1"), self.estimator.get_confidence("T2"))
+    
+    def test_predict_and_weighting(self):
+        """Test ID: C64"""
+        self.estimator.set_sensor_variance("L1B", 1e12)  # Effectively ignored
+        self.estimator.predict(10.0, {"T1": -5.0})
+        self.assertEqual(self.estimator.get_estimate("T1")[0], 3950.0)
+        self.assertEqual(self.estimator.get_estimate("T2")[1], LevelEstimator.INITIAL_VARIANCE + 40.0)
+        updated = self.estimator.update([3900.0, 100.0], indices=[0, 1])
+        self.assertEqual(updated, ["T1"])
+        self.assertAlmostEqual(self.estimator.get_estimate("T1")[0], 3900.1, places=1)
+        self.assertIsNone(self.estimator.get_estimate("T9"))
+    
+    def test_tracks_fuel_moved_between_ticks(self):
+        """Test ID: C90"""
+        self.estimator.update([4000.0, 4000.0, 45.0, 2000.0])
+        self.tank1.remove_fuel(1000)  # e.g. a transfer, not seen by any sensor yet
+        self.assertAlmostEqual(self.estimator.get_estimate("T1")[0], 3000.0, places=3)
+        self.estimator.apply()
+        self.assertAlmostEqual(self.tank1.get_fuel_level(), 3000.0, places=3)
+        
+        self.system.add_tank(MainFuelTank("T2", "Replacement", 3000, 500))
+        self.assertEqual(self.estimator.get_estimate("T2"), (500, LevelEstimator.INITIAL_VARIANCE))
+
+    def test_query_syncs_only_changed_tanks(self):
+        """Test ID: C102"""
+        self.estimator.get_estimate("T1")
+        self.tank2.add_fuel(100)
+        reads = []
+        original = FuelTank.get_fuel_level
+        def get_fuel_level(tank):
+            reads.append(tank)
+            return original(tank)
+        with mock.patch.object(FuelTank, "get_fuel_level", get_fuel_level):
+            self.assertEqual(self.estimator.get_estimate("T1"), (4000.0, LevelEstimator.INITIAL_VARIANCE))
+            self.assertEqual(reads, [self.tank2])
+            self.assertEqual(self.estimator.get_estimate("T2")[0], 2100.0)
+            self.assertEqual(reads, [self.tank2])
+
+
+class TestTransferScheduler(unittest.TestCase):
+    
+    def setUp(self):
+        self.system = FuelSystem(check_consistency=True)
+        self.main = MainFuelTank("MAIN", "Main", 5000, 4000)
+        self.aux = AuxiliaryTank("AUX", "Aux", 3000, 500)
+        self.spare = MainFuelTank("SPARE", "Spare", 2000, 0)
+        for tank in (self.main, self.aux, self.spare):
+            self.system.add_tank(tank)
+        self.scheduler = TransferScheduler(self.system)
+    
+    def test_jumps_between_events(self):
+        """Test ID: C69"""
+        self.assertEqual(self.scheduler.start_transfer("MAIN", "AUX", 10), (True, 1))
+        self.assertEqual(self.scheduler.start_transfer("MAIN", "SPARE", 5, amount=600), (True, 2))
+        events = self.scheduler.run_until_idle()
+        self.assertEqual([(e["time"], e["event"]) for e in events if e["event"] != "THRESHOLD"],
+                         [(120.0, "TRANSFER_COMPLETE"), (250.0, "DEST_FULL")])
+        self.assertEqual(self.scheduler.get_time(), 250.0)
+        self.assertEqual(self.scheduler.get_event_count(), 7)
+        self.assertEqual(self.main.get_fuel_level(), 900.0)
+        self.assertEqual(self.aux.get_fuel_level(), 3000.0)
+        self.assertEqual(self.spare.get_fuel_level(), 600.0)
+        self.assertEqual(self.system.get_total_fuel(), 4500.0)
+    
+    def test_advance_and_source_empty(self):
+        """Test ID: C70"""
+        self.scheduler.start_transfer("AUX", "SPARE", 2)
+        self.assertEqual(self.scheduler.advance(100), [])
+        self.assertEqual(self.spare.get_fuel_level(), 200.0)
+        self.assertEqual(self.aux.get_fuel_level(), 300.0)
+        events = self.scheduler.advance(1000)
+        self.assertEqual(events, [{"time": 200.0, "event": "THRESHOLD", "tank_id": "SPARE", "status": "LOW"},
+                                  {"time": 250.0, "event": "SOURCE_EMPTY", "tank_id": "AUX"}])
+        self.assertEqual(self.scheduler.get_time(), 1100.0)
+        self.assertEqual(self.scheduler.get_finished_transfers()[0].get_stop_reason(), "SOURCE_EMPTY")
+        self.assertEqual(self.scheduler.get_flow("AUX"), 0.0)
+        self.assertEqual(self.spare.get_fuel_level(), 500.0)
+        self.assertFalse(self.scheduler.start_transfer("AUX", "SPARE", 2)[0])
+    
+    def test_thresholds_follow_system_table(self):
+        """Test ID: C92"""
+        system = FuelSystem(status_thresholds={"MAIN": (90.0, 40.0)})
+        system.add_tank(MainFuelTank("SRC", "Source", 5000, 5000))
+        system.add_tank(MainFuelTank("DST", "Dest", 2000, 0))
+        scheduler = TransferScheduler(system)
+        scheduler.start_transfer("SRC", "DST", 10, amount=1900)
+        events = [(e["time"], e["tank_id"], e["status"]) for e in scheduler.run_until_idle()
+                  if e["event"] == "THRESHOLD"]
+        self.assertEqual(events, [(50.0, "SRC", "LOW"), (80.0, "DST", "LOW"), (180.0, "DST", "NORMAL")])
+
+    def test_keeps_fuel_moved_outside_scheduler(self):
+        """Test ID: C103"""
+        system = FuelSystem()
+        for tank_id, level in (("A", 4000), ("B", 1000), ("C", 2000)):
+            system.add_tank(MainFuelTank(tank_id, tank_id, 5000, level))
+        scheduler = TransferScheduler(system)
+        scheduler.start_transfer("A", "B", 10)
+        scheduler.advance(10)
+        controller = FuelTransferController(system, DataLogger())
+        self.assertTrue(controller.execute_transfer("C", "A", 500)[0])
+        scheduler.advance(10)
+        self.assertEqual([system.get_tank(t).get_fuel_level() for t in "ABC"], [4300.0, 1200.0, 1500.0])
+        self.assertEqual(system.get_total_fuel(), 7000.0)
+        # Events follow the shifted levels: B fills 3800 L later
+        events = scheduler.run_until_idle()
+        self.assertEqual([(e["time"], e["event"]) for e in events if e["event"] != "THRESHOLD"],
+                         [(400.0, "DEST_FULL")])
+        self.assertEqual(system.get_total_fuel(), 7000.0)
+
+
+class TestRebalancingPlanner(unittest.TestCase):
+    
+    def setUp(self):
+        self.system = FuelSystem()
+        self.logger = DataLogger()
+        self.tanks = [MainFuelTank("LEFT_MAIN", "Left", 5000, 4500), MainFuelTank("RIGHT_MAIN", "Right", 5000, 2500),
+                      AuxiliaryTank("AUX_1", "Aux 1", 1500, 800), AuxiliaryTank("AUX_2", "Aux 2", 1500, 600),
+                      ReserveTank("RES", "Reserve", 1000, 1000)]
+        for tank in self.tanks:
+            self.system.add_tank(tank)
+        self.planner = RebalancingPlanner(self.system)
+    
+    def test_balance_drains_auxiliary_first(self):
+        """Test ID: C71"""
+        transfers, unmet = self.planner.plan_balance([("LEFT_MAIN", "RIGHT_MAIN")], drain=["AUX_1", "AUX_2", "RES"])
+        self.assertEqual(transfers, [("AUX_1", "RIGHT_MAIN", 800.0), ("AUX_2", "RIGHT_MAIN", 600.0),
+                                     ("LEFT_MAIN", "RIGHT_MAIN", 300.0)])
+        self.assertEqual(unmet, {})
+        controller = FuelTransferController(self.system, self.logger)
+        self.assertEqual(controller.execute_transfers(transfers), (3, []))
+        self.assertEqual([tank.get_fuel_level() for tank in self.tanks], [4200.0, 4200.0, 0.0, 0.0, 1000.0])
+    
+    def test_reserve_and_unmet_demand(self):
+        """Test ID: C72"""
+        transfers, unmet = self.planner.plan({"RES": 0, "RIGHT_MAIN": 3000})
+        self.assertEqual(transfers, [])
+        self.assertEqual(unmet, {"RES": 1000.0, "RIGHT_MAIN": -500.0})
+        self.tanks[4].activate_emergency_mode()
+        transfers, unmet = self.planner.plan({"RES": 0, "RIGHT_MAIN": 3000})
+        self.assertEqual(transfers, [("RES", "RIGHT_MAIN", 500.0)])
+        self.assertEqual(unmet, {"RES": 500.0})
+        with self.assertRaises(ValueError):
+            self.planner.plan({"AUX_1": 2000})
+    
+    def test_plan_follows_plumbing(self):
+        """Test ID: C93"""
+        topology = PlumbingTopology()
+        topology.add_pipe("P1", "AUX_1", "XF", 2.0, bidirectional=False)
+        topology.add_pipe("P2", "XF", "RIGHT_MAIN", 10.0)
+        topology.add_pipe("P3", "AUX_2", "LEFT_MAIN", 10.0)
+        topology.add_pipe("P4", "LEFT_MAIN", "RIGHT_MAIN", 10.0)
+        self.system.set_topology(topology)
+        # AUX_1 reaches RIGHT_MAIN through the XF junction at 2 L/s; AUX_2
+        # only pipes into LEFT_MAIN, and routes never pass through a tank
+        self.assertEqual(topology.get_route("AUX_1", "RIGHT_MAIN"), ["AUX_1", "XF", "RIGHT_MAIN"])
+        self.assertFalse(topology.is_reachable("AUX_2", "RIGHT_MAIN"))
+        planner = RebalancingPlanner(self.system, window_seconds=100)
+        transfers, unmet = planner.plan({"AUX_1": 0, "AUX_2": 0, "RIGHT_MAIN": 3500})
+        self.assertEqual(transfers, [("AUX_1", "RIGHT_MAIN", 200.0)])
+        self.assertEqual(unmet, {"AUX_1": 600.0, "AUX_2": 600.0, "RIGHT_MAIN": -800.0})
+
+    def test_plan_reroutes_to_reach_every_destination(self):
+        """Test ID: C104"""
+        system = FuelSystem()
+        for tank_id, level in (("S1", 200), ("S2", 200), ("D1", 0), ("D2", 0)):
+            system.add_tank(MainFuelTank(tank_id, tank_id, 1000, level))
+        topology = PlumbingTopology()
+        for pipe_id, source_id, dest_id in (("P1", "S1", "D1"), ("P2", "S1", "D2"), ("P3", "S2", "D1")):
+            topology.add_pipe(pipe_id, source_id, dest_id, 5.0, bidirectional=False)
+        system.set_topology(topology)
+        # Matching S1 -> D1 first would leave D2 reachable from no source
+        transfers, unmet = RebalancingPlanner(system).plan({"S1": 100, "S2": 100, "D1": 100, "D2": 100})
+        self.assertEqual(sorted(transfers), [("S1", "D2", 100.0), ("S2", "D1", 100.0)])
+        self.assertEqual(unmet, {})
+
+
+class TestWhatIfScenario(unittest.TestCase):
+    
+    def setUp(self):
+        self.system = FuelSystem()
+        self.left = MainFuelTank("LEFT", "Left", 5000, 4000)
+        self.right = MainFuelTank("RIGHT", "Right", 5000, 2000)
+        self.reserve = ReserveTank("RES", "Reserve", 1000, 1000)
+        for tank in (self.left, self.right, self.reserve):
+            self.system.add_tank(tank)
+        self.scenario = WhatIfScenario(self.system)
+    
+    def test_dry_run_leaves_live_state(self):
+        """Test ID: C74"""
+        self.assertEqual(self.scenario.transfer("LEFT", "RIGHT", 3000), (True, "Successfully transferred 3000.0L"))
+        self.assertEqual(self.scenario.get_fuel_level("LEFT"), 1000)
+        self.assertEqual(self.scenario.get_status("LEFT"), "CRITICAL")
+        self.assertEqual(self.scenario.get_changes(), {"LEFT": (4000, 1000), "RIGHT": (2000, 5000)})
+        alerts = self.scenario.get_alerts()
+        self.assertEqual([(a["tank_id"], a["severity"]) for a in alerts], [("LEFT", "CRITICAL")])
+        self.assertEqual(self.scenario.get_total_fuel(), 7000)
+        # Live system untouched
+        self.assertEqual(self.left.get_fuel_level(), 4000)
+        self.assertEqual(self.right.get_fuel_level(), 2000)
+        self.assertEqual(self.left.get_status(), "NORMAL")
+    
+    def test_forked_plans_and_rules(self):
+        """Test ID: C75"""
+        self.assertFalse(self.scenario.transfer("RES", "RIGHT", 500)[0])
+        self.scenario.activate_emergency_mode("RES")
+        self.assertTrue(self.scenario.transfer("RES", "RIGHT", 500)[0])
+        self.assertFalse(self.reserve.is_emergency_mode())
+        
+        plan_a, plan_b = self.scenario.fork(), self.scenario.fork()
+        self.assertEqual(plan_a.execute_transfers([("LEFT", "RIGHT", 1000)]), (1, []))
+        applied, rejected = plan_b.execute_transfers([("LEFT", "RIGHT", 3000)])
+        self.assertEqual(applied, 0)
+        self.assertEqual(plan_a.get_fuel_level("RIGHT"), 3500)
+        self.assertEqual(plan_b.get_fuel_level("RIGHT"), 2500)
+        self.assertEqual(plan_a.get_transfers(), [("RES", "RIGHT", 500), ("LEFT", "RIGHT", 1000)])
+    
+    def test_status_uses_system_thresholds(self):
+        """Test ID: C94"""
+        system = FuelSystem(status_thresholds={"MAIN": (90.0, 60.0)})
+        system.add_tank(MainFuelTank("LEFT", "Left", 5000, 4000))
+        system.add_tank(MainFuelTank("RIGHT", "Right", 5000, 2000))
+        scenario = WhatIfScenario(system)
+        self.assertEqual(scenario.get_status("LEFT"), system.check_all_tanks()["LEFT"])
+        scenario.transfer("RIGHT", "LEFT", 500)  # LEFT exactly at 90%: not above it
+        self.assertEqual((scenario.get_status("LEFT"), scenario.get_status("RIGHT")), ("LOW", "CRITICAL"))
+        scenario.transfer("RIGHT", "LEFT", 100)
+        self.assertEqual(scenario.get_status("LEFT"), "NORMAL")
+
+    def test_views_never_write_live_tanks(self):
+        """Test ID: C105"""
+        left, reserve = self.scenario.get_tank("LEFT"), self.scenario.get_tank("RES")
+        live = (self.left.get_pressure(), self.left.get_temperature())
+        self.assertTrue(left.set_pressure(30.0))
+        self.assertTrue(left.set_temperature(40.0))
+        self.assertEqual(left.set_pressure(-1), Rejection.NEGATIVE_PRESSURE)
+        reserve.activate_emergency_mode()
+        self.assertEqual((left.get_pressure(), left.get_temperature()), (30.0, 40.0))
+        self.assertTrue(reserve.is_emergency_mode())
+        self.assertTrue(self.scenario.fork().get_tank("RES").is_emergency_mode())
+        self.assertEqual((self.left.get_pressure(), self.left.get_temperature()), live)
+        self.assertFalse(self.reserve.is_emergency_mode())
+        reserve.deactivate_emergency_mode()
+        self.assertFalse(self.scenario.transfer("RES", "RIGHT", 100)[0])
+        # Only static getters reach the live tank
+        self.assertEqual(left.get_capacity(), 5000)
+        for name in ("get_store", "to_dict", "check_status"):
+            with self.assertRaises(AttributeError):
+                getattr(left, name)
+
+
+class TestTransferJournal(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "journal.bin")
+        self.system = self._make_system()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    @staticmethod
+    def _make_system():
+        system = FuelSystem()
+        system.add_tank(MainFuelTank("LEFT", "Left", 5000, 4000))
+        system.add_tank(MainFuelTank("RIGHT", "Right", 5000, 2000))
+        system.add_tank(AuxiliaryTank("AUX", "Aux", 1500, 1000))
+        return system
+    
+    def _levels(self, system):
+        return [system.get_tank(tank_id).get_fuel_level() for tank_id in ("LEFT", "RIGHT", "AUX")]
+    
+    def test_group_commit_and_recovery(self):
+        """Test ID: C76"""
+        journal = TransferJournal(self.path, group_size=4, max_delay=60, synchronous=False)
+        controller = FuelTransferController(self.system, DataLogger(), journal)
+        for _ in range(6):
+            self.assertTrue(controller.execute_transfer("LEFT", "RIGHT", 100)[0])
+        self.assertFalse(controller.execute_transfer("AUX", "LEFT", 5000)[0])  # Not journaled
+        self.assertEqual(controller.execute_transfers([("AUX", "LEFT", 200), ("AUX", "RIGHT", 300)]), (2, []))
+        metrics = journal.get_metrics()
+        self.assertEqual((metrics["last_seq"], metrics["durable_seq"], metrics["commits"]), (8, 8, 2))
+        journal.close()
+        
+        restarted = self._make_system()
+        stats = TransferJournal(self.path).recover(restarted)
+        self.assertEqual(stats["records_replayed"], 8)
+        self.assertEqual(self._levels(restarted), self._levels(self.system))
+        self.assertEqual(self._levels(restarted), [3600.0, 2900.0, 500.0])
+    
+    def test_torn_tail_and_checkpoint(self):
+        """Test ID: C77"""
+        journal = TransferJournal(self.path, fuel_system=self.system, group_size=1, checkpoint_every=3)
+        controller = FuelTransferController(self.system, DataLogger(), journal)
+        for _ in range(4):
+            controller.execute_transfer("LEFT", "RIGHT", 100)
+        self.assertEqual(journal.get_metrics()["checkpoints"], 1)
+        self.assertEqual(journal.get_metrics()["journal_records"], 1)  # Replay stays bounded
+        journal.close()
+        
+        # A crash mid-write leaves half a record behind
+        with open(self.path, 'ab') as f:
+            f.write(b"\x20\x00\x00\x00garbage")
+        reopened = TransferJournal(self.path)
+        self.assertEqual(reopened.get_metrics()["last_seq"], 4)
+        restarted = self._make_system()
+        stats = reopened.recover(restarted)
+        self.assertEqual((stats["snapshot_seq"], stats["records_replayed"]), (3, 1))
+        self.assertEqual(self._levels(restarted), [3600.0, 2400.0, 1000.0])
+        self.assertEqual(reopened.record_transfer("LEFT", "RIGHT", 1), 5)
+        reopened.close()
+    
+    def test_synchronous_transfers_wait_for_fsync(self):
+        """Test ID: C95"""
+        journal = TransferJournal(self.path, group_size=64, max_delay=60)
+        controller = FuelTransferController(self.system, DataLogger(), journal)
+        for i in range(3):
+            controller.execute_transfer("LEFT", "RIGHT", 100)
+            metrics = journal.get_metrics()
+            self.assertEqual((metrics["durable_seq"], metrics["pending"]), (i + 1, 0))
+        
+        def worker():
+            for _ in range(20):
+                controller.execute_transfer("LEFT", "RIGHT", 1)
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics = journal.get_metrics()
+        self.assertEqual(metrics["durable_seq"], 83)
+        self.assertLessEqual(metrics["commits"], 83)
+        journal.close()
+    
+    def test_recovery_rejects_out_of_range_levels(self):
+        """Test ID: C96"""
+        journal = TransferJournal(self.path)
+        controller = FuelTransferController(self.system, DataLogger(), journal)
+        controller.execute_transfer("LEFT", "AUX", 400)
+        journal.close()
+        
+        restarted = self._make_system()
+        restarted.add_tank(AuxiliaryTank("AUX", "Aux", 1200, 1000))  # Smaller than the journaled 1400L
+        journal = TransferJournal(self.path)
+        self.assertEqual(journal.get_recovery_info(), {"snapshot_seq": 0, "records": 1})
+        output = io.StringIO()
+        with redirect_stdout(output):
+            stats = journal.recover(restarted)
+        journal.close()
+        self.assertEqual(stats["rejected"], {"AUX": 1400.0})
+        self.assertEqual(stats["tanks_restored"], 1)
+        self.assertEqual(self._levels(restarted), [3600.0, 2000.0, 1000.0])
+        self.assertIn("AUX", output.getvalue())
+
+
+def _aircraft_config(left=4000, right=4000):
+    return {
+        "tanks": [{"tank_id": "LEFT", "name": "Left", "type": "MainFuelTank", "capacity": 5000, "initial_fuel": left},
+                  {"tank_id": "RIGHT", "name": "Right", "type": "MainFuelTank", "capacity": 5000, "initial_fuel": right}],
+        "sensors": [{"sensor_id": "LEFT_LVL", "sensor_type": "LEVEL", "tank_id": "LEFT"}]
+    }
+
+
+class TestFleetManager(unittest.TestCase):
+    
+    def _exercise(self, fleet):
+        configs = {f"AC{i:03d}": _aircraft_config() for i in range(20)}
+        configs["AC005"] = _aircraft_config(left=100)
+        self.assertEqual(fleet.add_fleet(configs), 40)
+        results = fleet.execute_transfers([("AC001", "LEFT", "RIGHT", 500), ("AC002", "LEFT", "RIGHT", 9000),
+                                           ("NOPE", "LEFT", "RIGHT", 1)])
+        self.assertEqual(results, [(True, "Successfully transferred 500.0L"),
+                                   (False, "Insufficient fuel in source (available: 4000.0L)"),
+                                   (False, "Aircraft NOPE not found")])
+        self.assertEqual(fleet.route_readings([("AC003", "LEFT_LVL", 3000), ("AC004", "MISSING", 1)]), 1)
+        self.assertEqual(fleet.get_aircraft_status("AC003")["tanks"]["LEFT"], (3000, "NORMAL"))
+        
+        summary = fleet.get_fleet_summary()
+        self.assertEqual((summary["aircraft"], summary["tanks"]), (20, 40))
+        self.assertEqual(summary["total_fuel"], 20 * 8000 - 3900 - 1000)
+        self.assertEqual(summary["status_counts"]["CRITICAL"], 1)
+        self.assertEqual(summary["critical_aircraft"], 1)
+        self.assertEqual((summary["transfers"], summary["failed_transfers"]), (2, 1))
+        self.assertEqual(fleet.get_critical_aircraft(), ["AC005"])
+    
+    def test_in_process_shards(self):
+        """Test ID: C78"""
+        fleet = FleetManager(workers=3, processes=False)
+        self._exercise(fleet)
+        self.assertEqual(fleet.get_shard("AC001"), FleetManager(workers=3, processes=False).get_shard("AC001"))
+    
+    def test_worker_processes(self):
+        """Test ID: C79"""
+        with FleetManager(workers=2) as fleet:
+            self._exercise(fleet)
+            with self.assertRaises(RuntimeError):
+                fleet.add_aircraft("BAD", {"tanks": [None]})
+            self.assertEqual(fleet.get_fleet_summary()["aircraft"], 20)  # Worker still serving
+
+    def test_in_process_failure_waits_for_all_shards(self):
+        """Test ID: C106"""
+        fleet = FleetManager(workers=2, processes=False)
+        bad = next(f"AC{i}" for i in range(100) if fleet.get_shard(f"AC{i}") == 0)
+        good = next(f"AC{i}" for i in range(100) if fleet.get_shard(f"AC{i}") == 1)
+        with self.assertRaisesRegex(RuntimeError, "shard 0: .*Error"):
+            fleet.add_fleet({bad: {"tanks": [None]}, good: _aircraft_config()})
+        # The healthy shard still ran its commands, as with worker processes
+        self.assertIsNotNone(fleet.get_aircraft_status(good))
+    
+    def test_shard_checks_commands_first(self):
+        """Test ID: C97"""
+        shard = FleetShard()
+        with self.assertRaises(ValueError):
+            shard.handle([("add_aircraft", ("AC001", _aircraft_config())), ("drop_tables", ())])
+        self.assertEqual(shard.get_summary()["aircraft"], 0)
+        
+        fuel_system = build_fuel_system(load_config())
+        self.assertEqual(fuel_system.get_tank_ids(), ["LEFT_MAIN", "RIGHT_MAIN", "CENTER_AUX", "RESERVE"])
+        self.assertEqual(fuel_system.get_sensor_registry().get_sensor_count(), 4)
+        self.assertFalse(fuel_system.get_topology().is_reachable("LEFT_MAIN", "RESERVE"))
+
+
+class TestStateSnapshots(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.system = self._make_system()
+        self.manager = SnapshotManager(self.system, self.directory, max_delta_fraction=0.5)
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    @staticmethod
+    def _make_system(levels=(4000, 2000, 1000)):
+        system = FuelSystem()
+        system.add_tank(MainFuelTank("LEFT", "Left", 5000, levels[0]))
+        system.add_tank(AuxiliaryTank("AUX", "Aux", 1500, levels[1] / 2))
+        system.add_tank(ReserveTank("RES", "Reserve", 1000, levels[2]))
+        return system
+    
+    def test_full_and_delta_restore(self):
+        """Test ID: C80"""
+        self.assertEqual(self.manager.take_snapshot()[0], "full")
+        self.system.get_tank("LEFT").set_fuel_level(3000)
+        self.system.get_tank("RES").activate_emergency_mode()
+        kind, path = self.manager.take_snapshot()
+        self.assertEqual(kind, "delta")
+        delta = read_snapshot(path)
+        self.assertEqual(list(delta.indices), [0])
+        self.assertEqual(delta.emergency, {"RES"})
+        
+        restarted = self._make_system(levels=(0, 0, 0))
+        stats = SnapshotManager(restarted, self.directory).restore()
+        self.assertEqual((stats["seq"], stats["deltas"], stats["tanks_restored"]), (2, 1, 3))
+        self.assertEqual([t.get_fuel_level() for t in restarted.get_all_tanks().values()], [3000, 1000, 1000])
+        self.assertEqual(restarted.get_total_fuel(), 5000)
+        self.assertEqual(restarted.get_tank("LEFT").get_status(), "NORMAL")
+        self.assertTrue(restarted.get_tank("RES").is_emergency_mode())
+    
+    def test_restore_into_empty_system(self):
+        """Test ID: C81"""
+        self.system.get_tank("AUX").set_fuel_level(100)
+        self.manager.take_snapshot()
+        for _ in range(3):
+            self.manager.take_snapshot(full=True)
+        self.assertEqual(len(os.listdir(self.directory)), 1)  # Older chains pruned
+        
+        empty = FuelSystem()
+        stats = SnapshotManager(empty, self.directory).restore()
+        self.assertEqual(stats["tanks_restored"], 3)
+        self.assertEqual(empty.get_tank_ids(), ["LEFT", "AUX", "RES"])
+        self.assertIsInstance(empty.get_tank("RES"), ReserveTank)
+        self.assertEqual(empty.get_tank("AUX").get_fuel_level(), 100)
+        self.assertEqual(empty.get_tank("AUX").get_status(), "CRITICAL")
+        self.assertIsNone(SnapshotManager(FuelSystem(), tempfile.mkdtemp(dir=self.directory)).restore())
+
+
+class TestFlightSimulator(unittest.TestCase):
+    
+    def setUp(self):
+        self.config = {"tanks": [
+            {"tank_id": "MAIN", "name": "Main", "type": "MainFuelTank", "capacity": 1000, "initial_fuel": 600},
+            {"tank_id": "AUX", "name": "Aux", "type": "AuxiliaryTank", "capacity": 1000, "initial_fuel": 300},
+            {"tank_id": "RESERVE", "name": "Reserve", "type": "ReserveTank", "capacity": 1000, "initial_fuel": 1000}
+        ]}
+        phases = [{"name": "CRUISE", "minutes": 60, "burn_rates": {"ENGINE_1": 1200}}]
+        feeds = {"default": {"ENGINE_1": ["AUX", "MAIN", "RESERVE"]}}
+        self.simulator = FlightSimulator(phases, feeds, step_seconds=420, sample_seconds=1800)
+    
+    def test_burn_follows_feed_order(self):
+        """Test ID: C83"""
+        systems = self.simulator.add_fleet(self.config, ["A"])
+        report = self.simulator.run()
+        self.assertEqual(report.get_sample_times(), [0.0, 2100.0, 3600.0])
+        levels = report.get_levels("A")
+        self.assertEqual(levels["AUX"][0], 300)
+        final = report.get_final_levels("A")
+        self.assertEqual((final["AUX"], final["MAIN"]), (0, 0))
+        self.assertAlmostEqual(final["RESERVE"], 700)
+        self.assertAlmostEqual(report.get_fuel_burned("A"), 1200)
+        self.assertEqual(report.get_summary()["steps"], 9)  # 8 full steps + a 240s remainder
+        
+        transitions = report.get_transitions("A")
+        self.assertEqual([t[2:] for t in transitions if t[2] == "RESERVE"], [("RESERVE", "NORMAL", "LOW")])
+        self.assertEqual(report.get_reserve_touched(), {"A": 2940.0})
+        self.assertEqual(report.get_starved(), {})
+        
+        # Final state is written back to the FuelSystem
+        reserve = systems["A"].get_tank("RESERVE")
+        self.assertAlmostEqual(systems["A"].get_total_fuel(), 700)
+        self.assertEqual(reserve.get_status(), "LOW")
+        self.assertTrue(reserve.is_emergency_mode())
+    
+    def test_starvation_and_burn_factor(self):
+        """Test ID: C84"""
+        self.simulator.add_fleet(self.config, ["A", "B"], burn_factors=[0.5, 2.0])
+        report = self.simulator.run()
+        self.assertEqual(report.get_reserve_touched().keys(), {"B"})
+        self.assertEqual(report.get_starved().keys(), {"B"})
+        self.assertAlmostEqual(report.get_remaining_fuel("A"), 1300)
+        self.assertEqual(report.get_remaining_fuel("B"), 0)
+        starvation = [a for a in report.get_alerts("B", "CRITICAL") if a["type"] == "FUEL_STARVATION"]
+        self.assertEqual(len(starvation), 1)
+        self.assertEqual(report.get_summary()["starved"], 1)
+        
+        system = FuelSystem()
+        system.add_tank(MainFuelTank("MAIN", "Main", 1000, 500))
+        with self.assertRaises(ValueError):
+            self.simulator.add_aircraft("C", system)
+    
+    def test_feed_failure_traps_fuel(self):
+        """Test ID: C85"""
+        self.simulator.add_fleet(self.config, ["A"], failures=[{"AUX": 600}])
+        report = self.simulator.run()
+        final = report.get_final_levels("A")
+        self.assertAlmostEqual(final["AUX"], 300 - 1200 * 840 / 3600)  # Failure takes effect at the 840s step
+        self.assertEqual(final["MAIN"], 0)
+        self.assertEqual([a["tank_id"] for a in report.get_alerts("A") if a["type"] == "FEED_FAILURE"], ["AUX"])
+    
+    def test_system_thresholds_and_quiet_write_back(self):
+        """Test ID: C98"""
+        thresholds = dict(DEFAULT_STATUS_THRESHOLDS, RESERVE=(50.0, 20.0))
+        system = build_fuel_system(self.config, FuelSystem(status_thresholds=thresholds))
+        self.simulator.add_aircraft("A", system)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            report = self.simulator.run()
+        self.assertEqual([t for t in report.get_transitions("A") if t[2] == "RESERVE"], [])
+        self.assertEqual(system.get_tank("RESERVE").get_status(), "NORMAL")
+        self.assertTrue(system.get_tank("RESERVE").is_emergency_mode())
+        self.assertEqual(output.getvalue(), "")
+
+
+class TestEnduranceEstimator(unittest.TestCase):
+    
+    def setUp(self):
+        self.config = {"tanks": [
+            {"tank_id": "MAIN", "name": "Main", "type": "MainFuelTank", "capacity": 1000, "initial_fuel": 600},
+            {"tank_id": "AUX", "name": "Aux", "type": "AuxiliaryTank", "capacity": 1000, "initial_fuel": 300},
+            {"tank_id": "RESERVE", "name": "Reserve", "type": "ReserveTank", "capacity": 1000, "initial_fuel": 1000}
+        ]}
+        self.phases = [{"name": "CRUISE", "minutes": 60, "burn_rates": {"ENGINE_1": 1200}}]
+        self.feeds = {"default": {"ENGINE_1": ["AUX", "MAIN", "RESERVE"]}}
+    
+    def test_without_uncertainty_every_scenario_matches(self):
+        """Test ID: C86"""
+        estimator = EnduranceEstimator(self.config, self.phases, self.feeds, burn_sigma=0, sensor_sigma=0,
+                                       transfer_failure_rate=0, step_seconds=300, batch_size=10,
+                                       processes=False)
+        progress = []
+        result = estimator.run(25, callback=lambda r: progress.append(r.get_scenario_count()))
+        self.assertEqual(progress, [10, 20, 25])
+        self.assertEqual(result.get_reserve_probability(), 1.0)
+        self.assertEqual(result.get_starvation_probability(), 0.0)
+        self.assertAlmostEqual(result.get_percentiles("remaining_fuel")[50], 700)
+        self.assertAlmostEqual(result.get_percentiles("reserve_margin")[95], -300)
+        self.assertAlmostEqual(result.get_summary()["endurance_minutes"]["mean"], 35)
+    
+    def test_seeded_runs_match_across_workers(self):
+        """Test ID: C87"""
+        options = dict(burn_sigma=0.1, sensor_sigma=0.05, transfer_failure_rate=0.3,
+                       step_seconds=300, batch_size=5)
+        local = EnduranceEstimator(self.config, self.phases, self.feeds, processes=False, **options)
+        pooled = EnduranceEstimator(self.config, self.phases, self.feeds, workers=2, **options)
+        result = local.run(20, seed=3)
+        self.assertEqual(pooled.run(20, seed=3).get_summary(), result.get_summary())
+        self.assertNotEqual(local.run(20, seed=4).get_summary(), result.get_summary())
+        self.assertEqual(result.get_batch_count(), 4)
+        self.assertGreater(result.get_feed_failure_count(), 0)
+        percentiles = result.get_percentiles("remaining_fuel", (5, 50, 95))
+        self.assertLessEqual(percentiles[5], percentiles[50])
+        self.assertLessEqual(percentiles[50], percentiles[95])
+    
+    def test_histogram_sum_is_exact_and_bounded(self):
+        """Test ID: C99"""
+        batches = [[1e16, 2.0], [-1e16], [0.1] * 10] * 500
+        forward, backward = MetricHistogram(1.0), MetricHistogram(1.0)
+        for batch in batches:
+            forward.add(batch)
+        for batch in reversed(batches):
+            part = MetricHistogram(1.0)
+            part.add(batch)
+            backward.merge(part)
+        self.assertEqual(forward.get_mean(), backward.get_mean())
+        self.assertEqual(forward.get_mean(), 1500.0 / forward.get_count())
+        self.assertLess(len(forward._partials), 10)
+
+
 class TestSystemIntegration(unittest.TestCase):
     """Test SystemIntegration"""
     
@@ -1,6 +1,11 @@
 import unittest
+from unittest import mock
 import sys
 import os
+import io
+import json
+import threading
+from contextlib import redirect_stdout
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from models.fuel_tank import FuelTank
@@ -8,6 +13,18 @@ from models.main_fuel_tank import MainFuelTank
 from models.auxiliary_tank import AuxiliaryTank
 from models.reserve_tank import ReserveTank
 from models.fuel_sensor import FuelSensor
+from models.tank_store import MAX_TYPE_CODE, SharedTankStore, TankStore
+from models.tank_aggregates import TankAggregates
+from models.tank_indexes import SortedKeys, TankIndexes
+from models.tank_events import TankEventBus, TankEvent
+from models.status_classifier import classify_statuses, update_statuses
+from models import rejection
+from models.rejection import Rejection
+from models.reading_history import ReadingHistory
+from models import sensor_bank
+from models.sensor_bank import SensorBank, SharedSensorBank
+from models.sensor_faults import SensorFault, SensorFaultDetector
+from models.plumbing_topology import PlumbingTopology
 from utils.data_logger import DataLogger
 
 class TestFuelTanks(unittest.TestCase):
@@ -236,6 +253,518 @@ class TestFuelSensor(unittest.TestCase):
         self.assertFalse(sensor.is_operational())
 
 
+class TestReadingHistory(unittest.TestCase):
+    
+    def test_rolling_stats_match_window(self):
+        """Test ID: T40"""
+        import random
+        import statistics
+        rng = random.Random(7)
+        history = ReadingHistory(capacity=16)
+        values = []
+        for i in range(200):
+            value = rng.uniform(-50, 100)
+            values.append(value)
+            history.add(float(i), value)
+            window = values[-16:]
+            self.assertEqual(history.get_min(), min(window))
+            self.assertEqual(history.get_max(), max(window))
+            self.assertAlmostEqual(history.get_mean(), statistics.fmean(window), places=9)
+            self.assertAlmostEqual(history.get_variance(), statistics.pvariance(window), places=6)
+        self.assertEqual(history.get_count(), 16)
+        self.assertEqual(history.get_total_samples(), 200)
+    
+    def test_window_is_chronological(self):
+        """Test ID: T41"""
+        history = ReadingHistory(capacity=4)
+        for i in range(6):
+            history.add(float(i), i * 10.0)
+        times, values = history.get_window()
+        self.assertEqual(list(times), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(list(values), [20.0, 30.0, 40.0, 50.0])
+        self.assertEqual(list(history.get_window(2)[1]), [40.0, 50.0])
+        self.assertEqual(history.get_latest(), (5.0, 50.0))
+    
+    def test_ewma(self):
+        """Test ID: T42"""
+        history = ReadingHistory(capacity=4, ewma_alpha=0.5)
+        for value in [10.0, 20.0, 20.0]:
+            history.add(0.0, value)
+        self.assertEqual(history.get_ewma(), 17.5)
+    
+    def test_sensor_history(self):
+        """Test ID: T43"""
+        sensor = FuelSensor("SENS_001", "LEVEL", "LEFT_MAIN", history_size=3)
+        self.assertIsNone(sensor.get_history())
+        for value in [100.0, 200.0, 300.0, 400.0]:
+            sensor.set_reading(value, timestamp=value)
+        history = sensor.get_history()
+        self.assertEqual(history.get_count(), 3)
+        self.assertEqual(history.get_mean(), 300.0)
+        
+        no_history = FuelSensor("SENS_002", "LEVEL", "LEFT_MAIN", history_size=0)
+        no_history.set_reading(1.0)
+        self.assertIsNone(no_history.get_history())
+
+
+class TestSensorBank(unittest.TestCase):
+    
+    def setUp(self):
+        self.bank = SensorBank()
+        self.level = FuelSensor("S_LEVEL", "LEVEL", "T1", bank=self.bank)
+        self.pressure = FuelSensor("S_PRES", "PRESSURE", "T1", bank=self.bank)
+        self.temp = FuelSensor("S_TEMP", "TEMPERATURE", "T1", history_size=0, bank=self.bank)
+    
+    def test_ingest_all_rows(self):
+        """Test ID: T44"""
+        self.bank.calibrate([5.0, -1.0, 0.5])
+        calibrated, mask = self.bank.ingest([4500.0, 120.0, 20.0], timestamps=1.0)
+        self.assertEqual(list(calibrated), [4505.0, 119.0, 20.5])
+        self.assertEqual(list(mask), [1, 0, 1])
+        self.assertEqual(self.level.get_reading(), 4505.0)
+        self.assertFalse(self.pressure.is_operational())
+        self.assertIsNone(self.pressure.get_reading())
+        self.assertEqual(self.level.get_history().get_latest(), (1.0, 4500.0))
+        self.assertIsNone(self.temp.get_history())
+    
+    def test_ingest_by_index(self):
+        """Test ID: T45"""
+        calibrated, mask = self.bank.ingest([-80.0, 45.0], indices=[2, 1], timestamps=[1.0, 2.0])
+        self.assertEqual(list(mask), [0, 1])
+        self.assertFalse(self.temp.is_operational())
+        self.assertEqual(self.pressure.get_reading(), 45.0)
+        self.assertEqual(self.level.get_reading(), 0.0)
+        self.assertEqual(self.pressure.get_history().get_latest(), (2.0, 45.0))
+    
+    def test_bank_self_test_matches_sensor(self):
+        """Test ID: T46"""
+        for sensor, value in [(self.level, 20000.0), (self.pressure, 50.0), (self.temp, 150.0)]:
+            sensor.set_reading(value)
+        expected = [s.perform_self_test() for s in (self.level, self.pressure, self.temp)]
+        self.assertEqual([bool(flag) for flag in self.bank.self_test()], expected)
+    
+    def test_adopt_sensor(self):
+        """Test ID: T47"""
+        sensor = FuelSensor("S_NEW", "LEVEL", "T2")
+        sensor.set_reading(100.0, timestamp=1.0)
+        sensor.calibrate(1.5)
+        self.bank.adopt(sensor)
+        self.assertIs(sensor.get_bank(), self.bank)
+        self.assertEqual(sensor.get_reading(), 101.5)
+        self.assertEqual(sensor.get_history().get_count(), 1)
+    
+    def test_sensor_type_codes_fit_int8(self):
+        """Test ID: T64"""
+        names = [f"TYPE_{code}" for code in range(MAX_TYPE_CODE + 1)]
+        with mock.patch.object(sensor_bank, "SENSOR_TYPES", list(names)), \
+                mock.patch.object(sensor_bank, "_SENSOR_TYPE_CODES", {name: code for code, name in enumerate(names)}):
+            self.assertEqual(sensor_bank.sensor_type_code(names[-1]), MAX_TYPE_CODE)
+            with self.assertRaises(ValueError):
+                sensor_bank.sensor_type_code("ONE_TOO_MANY")
+
+
+class TestSensorFaultDetector(unittest.TestCase):
+    
+    def setUp(self):
+        self.bank = SensorBank()
+        self.sensors = [FuelSensor(f"S_{i}", "PRESSURE", "T1", history_size=0, bank=self.bank)
+                        for i in range(3)]
+        self.detector = SensorFaultDetector(self.bank, stuck_samples=5, drift_min_samples=5)
+    
+    def feed(self, values):
+        calibrated, mask = self.bank.ingest(values, record_history=False)
+        return list(self.detector.update(calibrated, mask))
+    
+    def test_stuck_sensor(self):
+        """Test ID: T48"""
+        for i in range(6):
+            mask = self.feed([45.0, 45.0 + 0.1 * (i % 2), 45.0 - 0.1 * (i % 2)])
+        self.assertEqual(mask, [0, 1, 1])
+        self.assertEqual(self.detector.get_fault(0), SensorFault.STUCK)
+        self.assertFalse(self.sensors[0].is_operational())
+        # Recovers as soon as the reading changes
+        self.assertEqual(self.feed([45.2, 45.0, 45.1]), [1, 1, 1])
+        self.assertTrue(self.sensors[0].is_operational())
+    
+    def test_spike(self):
+        """Test ID: T49"""
+        for i in range(10):
+            self.feed([45.0 + 0.1 * (i % 3), 45.0 + 0.1 * (i % 2), 45.0 - 0.1 * (i % 2)])
+        self.assertEqual(self.feed([80.0, 45.1, 45.0]), [0, 1, 1])
+        self.assertEqual(self.detector.get_fault(0), SensorFault.SPIKE)
+        self.assertEqual(self.detector.get_fault_counts()["SPIKE"], 1)
+    
+    def test_drift_against_siblings(self):
+        """Test ID: T50"""
+        for i in range(60):
+            jitter = 0.1 * (i % 2)
+            mask = self.feed([45.0 + jitter, 45.1 - jitter, 45.0 + jitter + 0.2 * i])
+        self.assertEqual(mask, [1, 1, 0])
+        self.assertEqual(self.detector.get_fault(2), SensorFault.DRIFT)
+        self.assertEqual(self.detector.get_faulty_rows(), [2])
+    
+    def test_range_checks_keep_faulty_sensor_down(self):
+        """Test ID: T61"""
+        for i in range(6):
+            self.feed([45.0, 45.0 + 0.1 * (i % 2), 45.0 - 0.1 * (i % 2)])
+        self.assertTrue(self.sensors[0].perform_self_test())
+        self.assertFalse(self.sensors[0].is_operational())
+        self.bank.ingest([45.0, 45.1, 44.9], record_history=False)
+        self.assertEqual(list(self.bank.operational), [0, 1, 1])
+    
+    def test_steady_siblings_not_stuck(self):
+        """Test ID: T62"""
+        for _ in range(20):
+            mask = self.feed([45.0, 45.0, 45.0])
+        self.assertEqual(mask, [1, 1, 1])
+        self.assertEqual(self.detector.get_faulty_rows(), [])
+
+
+class TestPlumbingTopology(unittest.TestCase):
+    
+    def setUp(self):
+        with open('data/logs/tank_config.json') as f:
+            self.topology = PlumbingTopology.from_config(json.load(f))
+    
+    def test_route_capacity_and_direction(self):
+        """Test ID: T51"""
+        self.assertEqual(self.topology.get_route_capacity("LEFT_MAIN", "RIGHT_MAIN"), 15.0)
+        self.assertEqual(self.topology.get_route_capacity("CENTER_AUX", "LEFT_MAIN"), 10.0)
+        self.assertEqual(self.topology.get_route("RESERVE", "RIGHT_MAIN"), ["RESERVE", "CROSSFEED", "RIGHT_MAIN"])
+        # One-way pipes: nothing flows back into the auxiliary or reserve tanks
+        self.assertFalse(self.topology.is_reachable("LEFT_MAIN", "CENTER_AUX"))
+        self.assertFalse(self.topology.is_reachable("LEFT_MAIN", "UNKNOWN"))
+    
+    def test_valves_invalidate_cache(self):
+        """Test ID: T52"""
+        self.topology.is_reachable("LEFT_MAIN", "RIGHT_MAIN")
+        self.topology.is_reachable("CENTER_AUX", "RIGHT_MAIN")
+        self.assertEqual(self.topology.get_rebuild_count(), 1)
+        self.assertTrue(self.topology.close_valve("CROSSFEED_VALVE"))
+        self.assertFalse(self.topology.is_reachable("LEFT_MAIN", "RIGHT_MAIN"))
+        self.assertEqual(self.topology.get_rebuild_count(), 2)
+        self.topology.add_pipe("PIPE_DIRECT", "LEFT_MAIN", "RIGHT_MAIN", 4.0)
+        self.topology.add_pipe("PIPE_DIRECT_2", "LEFT_MAIN", "RIGHT_MAIN", 4.0)
+        # Parallel pipes are alternative routes: the widest one counts
+        self.assertEqual(self.topology.get_route_capacity("RIGHT_MAIN", "LEFT_MAIN"), 4.0)
+        self.topology.warm_cache()
+        rebuilds = self.topology.get_rebuild_count()
+        self.topology.is_reachable("LEFT_MAIN", "RIGHT_MAIN")
+        self.assertEqual(self.topology.get_rebuild_count(), rebuilds)
+        self.assertFalse(self.topology.set_valve("NO_SUCH_VALVE", True))
+    
+    def test_routes_pass_only_through_junctions(self):
+        """Test ID: T65"""
+        self.topology.add_pipe("PIPE_OUT", "RIGHT_MAIN", "OUTBOARD", 8.0)
+        # LEFT_MAIN -> CROSSFEED -> RIGHT_MAIN -> OUTBOARD would pass through a tank
+        self.assertFalse(self.topology.is_reachable("LEFT_MAIN", "OUTBOARD"))
+        self.assertEqual(self.topology.get_route_capacity("RIGHT_MAIN", "OUTBOARD"), 8.0)
+        topology = PlumbingTopology()
+        topology.add_pipe("P1", "A", "B", 5.0)
+        topology.add_pipe("P2", "B", "C", 5.0)
+        self.assertEqual(topology.get_route("A", "C"), ["A", "B", "C"])
+        topology.mark_tanks(["B"])
+        self.assertIsNone(topology.get_route("A", "C"))
+        self.assertTrue(topology.is_reachable("A", "B"))
+
+
+class TestTankIndexes(unittest.TestCase):
+    
+    def setUp(self):
+        self.store = TankStore()
+        self.indexes = TankIndexes(self.store)
+        self.tanks = {tank_id: AuxiliaryTank(tank_id, tank_id, 1000, level, store=self.store)
+                      for tank_id, level in (("A1", 100), ("A2", 900), ("A3", 500), ("A4", 240))}
+        self.main = MainFuelTank("M1", "Main", 5000, 1000, store=self.store)
+    
+    def ids(self, tanks):
+        return [tank.get_tank_id() for tank in tanks]
+    
+    def test_type_and_range_queries(self):
+        """Test ID: T54"""
+        self.assertEqual(self.ids(self.indexes.get_tanks_by_type("AUXILIARY")), ["A1", "A2", "A3", "A4"])
+        self.assertEqual(self.ids(self.indexes.get_tanks_by_type("RESERVE")), [])
+        self.assertEqual(len(self.indexes.get_tanks_by_fuel_type("Jet-A")), 5)
+        self.assertEqual(self.ids(self.indexes.get_tanks_below_percentage(25)), ["A1", "M1", "A4"])
+        self.assertEqual(self.ids(self.indexes.get_tanks_in_percentage_range(20, 50)), ["M1", "A4"])
+        self.assertEqual(self.ids(self.indexes.get_fullest_tanks(2, "AUXILIARY")), ["A2", "A3"])
+        self.assertEqual(self.ids(self.indexes.get_emptiest_tanks(1)), ["A1"])
+        self.assertEqual(self.ids(self.indexes.get_tanks_with_available_capacity(760)), ["A4", "A1", "M1"])
+    
+    def test_indexes_follow_fuel_changes(self):
+        """Test ID: T55"""
+        self.tanks["A1"].add_fuel(850)
+        self.tanks["A2"].remove_fuel(800)
+        self.assertEqual(self.ids(self.indexes.get_fullest_tanks(1)), ["A1"])
+        self.assertEqual(self.ids(self.indexes.get_tanks_below_percentage(25, "AUXILIARY")), ["A2", "A4"])
+        self.indexes.verify()
+        # Moving a tank to another store drops it from this store's indexes
+        TankStore().adopt(self.tanks["A3"])
+        self.assertEqual(self.ids(self.indexes.get_tanks_by_type("AUXILIARY")), ["A1", "A2", "A4"])
+        self.store.replace_columns({"fuel_level": [0.0, 0.0, 0.0, 1000.0, 0.0]})
+        self.assertEqual(self.ids(self.indexes.get_fullest_tanks(1)), ["A4"])
+        self.indexes.verify()
+    
+    def test_sorted_keys_chunks(self):
+        """Test ID: T56"""
+        keys = SortedKeys([(5, 0), (1, 1)])
+        keys.LOAD = 2  # Force chunk splits
+        expected = [(5, 0), (1, 1)]
+        for i in range(2, 40):
+            key = ((i * 7) % 13, i)
+            keys.add(key)
+            expected.append(key)
+        for key in expected[::3]:
+            keys.remove(key)
+        expected = sorted(set(expected) - set(expected[::3]))
+        self.assertEqual(list(keys), expected)
+        self.assertEqual(list(reversed(keys)), expected[::-1])
+        self.assertEqual(len(keys), len(expected))
+        self.assertEqual(list(keys.iter_from((6, -1))), [key for key in expected if key[0] >= 6])
+
+
+class TestTankEventBus(unittest.TestCase):
+    
+    def setUp(self):
+        self.store = TankStore()
+        self.bus = TankEventBus(self.store)
+        self.main = MainFuelTank("M1", "Main", 5000, 4000, store=self.store)
+        self.reserve = ReserveTank("R1", "Reserve", 1000, 1000, store=self.store)
+        self.received = []
+        self.bus.subscribe(self.received.extend)
+    
+    def test_changes_are_coalesced_per_tank(self):
+        """Test ID: T57"""
+        for _ in range(10):
+            self.main.remove_fuel(200)
+        self.main.set_pressure(40.0)
+        self.main.set_temperature(30.0)
+        self.main.set_temperature(25.0)  # Back where it started: dropped
+        with redirect_stdout(io.StringIO()):
+            self.reserve.activate_emergency_mode()
+        self.assertEqual(self.bus.flush(), 4)
+        self.assertEqual(sorted(self.received), sorted([
+            TankEvent("FUEL_LEVEL", "M1", 4000, 2000),
+            TankEvent("STATUS", "M1", "NORMAL", "LOW"),
+            TankEvent("PRESSURE", "M1", 45.0, 40.0),
+            TankEvent("EMERGENCY_MODE", "R1", False, True),
+        ]))
+        self.assertEqual(self.bus.get_metrics()["published"], 15)
+        self.assertEqual(self.bus.flush(), 0)
+    
+    def test_subscription_filters(self):
+        """Test ID: T58"""
+        statuses = []
+        reserve_events = []
+        self.bus.subscribe(statuses.extend, kinds=["STATUS"])
+        subscription = self.bus.subscribe(reserve_events.extend, tank_ids=["R1"])
+        self.bus.subscribe(lambda events: 1 / 0)  # Failing subscriber does not stop delivery
+        self.main.remove_fuel(3000)
+        with redirect_stdout(io.StringIO()) as output:
+            self.reserve.activate_emergency_mode()
+            self.reserve.remove_fuel(100)
+            self.bus.flush()
+        self.assertIn("Error in tank event subscriber", output.getvalue())
+        self.assertEqual(statuses, [TankEvent("STATUS", "M1", "NORMAL", "CRITICAL")])
+        self.assertEqual(sorted(reserve_events), [TankEvent("EMERGENCY_MODE", "R1", False, True),
+                                                  TankEvent("FUEL_LEVEL", "R1", 1000, 900)])
+        self.assertTrue(self.bus.unsubscribe(subscription))
+        self.assertFalse(self.bus.unsubscribe(subscription))
+        self.store.replace_columns({"fuel_level": [0.0, 0.0]})
+        self.bus.flush()
+        self.assertEqual(self.received[-1], TankEvent("RELOADED", None, None, None))
+        TankStore().adopt(self.main)
+        self.bus.flush()
+        self.assertEqual(self.received[-1], TankEvent("TANK_REMOVED", "M1", None, None))
+        with self.assertRaises(ValueError):
+            self.bus.subscribe(print, kinds=["NOT_A_KIND"])
+
+
+class TestTankStore(unittest.TestCase):
+    
+    def test_tank_is_view_onto_store_row(self):
+        """Test ID: T31"""
+        store = TankStore()
+        tank = MainFuelTank("M1", "Main", 5000, 4000, store=store)
+        self.assertIs(tank.get_store(), store)
+        tank.add_fuel(500)
+        self.assertEqual(store.fuel_level[tank.get_row()], 4500)
+        store.pressure[tank.get_row()] = 40.0
+        self.assertEqual(tank.get_pressure(), 40.0)
+    
+    def test_store_aggregates(self):
+        """Test ID: T32"""
+        store = TankStore()
+        MainFuelTank("M1", "Main", 5000, 4000, store=store)
+        AuxiliaryTank("A1", "Aux", 3000, 500, store=store)
+        ReserveTank("R1", "Reserve", 1000, 1000, store=store)
+        self.assertEqual(store.get_total_fuel(), 5500)
+        self.assertEqual(store.get_total_capacity(), 9000)
+        self.assertEqual(store.count_status("NORMAL"), 2)
+        self.assertEqual(store.count_status("CRITICAL"), 1)
+    
+    def test_adopt_releases_old_row(self):
+        """Test ID: T33"""
+        old_store, new_store = TankStore(), TankStore()
+        tank = AuxiliaryTank("A1", "Aux", 3000, 600, store=old_store)
+        tank._status = tank.check_status()
+        new_store.adopt(tank)
+        self.assertIs(tank.get_store(), new_store)
+        self.assertEqual(tank.get_fuel_level(), 600)
+        self.assertEqual(tank.get_status(), "CRITICAL")
+        self.assertEqual(old_store.get_total_fuel(), 0)
+        self.assertEqual(old_store.get_tanks_by_status("CRITICAL"), [])
+        self.assertEqual(new_store.get_tanks_by_status("CRITICAL"), [tank])
+    
+    def test_standalone_tanks_share_store_and_free_rows(self):
+        """Test ID: T63"""
+        store = SharedTankStore()
+        first = MainFuelTank("M1", "Main", 5000, 4000, store=store)
+        second = AuxiliaryTank("A1", "Aux", 3000, 600, store=store)
+        self.assertEqual((first.get_row(), second.get_row(), len(store)), (0, 1, 2))
+        row = first.get_row()
+        del first
+        self.assertIsNone(store.get_tank(row))
+        self.assertEqual(store.get_total_fuel(), 600)
+        third = ReserveTank("R1", "Reserve", 1000, 1000, store=store)
+        self.assertEqual((third.get_row(), len(store)), (row, 2))  # Freed row reused
+        self.assertEqual(store.get_tanks_by_type("RESERVE"), [third])
+        TankStore().adopt(second)
+        self.assertEqual(store.get_tank_ids(), ["R1", None])
+        self.assertIs(MainFuelTank("M2", "Main", 5000, 0).get_store(), MainFuelTank("M3", "Main", 5000, 0).get_store())
+        
+        bank = SharedSensorBank()
+        sensor = FuelSensor("S1", "LEVEL", "M1", bank=bank)
+        sensor.set_reading(100.0, timestamp=0.0)
+        self.assertEqual(sensor.get_history().get_count(), 1)
+        del sensor
+        self.assertEqual(FuelSensor("S2", "LEVEL", "M1", bank=bank).get_row(), 0)
+        self.assertEqual(len(bank), 1)
+    
+    def test_bulk_writes_notify_once(self):
+        """Test ID: T53"""
+        store = TankStore()
+        aggregates = TankAggregates(store)
+        main = MainFuelTank("M1", "Main", 5000, 4000, store=store)
+        reserve = ReserveTank("R1", "Reserve", 1000, 1000, store=store)
+        self.assertEqual(store.get_tank_ids(), ["M1", "R1"])
+        self.assertEqual(store.get_tanks_by_type("RESERVE"), [reserve])
+        store.replace_columns({"fuel_level": [1000.0, 200.0], "status": [2, 2]})
+        self.assertEqual(main.get_fuel_level(), 1000)
+        self.assertEqual(aggregates.get_total_fuel(), 1200)
+        self.assertEqual(aggregates.count_status("CRITICAL"), 2)
+        store.write_rows([1], {"fuel_level": [900.0], "status": [0]})
+        self.assertEqual(aggregates.get_total_fuel(), 1900)
+        self.assertEqual(aggregates.get_tanks_by_status("NORMAL"), [reserve])
+        with self.assertRaises(ValueError):
+            store.replace_columns({"fuel_level": [1.0]})
+    
+    def test_fuel_type_changes_notify_listeners(self):
+        """Test ID: T59"""
+        store = TankStore()
+        indexes = TankIndexes(store)
+        bus = TankEventBus(store)
+        events = []
+        bus.subscribe(events.extend)
+        tank = MainFuelTank("M1", "Main", 5000, 4000, store=store)
+        tank._fuel_type = "Jet-A1"
+        self.assertEqual(indexes.get_tanks_by_fuel_type("Jet-A1"), [tank])
+        self.assertEqual(indexes.get_tanks_by_fuel_type("Jet-A"), [])
+        bus.flush()
+        self.assertIn(TankEvent("FUEL_TYPE", "M1", "Jet-A", "Jet-A1"), events)
+        with self.assertRaises(ValueError):
+            store.add_row(tank, 100, 0, 45.0, 25.0)  # No tank type
+
+
+class TestStatusClassifier(unittest.TestCase):
+    
+    def test_initial_status_computed(self):
+        """Test ID: T34"""
+        self.assertEqual(MainFuelTank("M1", "Main", 5000, 500).get_status(), "CRITICAL")
+        self.assertEqual(ReserveTank("R1", "Reserve", 1000, 600).get_status(), "LOW")
+    
+    def test_batch_matches_check_status(self):
+        """Test ID: T35"""
+        store = TankStore()
+        tanks = []
+        for level in [0, 200, 1000, 1500, 2500, 2600, 3500, 5000]:
+            tanks.append(MainFuelTank("M", "Main", 5000, level, store=store))
+            tanks.append(AuxiliaryTank("A", "Aux", 5000, level, store=store))
+            tanks.append(ReserveTank("R", "Reserve", 5000, level, store=store))
+        for tank in tanks:
+            tank._status = "NORMAL"
+        
+        codes = classify_statuses(store)
+        self.assertEqual([tank.check_status() for tank in tanks],
+                         [["NORMAL", "LOW", "CRITICAL"][code] for code in codes])
+    
+    def test_custom_thresholds(self):
+        """Test ID: T36"""
+        store = TankStore()
+        main = MainFuelTank("M1", "Main", 1000, 600, store=store)
+        reserve = ReserveTank("R1", "Reserve", 1000, 600, store=store)
+        changed = update_statuses(store, {"MAIN": (80.0, 40.0), "RESERVE": (50.0, 20.0)})
+        self.assertEqual(main.get_status(), "LOW")
+        self.assertEqual(reserve.get_status(), "NORMAL")
+        self.assertEqual(sorted(changed), [0, 1])
+    
+    def test_vacant_rows_not_classified(self):
+        """Test ID: T37"""
+        old_store = TankStore()
+        tank = MainFuelTank("M1", "Main", 5000, 100, store=old_store)
+        TankStore().adopt(tank)
+        update_statuses(old_store)
+        self.assertEqual(old_store.count_status("CRITICAL"), 0)
+
+
+class TestRejections(unittest.TestCase):
+    
+    def setUp(self):
+        rejection.reset_rejection_counts()
+    
+    def tearDown(self):
+        rejection.set_verbose(True)
+    
+    def test_rejection_reasons(self):
+        """Test ID: T38"""
+        tank = MainFuelTank("TEST", "Test Tank", 5000, 4800)
+        self.assertIs(tank.add_fuel(500), Rejection.EXCEEDS_CAPACITY)
+        self.assertIs(tank.remove_fuel(-1), Rejection.NEGATIVE_AMOUNT)
+        self.assertIs(tank.set_pressure(100), Rejection.PRESSURE_LIMIT)
+        self.assertIs(tank.set_temperature(-60), Rejection.TEMPERATURE_TOO_LOW)
+        self.assertIs(ReserveTank("R", "Reserve", 1000, 500).remove_fuel(10),
+                      Rejection.EMERGENCY_MODE_REQUIRED)
+        self.assertFalse(Rejection.INSUFFICIENT_FUEL)
+    
+    def test_silent_mode_counts_without_printing(self):
+        """Test ID: T39"""
+        rejection.set_verbose(False)
+        tank = MainFuelTank("TEST", "Test Tank", 5000, 100)
+        sensor = FuelSensor("SENS_001", "LEVEL", "TEST")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            for _ in range(3):
+                tank.remove_fuel(500)
+            tank.add_fuel(-5)
+            sensor.calibrate(1.0)
+            sensor.set_operational_status(False)
+        self.assertEqual(output.getvalue(), "")
+        counts = rejection.get_rejection_counts()
+        self.assertEqual(counts["INSUFFICIENT_FUEL"], 3)
+        self.assertEqual(counts["NEGATIVE_AMOUNT"], 1)
+    
+    def test_verbosity_is_per_thread(self):
+        """Test ID: T60"""
+        seen = []
+        worker = threading.Thread(target=lambda: seen.append(rejection.is_verbose()))
+        with rejection.quiet():
+            self.assertFalse(rejection.is_verbose())
+            worker.start()
+            worker.join()
+        self.assertEqual(seen, [True])
+        self.assertTrue(rejection.is_verbose())
+
+
 class TestDataLogger(unittest.TestCase):
     
     def test_logger_creation(self):
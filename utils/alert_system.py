@@ -1,3 +1,9 @@
+from models.tank_events import FUEL_LEVEL, CAPACITY, STATUS, PRESSURE, TEMPERATURE, TANK_REMOVED, RELOADED
+
+# Changes that can raise or clear an alert
+WATCHED_EVENTS = (FUEL_LEVEL, CAPACITY, STATUS, PRESSURE, TEMPERATURE, TANK_REMOVED, RELOADED)
+
+
 class AlertSystem:
     """Alert system for monitoring fuel levels and generating warnings"""
     
@@ -12,6 +18,8 @@ class AlertSystem:
         self._fuel_system = fuel_system
         self._logger = data_logger
         self._active_alerts = []
+        self._alerts_by_tank = {}  # tank ID -> alerts, for event-driven re-checks
+        self._subscription = None
     
     def check_all_tanks(self):
         """
@@ -21,68 +29,113 @@ class AlertSystem:
             List of active alerts
         """
         self._active_alerts = []
+        self._alerts_by_tank = {}
         
         for tank_id, tank in self._fuel_system.get_all_tanks().items():
-            # Check fuel level
-            status = tank.get_status()
-            percentage = tank.get_fuel_percentage()
-            
-            if status == "CRITICAL":
-                alert = {
-                    "tank_id": tank_id,
-                    "tank_name": tank.get_name(),
-                    "severity": "CRITICAL",
-                    "type": "FUEL_LEVEL",
-                    "message": f"CRITICAL fuel level: {percentage:.1f}%",
-                    "value": tank.get_fuel_level()
-                }
-                self._active_alerts.append(alert)
-                self._logger.log_alert(tank_id, alert["message"])
-            
-            elif status == "LOW":
-                alert = {
-                    "tank_id": tank_id,
-                    "tank_name": tank.get_name(),
-                    "severity": "WARNING",
-                    "type": "FUEL_LEVEL",
-                    "message": f"Low fuel level: {percentage:.1f}%",
-                    "value": tank.get_fuel_level()
-                }
-                self._active_alerts.append(alert)
-                self._logger.log_alert(tank_id, alert["message"])
-            
-            # Check pressure
-            pressure = tank.get_pressure()
-            max_pressure = tank.get_max_pressure()
-            if pressure > max_pressure:
-                alert = {
-                    "tank_id": tank_id,
-                    "tank_name": tank.get_name(),
-                    "severity": "WARNING",
-                    "type": "PRESSURE",
-                    "message": f"Pressure above limit: {pressure:.1f} PSI (max: {max_pressure:.1f})",
-                    "value": pressure
-                }
-                self._active_alerts.append(alert)
-                self._logger.log_alert(tank_id, alert["message"])
-            
-            # Check temperature
-            temperature = tank.get_temperature()
-            max_temp = tank.get_max_temperature()
-            if temperature > max_temp:
-                alert = {
-                    "tank_id": tank_id,
-                    "tank_name": tank.get_name(),
-                    "severity": "WARNING",
-                    "type": "TEMPERATURE",
-                    "message": f"Temperature above limit: {temperature:.1f}°C (max: {max_temp:.1f})",
-                    "value": temperature
-                }
+            alerts = self._check_tank(tank_id, tank)
+            if alerts:
+                self._alerts_by_tank[tank_id] = alerts
+            for alert in alerts:
                 self._active_alerts.append(alert)
                 self._logger.log_alert(tank_id, alert["message"])
         
         return self._active_alerts
     
+    def _check_tank(self, tank_id, tank):
+        """Build the alerts for one tank"""
+        alerts = []
+        
+        # Check fuel level
+        status = tank.get_status()
+        percentage = tank.get_fuel_percentage()
+        
+        if status == "CRITICAL":
+            alerts.append({
+                "tank_id": tank_id,
+                "tank_name": tank.get_name(),
+                "severity": "CRITICAL",
+                "type": "FUEL_LEVEL",
+                "message": f"CRITICAL fuel level: {percentage:.1f}%",
+                "value": tank.get_fuel_level()
+            })
+        
+        elif status == "LOW":
+            alerts.append({
+                "tank_id": tank_id,
+                "tank_name": tank.get_name(),
+                "severity": "WARNING",
+                "type": "FUEL_LEVEL",
+                "message": f"Low fuel level: {percentage:.1f}%",
+                "value": tank.get_fuel_level()
+            })
+        
+        # Check pressure
+        pressure = tank.get_pressure()
+        max_pressure = tank.get_max_pressure()
+        if pressure > max_pressure:
+            alerts.append({
+                "tank_id": tank_id,
+                "tank_name": tank.get_name(),
+                "severity": "WARNING",
+                "type": "PRESSURE",
+                "message": f"Pressure above limit: {pressure:.1f} PSI (max: {max_pressure:.1f})",
+                "value": pressure
+            })
+        
+        # Check temperature
+        temperature = tank.get_temperature()
+        max_temp = tank.get_max_temperature()
+        if temperature > max_temp:
+            alerts.append({
+                "tank_id": tank_id,
+                "tank_name": tank.get_name(),
+                "severity": "WARNING",
+                "type": "TEMPERATURE",
+                "message": f"Temperature above limit: {temperature:.1f}°C (max: {max_temp:.1f})",
+                "value": temperature
+            })
+        
+        return alerts
+    
+    def watch_events(self):
+        """
+        Keep alerts current from the fuel system's change events.
+        
+        Runs one full check, then re-checks only the tanks named in each
+        batch of events (delivered by TankEventBus.flush()). Only alerts
+        that were not already active are logged.
+        """
+        if self._subscription is not None:
+            return
+        self.check_all_tanks()
+        self._subscription = self._fuel_system.get_event_bus().subscribe(
+            self._on_tank_events, kinds=WATCHED_EVENTS)
+    
+    def stop_watching(self):
+        """Stop updating alerts from change events"""
+        if self._subscription is not None:
+            self._fuel_system.get_event_bus().unsubscribe(self._subscription)
+            self._subscription = None
+    
+    def _on_tank_events(self, events):
+        if any(event.kind == RELOADED for event in events):
+            tank_ids = set(self._fuel_system.get_all_tanks()) | set(self._alerts_by_tank)
+        else:
+            tank_ids = {event.tank_id for event in events}
+        
+        for tank_id in tank_ids:
+            previous = {(alert["type"], alert["severity"])
+                        for alert in self._alerts_by_tank.pop(tank_id, ())}
+            tank = self._fuel_system.get_tank(tank_id)
+            alerts = self._check_tank(tank_id, tank) if tank is not None else []
+            if alerts:
+                self._alerts_by_tank[tank_id] = alerts
+            for alert in alerts:
+                if (alert["type"], alert["severity"]) not in previous:
+                    self._logger.log_alert(tank_id, alert["message"])
+        
+        self._active_alerts = [alert for alerts in self._alerts_by_tank.values() for alert in alerts]
+    
     def get_active_alerts(self):
         """Get list of all active alerts"""
         return self._active_alerts
@@ -115,6 +168,7 @@ class AlertSystem:
     def clear_alerts(self):
         """Clear all active alerts"""
         self._active_alerts = []
+        self._alerts_by_tank = {}
     
     def get_alert_count(self):
         """Get total number of active alerts"""
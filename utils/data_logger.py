@@ -59,6 +59,22 @@ class DataLogger:
         severity = "INFO" if success else "WARNING"
         self.log_event("FUEL_TRANSFER", message, source_tank, severity)
     
+    def log_transfer_batch(self, applied, rejected, amount, tank_count, mode):
+        """
+        Log one aggregated record for a batch of fuel transfers.
+        
+        Args:
+            applied (int): Transfers applied
+            rejected (int): Transfers rejected
+            amount (float): Total liters moved
+            tank_count (int): Tanks whose level changed
+            mode (str): Batch mode ("ATOMIC" or "BEST_EFFORT")
+        """
+        message = (f"Batch ({mode}): {applied} transfers applied, {rejected} rejected, "
+                   f"{amount:.1f}L moved across {tank_count} tanks")
+        severity = "WARNING" if rejected else "INFO"
+        self.log_event("FUEL_TRANSFER_BATCH", message, None, severity)
+    
     def log_alert(self, tank_id, alert_message):
         self.log_event("ALERT", alert_message, tank_id, "WARNING")
     
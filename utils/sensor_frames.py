@@ -0,0 +1,168 @@
+"""
+Binary sensor frame decoding.
+
+Frame layout (24 bytes, little-endian, fixed size):
+
+    offset  size  type     field
+    0       4     uint32   sensor index (position in the config "sensors" list)
+    4       1     uint8    sensor type code (0=LEVEL, 1=PRESSURE, 2=TEMPERATURE)
+    5       3     -        padding (zero)
+    8       8     float64  timestamp (seconds)
+    16      8     float64  raw reading
+
+A buffer is a plain concatenation of frames. On little-endian hosts the
+decoder exposes each field as a strided memoryview over the buffer, so no
+per-frame or per-field Python objects are created before the readings
+reach the SensorBank.
+"""
+import json
+import struct
+import sys
+from array import array
+
+from models.fuel_sensor import FuelSensor
+from models.sensor_bank import SensorBank
+
+FRAME_FORMAT = '<IB3xdd'
+FRAME_SIZE = struct.calcsize(FRAME_FORMAT)  # 24 bytes
+
+_ZERO_COPY = (sys.byteorder == 'little'
+              and array('I').itemsize == 4 and array('d').itemsize == 8)
+
+
+def encode_frames(indices, type_codes, timestamps, values):
+    """
+    Pack readings into a frame buffer (used by the avionics bridge simulator and tests).
+
+    Returns:
+        bytearray: Concatenated frames
+    """
+    buffer = bytearray(FRAME_SIZE * len(indices))
+    pack_into = struct.Struct(FRAME_FORMAT).pack_into
+    for i, frame in enumerate(zip(indices, type_codes, timestamps, values)):
+        pack_into(buffer, i * FRAME_SIZE, *frame)
+    return buffer
+
+
+def decode_frames(buffer):
+    """
+    Decode a frame buffer into per-field sequences.
+
+    Trailing bytes that do not make up a whole frame are ignored.
+
+    Args:
+        buffer: bytes, bytearray, memoryview or mmap
+
+    Returns:
+        tuple: (indices, type_codes, timestamps, values) - strided memoryviews
+               over the buffer on little-endian hosts, arrays otherwise
+    """
+    view = memoryview(buffer)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    count = len(view) // FRAME_SIZE
+    view = view[:count * FRAME_SIZE]
+
+    if _ZERO_COPY:
+        words = view.cast('I')  # 6 uint32 per frame
+        doubles = view.cast('d')  # 3 float64 per frame
+        return words[0::6], view[4::FRAME_SIZE], doubles[1::3], doubles[2::3]
+
+    # Portable fallback for big-endian hosts
+    indices, type_codes = array('I'), array('B')
+    timestamps, values = array('d'), array('d')
+    for index, type_code, timestamp, value in struct.iter_unpack(FRAME_FORMAT, view):
+        indices.append(index)
+        type_codes.append(type_code)
+        timestamps.append(timestamp)
+        values.append(value)
+    return indices, type_codes, timestamps, values
+
+
+def load_sensors_from_config(config_path="data/logs/tank_config.json", bank=None,
+                             history_size=FuelSensor.DEFAULT_HISTORY_SIZE):
+    """
+    Create the sensors declared in a tank config, in config order.
+
+    A sensor's frame index is its position in the "sensors" list, which is
+    also its row in the bank when the bank starts empty.
+
+    Returns:
+        list: FuelSensor objects sharing one SensorBank
+    """
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    if bank is None:
+        bank = SensorBank()
+    return [
+        FuelSensor(s.get("sensor_id"), s.get("sensor_type"), s.get("tank_id"),
+                   history_size=history_size, bank=bank)
+        for s in config.get("sensors", [])
+    ]
+
+
+class FrameDecoder:
+    """Feeds decoded frames straight into a SensorBank or SensorRegistry"""
+
+    def __init__(self, sensor_bank, registry=None):
+        """
+        Initialize decoder.
+
+        Args:
+            sensor_bank: SensorBank whose rows match the frame sensor indices
+            registry: Optional SensorRegistry owning the bank; when given,
+                      readings are also applied to tanks
+        """
+        self._bank = sensor_bank
+        self._registry = registry
+        self._frames_decoded = 0
+        self._frames_rejected = 0
+
+    def feed(self, buffer, record_history=True):
+        """
+        Decode a buffer and ingest its readings.
+
+        Frames whose sensor index is unknown or whose type code does not
+        match the configured sensor type are dropped and counted.
+
+        Returns:
+            tuple: (frames ingested, operational mask for the ingested frames)
+        """
+        indices, type_codes, timestamps, values = decode_frames(buffer)
+        count = len(indices)
+        if count == 0:
+            return 0, array('b')
+
+        bank = self._bank
+        configured_types = bank.sensor_type
+        if max(indices) >= len(bank) or any(map(int.__ne__, type_codes,
+                                                map(configured_types.__getitem__, indices))):
+            indices, timestamps, values = self._filter_valid(indices, type_codes, timestamps, values)
+
+        ingest = self._registry.route_batch if self._registry is not None else bank.ingest
+        _, mask = ingest(values, indices=indices, timestamps=timestamps,
+                         record_history=record_history)
+        self._frames_decoded += count
+        self._frames_rejected += count - len(indices)
+        return len(indices), mask
+
+    def _filter_valid(self, indices, type_codes, timestamps, values):
+        """Slow path: keep only frames that match a configured sensor"""
+        rows = len(self._bank)
+        configured_types = self._bank.sensor_type
+        keep_indices, keep_times, keep_values = array('I'), array('d'), array('d')
+        for index, type_code, timestamp, value in zip(indices, type_codes, timestamps, values):
+            if index < rows and configured_types[index] == type_code:
+                keep_indices.append(index)
+                keep_times.append(timestamp)
+                keep_values.append(value)
+        return keep_indices, keep_times, keep_values
+
+    def get_frames_decoded(self):
+        return self._frames_decoded
+
+    def get_frames_rejected(self):
+        return self._frames_rejected
+
+    def __str__(self):
+        return f"FrameDecoder: {self._frames_decoded} frames decoded, {self._frames_rejected} rejected"
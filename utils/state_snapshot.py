@@ -0,0 +1,396 @@
+"""
+Binary snapshots of FuelSystem state.
+
+A full snapshot stores the TankStore columns back to back in a fixed
+layout, followed by string tables (tank IDs, names, classes, type code
+tables), so it is loaded by slicing an mmap straight into arrays:
+
+    HEADER (32 bytes): magic b"FMSS", version, kind, rows, count, seq, base_seq
+    FULL:  fuel_level, capacity, pressure, temperature   float64 x rows each
+           status, fuel_type, tank_type                  int8 x rows each
+           string tables: tank IDs, names, classes, fuel types, tank types,
+                          reserve tanks in emergency mode, system status
+    DELTA: row indices                                    int32 x count
+           the seven columns for those rows               (as above, x count)
+           string tables: fuel types, tank types, emergency mode, system status
+
+A delta holds only the rows that changed since the previous snapshot.
+Every file is written to a temporary name, fsynced and renamed into place.
+"""
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections import deque
+from itertools import compress
+from operator import ne
+
+from models.auxiliary_tank import AuxiliaryTank
+from models.main_fuel_tank import MainFuelTank
+from models.reserve_tank import ReserveTank
+from models.tank_store import COLUMNS, FUEL_TYPES, TANK_TYPES, fuel_type_code, tank_type_code
+
+SNAPSHOT_MAGIC = b"FMSS"
+SNAPSHOT_VERSION = 1
+FULL, DELTA = 0, 1
+HEADER = struct.Struct('<4sHBxIIQQ')
+TABLE_HEADER = struct.Struct('<II')
+TYPECODES = {name: ('d' if index < 4 else 'b') for index, name in enumerate(COLUMNS)}
+TANK_CLASSES = {cls.__name__: cls for cls in (MainFuelTank, AuxiliaryTank, ReserveTank)}
+
+
+def _pack_strings(strings):
+    payload = b"\0".join(s.encode() for s in strings)
+    return TABLE_HEADER.pack(len(strings), len(payload)) + payload
+
+
+def _unpack_strings(view, offset, decode=True):
+    count, size = TABLE_HEADER.unpack_from(view, offset)
+    offset += TABLE_HEADER.size
+    payload = bytes(view[offset:offset + size])
+    if decode:
+        payload = payload.decode().split("\0") if count else []
+    return payload, offset + size
+
+
+def _write_atomic(path, chunks):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def capture_columns(fuel_system):
+    """Copy the system's store columns (the base for the next delta)"""
+    store = fuel_system.get_store()
+    return {name: array(TYPECODES[name], getattr(store, name)) for name in COLUMNS}
+
+
+def _emergency_tanks(fuel_system):
+    return sorted(tank.get_tank_id() for tank in fuel_system.get_store().get_tanks_by_type("RESERVE")
+                  if tank.is_emergency_mode())
+
+
+def write_full_snapshot(fuel_system, path, seq=0):
+    """
+    Write a full snapshot of a FuelSystem.
+
+    Returns:
+        dict: The columns written (pass to write_delta_snapshot as base)
+    """
+    store = fuel_system.get_store()
+    columns = capture_columns(fuel_system)
+    rows = len(store)
+    tanks = [store.get_tank(row) for row in range(rows)]
+    chunks = [HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, FULL, rows, rows, seq, seq)]
+    chunks.extend(columns[name].tobytes() for name in COLUMNS)
+    chunks.append(_pack_strings([tank_id or "" for tank_id in store.get_tank_ids()]))
+    chunks.append(_pack_strings([tank.get_name() if tank else "" for tank in tanks]))
+    chunks.append(_pack_strings([type(tank).__name__ if tank else "" for tank in tanks]))
+    chunks.append(_pack_strings(FUEL_TYPES))
+    chunks.append(_pack_strings([name or "" for name in TANK_TYPES]))
+    chunks.append(_pack_strings(_emergency_tanks(fuel_system)))
+    chunks.append(_pack_strings([fuel_system.get_system_status()]))
+    _write_atomic(path, chunks)
+    return columns
+
+
+def write_delta_snapshot(fuel_system, path, base, seq, base_seq):
+    """
+    Write the rows that changed since base (the columns of the previous snapshot).
+
+    Returns:
+        tuple: (current columns, number of rows written), or (None, 0) if
+               the store's row count changed and a full snapshot is needed
+    """
+    columns = capture_columns(fuel_system)
+    rows = len(columns["fuel_level"])
+    if rows != len(base["fuel_level"]):
+        return None, 0
+    changed = set()
+    for name in COLUMNS:
+        if columns[name] != base[name]:
+            changed.update(compress(range(rows), map(ne, columns[name], base[name])))
+    indices = array('i', sorted(changed))
+
+    chunks = [HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, DELTA, rows, len(indices), seq, base_seq),
+              indices.tobytes()]
+    for name in COLUMNS:
+        column = columns[name]
+        chunks.append(array(TYPECODES[name], map(column.__getitem__, indices)).tobytes())
+    chunks.append(_pack_strings(FUEL_TYPES))
+    chunks.append(_pack_strings([name or "" for name in TANK_TYPES]))
+    chunks.append(_pack_strings(_emergency_tanks(fuel_system)))
+    chunks.append(_pack_strings([fuel_system.get_system_status()]))
+    _write_atomic(path, chunks)
+    return columns, len(indices)
+
+
+class SystemSnapshot:
+    """A snapshot file loaded into memory (columns use this process's type codes)"""
+
+    def __init__(self, kind, seq, base_seq, rows, columns, indices=None, tank_ids=None, names=None,
+                 classes=None, emergency=(), system_status=None):
+        self.kind = kind
+        self.seq = seq
+        self.base_seq = base_seq
+        self.rows = rows
+        self.columns = columns
+        self.indices = indices  # Delta: rows the column values belong to
+        self.tank_ids = tank_ids
+        self.names = names
+        self.classes = classes
+        self.emergency = set(emergency)
+        self.system_status = system_status
+
+    def apply_delta(self, delta):
+        """Fold a delta snapshot into this full snapshot's columns"""
+        if delta.base_seq != self.base_seq or delta.rows != self.rows:
+            raise ValueError(f"Delta {delta.seq} does not extend snapshot {self.base_seq}")
+        for name in COLUMNS:
+            deque(map(self.columns[name].__setitem__, delta.indices, delta.columns[name]), maxlen=0)
+        self.seq = delta.seq
+        self.emergency = delta.emergency
+        self.system_status = delta.system_status
+
+    def restore(self, fuel_system):
+        """
+        Write this full snapshot into a FuelSystem.
+
+        An empty system gets its tanks created first. When the system's
+        store rows hold the same tanks as the snapshot (the usual restart
+        case) the columns are replaced wholesale; otherwise tanks are
+        matched by ID and tanks missing on either side are skipped.
+
+        Returns:
+            int: Tanks restored
+        """
+        if self.kind != FULL:
+            raise ValueError("Only full snapshots can be restored")
+        if not fuel_system.get_tank_ids():
+            self._create_tanks(fuel_system)
+
+        store = fuel_system.get_store()
+        snapshot_ids = self.tank_ids
+        if "" in snapshot_ids:
+            snapshot_ids = [tank_id or None for tank_id in snapshot_ids]
+        current_ids = store.get_tank_ids()
+        if current_ids == snapshot_ids:
+            store.replace_columns(self.columns)
+            restored = len(fuel_system.get_tank_ids())
+        else:
+            positions = {tank_id: row for row, tank_id in enumerate(current_ids) if tank_id is not None}
+            source_rows, target_rows = [], []
+            for row, tank_id in enumerate(snapshot_ids):
+                target = positions.get(tank_id)
+                if target is not None:
+                    source_rows.append(row)
+                    target_rows.append(target)
+            store.write_rows(target_rows, {name: [self.columns[name][row] for row in source_rows]
+                                           for name in COLUMNS})
+            restored = len(target_rows)
+
+        for tank in store.get_tanks_by_type("RESERVE"):
+            tank_id = tank.get_tank_id()
+            if tank.is_emergency_mode() != (tank_id in self.emergency):
+                if tank_id in self.emergency:
+                    tank.activate_emergency_mode()
+                else:
+                    tank.deactivate_emergency_mode()
+        if self.system_status:
+            fuel_system.set_system_status(self.system_status)
+        return restored
+
+    def _create_tanks(self, fuel_system):
+        store = fuel_system.get_store()
+        capacity, fuel_level = self.columns["capacity"], self.columns["fuel_level"]
+        names = self.names.decode().split("\0")
+        classes = self.classes.decode().split("\0")
+        for row, (tank_id, name, class_name) in enumerate(zip(self.tank_ids, names, classes)):
+            tank_class = TANK_CLASSES.get(class_name)
+            if tank_id and tank_class is not None:
+                fuel_system.add_tank(tank_class(tank_id, name, capacity[row], fuel_level[row], store=store))
+
+
+def _remap_codes(column, names, code_for):
+    """Translate int8 codes from the snapshot's code table to this process's"""
+    table = bytearray(range(256))
+    for code, name in enumerate(names):
+        table[code] = code_for(name or None) & 0xFF
+    return array('b', column.tobytes().translate(table))
+
+
+def read_snapshot(path):
+    """
+    Load a full or delta snapshot file through mmap.
+
+    Returns:
+        SystemSnapshot
+
+    Raises:
+        ValueError: If the file is not a snapshot
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            magic, version, kind, rows, count, seq, base_seq = HEADER.unpack_from(view, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} snapshot")
+            offset = HEADER.size
+            indices = None
+            if kind == DELTA:
+                indices = array('i')
+                indices.frombytes(view[offset:offset + 4 * count])
+                offset += 4 * count
+            columns = {}
+            for name in COLUMNS:
+                column = array(TYPECODES[name])
+                size = count * column.itemsize
+                column.frombytes(view[offset:offset + size])
+                offset += size
+                columns[name] = column
+
+            tank_ids = names = classes = None
+            if kind == FULL:
+                tank_ids, offset = _unpack_strings(view, offset)
+                # Names and classes are only decoded if tanks have to be created
+                names, offset = _unpack_strings(view, offset, decode=False)
+                classes, offset = _unpack_strings(view, offset, decode=False)
+            fuel_types, offset = _unpack_strings(view, offset)
+            tank_types, offset = _unpack_strings(view, offset)
+            columns["fuel_type"] = _remap_codes(columns["fuel_type"], fuel_types, fuel_type_code)
+            columns["tank_type"] = _remap_codes(columns["tank_type"], tank_types, tank_type_code)
+            emergency, offset = _unpack_strings(view, offset)
+            status, offset = _unpack_strings(view, offset)
+        finally:
+            view.release()
+    return SystemSnapshot(kind, seq, base_seq, rows, columns, indices, tank_ids, names, classes,
+                          emergency, status[0] if status else None)
+
+
+class SnapshotManager:
+    """
+    Full and delta snapshots of one FuelSystem in a directory.
+
+    take_snapshot() writes a delta while it stays small and the tank layout
+    is unchanged, and a new full snapshot otherwise; older snapshot chains
+    are removed once a new full snapshot is in place. restore() loads the
+    latest full snapshot, folds its deltas in memory and writes the result
+    into the system once.
+    """
+
+    def __init__(self, fuel_system, directory="data/snapshots", max_deltas=16, max_delta_fraction=0.25):
+        """
+        Initialize snapshot manager.
+
+        Args:
+            fuel_system: FuelSystem to snapshot
+            directory (str): Where snapshot files are kept
+            max_deltas (int): Deltas after which the next snapshot is full
+            max_delta_fraction (float): Changed-row fraction above which a
+                                        full snapshot is written instead
+        """
+        self._fuel_system = fuel_system
+        self._directory = directory
+        self._max_deltas = max_deltas
+        self._max_delta_fraction = max_delta_fraction
+        self._base = None  # Columns at the last snapshot
+        self._base_seq = 0
+        self._deltas = 0
+        os.makedirs(directory, exist_ok=True)
+        self._seq = max((seq for seq, _, _ in self._list_files()), default=0)
+
+    def _list_files(self):
+        """Return (seq, kind, path) for every snapshot file, oldest first"""
+        files = []
+        for name in os.listdir(self._directory):
+            stem, _, extension = name.partition(".")
+            if extension in ("full", "delta") and stem.startswith("snapshot_") and stem[9:].isdigit():
+                files.append((int(stem[9:]), extension, os.path.join(self._directory, name)))
+        return sorted(files)
+
+    def _path(self, seq, kind):
+        return os.path.join(self._directory, f"snapshot_{seq:08d}.{kind}")
+
+    def take_snapshot(self, full=False):
+        """
+        Write a delta (or full) snapshot of the current state.
+
+        All tank locks are held while the columns are copied, so the
+        snapshot never contains half of a transfer.
+
+        Returns:
+            tuple: (kind "full"/"delta", path)
+        """
+        fuel_system = self._fuel_system
+        with fuel_system.get_tank_locks().hold(fuel_system.get_tank_ids()):
+            return self._take_snapshot(full)
+
+    def _take_snapshot(self, full):
+        self._seq += 1
+        if not full and self._base is not None and self._deltas < self._max_deltas:
+            path = self._path(self._seq, "delta")
+            columns, count = write_delta_snapshot(self._fuel_system, path, self._base,
+                                                  self._seq, self._base_seq)
+            if columns is not None and count <= self._max_delta_fraction * len(columns["fuel_level"]):
+                self._base = columns
+                self._deltas += 1
+                return "delta", path
+            if os.path.exists(path):
+                os.remove(path)  # Too large to pay off; write a full snapshot instead
+
+        path = self._path(self._seq, "full")
+        self._base = write_full_snapshot(self._fuel_system, path, self._seq)
+        self._base_seq = self._seq
+        self._deltas = 0
+        for seq, _, old_path in self._list_files():
+            if seq < self._seq:
+                os.remove(old_path)
+        return "full", path
+
+    def load_latest(self):
+        """
+        Load the latest full snapshot with its deltas folded in.
+
+        Returns:
+            tuple: (SystemSnapshot or None, number of deltas applied)
+        """
+        files = self._list_files()
+        fulls = [(seq, path) for seq, kind, path in files if kind == "full"]
+        if not fulls:
+            return None, 0
+        base_seq, path = fulls[-1]
+        snapshot = read_snapshot(path)
+        applied = 0
+        for seq, kind, path in files:
+            if kind == "delta" and seq > base_seq:
+                delta = read_snapshot(path)
+                if delta.base_seq == base_seq:
+                    snapshot.apply_delta(delta)
+                    applied += 1
+        return snapshot, applied
+
+    def restore(self):
+        """
+        Restore the system from the latest snapshot chain.
+
+        Returns:
+            dict: Snapshot seq, deltas applied, tanks restored, seconds
+                  (None if there is no snapshot)
+        """
+        start = time.perf_counter()
+        snapshot, deltas = self.load_latest()
+        if snapshot is None:
+            return None
+        restored = snapshot.restore(self._fuel_system)
+        # The store layout may differ from the snapshot's, so the next snapshot is full
+        self._base = None
+        return {"seq": snapshot.seq, "deltas": deltas, "tanks_restored": restored,
+                "seconds": time.perf_counter() - start}
+
+    def __str__(self):
+        return f"SnapshotManager: {self._directory}, seq {self._seq}, {self._deltas} deltas since full"
@@ -0,0 +1,51 @@
+"""
+Building a FuelSystem from a tank config (the data/logs/tank_config.json layout).
+
+Shared by the GUI, the fleet shards and the flight simulator so that every
+entry point creates the same tanks, plumbing and sensors from a config.
+"""
+import json
+
+from controllers.fuel_system import FuelSystem
+from models.auxiliary_tank import AuxiliaryTank
+from models.fuel_sensor import FuelSensor
+from models.main_fuel_tank import MainFuelTank
+from models.plumbing_topology import PlumbingTopology
+from models.reserve_tank import ReserveTank
+
+DEFAULT_CONFIG_PATH = "data/logs/tank_config.json"
+TANK_CLASSES = {cls.__name__: cls for cls in (MainFuelTank, AuxiliaryTank, ReserveTank)}
+
+
+def load_config(path=DEFAULT_CONFIG_PATH):
+    """Read a tank config file"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def build_fuel_system(config, fuel_system=None):
+    """
+    Build a FuelSystem from a tank config dict.
+
+    Tanks of an unknown type are skipped.
+
+    Args:
+        config (dict): "tanks", optional "sensors", "valves" and "pipes"
+        fuel_system: FuelSystem to populate (default: a new one)
+
+    Returns:
+        FuelSystem
+    """
+    if fuel_system is None:
+        fuel_system = FuelSystem()
+    for t in config.get("tanks", []):
+        tank_class = TANK_CLASSES.get(t.get("type"))
+        if tank_class is None:
+            continue
+        fuel_system.add_tank(tank_class(t.get("tank_id"), t.get("name"), t.get("capacity"),
+                                        t.get("initial_fuel", 0)))
+    if config.get("pipes"):
+        fuel_system.set_topology(PlumbingTopology.from_config(config))
+    for s in config.get("sensors", []):
+        fuel_system.add_sensor(FuelSensor(s.get("sensor_id"), s.get("sensor_type"), s.get("tank_id")))
+    return fuel_system
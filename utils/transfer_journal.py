@@ -0,0 +1,359 @@
+"""
+Append-only, checksummed journal of completed fuel transfers.
+
+File layout: a 5-byte header (b"FMSJ" + format version) followed by records
+
+    offset  size  type     field
+    0       4     uint32   payload length
+    4       4     uint32   CRC-32 of the payload
+    8       n     bytes    payload: JSON [seq, source_id, dest_id, amount, timestamp]
+
+Records are buffered and written with one fsync per group (group commit).
+In synchronous mode (the default) a transfer is acknowledged only once its
+record is on disk: callers wait in wait_durable(), one of them (the
+leader) writes and fsyncs everything pending, and records appended while
+that fsync runs form the next group. In asynchronous mode records are
+committed when their group is full or has waited max_delay, so a crash
+can lose up to one group of acknowledged transfers.
+
+A torn or corrupt record ends the journal; it and anything after it are
+discarded when the journal is reopened. A checkpoint writes a snapshot of
+all tank levels (atomically, via rename) and starts an empty journal, so
+recovery replays at most checkpoint_every records.
+"""
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+JOURNAL_MAGIC = b"FMSJ\x01"
+RECORD_HEADER = struct.Struct('<II')
+
+
+def read_journal(path):
+    """
+    Read the valid records of a journal file.
+
+    Returns:
+        tuple: (list of (seq, source_id, dest_id, amount, timestamp), length of the valid prefix in bytes)
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0
+    if not data.startswith(JOURNAL_MAGIC):
+        return [], 0
+
+    records = []
+    offset = len(JOURNAL_MAGIC)
+    header_size = RECORD_HEADER.size
+    while offset + header_size <= len(data):
+        length, crc = RECORD_HEADER.unpack_from(data, offset)
+        end = offset + header_size + length
+        payload = data[offset + header_size:end]
+        if end > len(data) or zlib.crc32(payload) != crc:
+            break  # Torn write or corruption: the journal ends here
+        records.append(tuple(json.loads(payload)))
+        offset = end
+    return records, offset
+
+
+def write_snapshot(path, seq, levels):
+    """Atomically write a snapshot of tank levels taken after journal record seq"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"seq": seq, "levels": levels}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    """Return (seq, levels) from a snapshot file, or (0, {}) if there is none"""
+    try:
+        with open(path, 'r') as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return 0, {}
+    return snapshot["seq"], snapshot["levels"]
+
+
+class TransferJournal:
+    """Durable record of successful transfers with group commit and recovery"""
+
+    def __init__(self, path="data/logs/transfer_journal.bin", fuel_system=None, group_size=64,
+                 max_delay=0.05, checkpoint_every=10000, clock=time.monotonic, synchronous=True):
+        """
+        Open (or create) a journal.
+
+        Args:
+            path (str): Journal file; the snapshot is stored next to it
+            fuel_system: FuelSystem to checkpoint automatically (optional)
+            group_size (int): Records per fsync
+            max_delay (float): Seconds a record may wait for its group before
+                               the next record forces a commit
+            checkpoint_every (int): Records after which the journal is
+                                    checkpointed (bounds recovery time)
+            clock: Monotonic time source in seconds
+            synchronous (bool): wait_durable() blocks until the record is on
+                                disk; False commits groups asynchronously
+        """
+        self._path = path
+        self._snapshot_path = path + ".snapshot.json"
+        self._fuel_system = fuel_system
+        self._group_size = group_size
+        self._max_delay = max_delay
+        self._checkpoint_every = checkpoint_every
+        self._clock = clock
+        self._synchronous = synchronous
+        self._lock = threading.Lock()
+        self._committed = threading.Condition(self._lock)
+        self._committing = False  # A leader is writing a group outside the lock
+
+        log_dir = os.path.dirname(path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+
+        # Drop any torn tail and continue the sequence
+        records, valid_length = read_journal(path)
+        snapshot_seq, _ = read_snapshot(self._snapshot_path)
+        self._last_seq = max(records[-1][0] if records else 0, snapshot_seq)
+        self._journal_records = len(records)
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        if valid_length == 0:
+            self._file.truncate(0)
+            self._file.write(JOURNAL_MAGIC)
+            valid_length = len(JOURNAL_MAGIC)
+        self._file.truncate(valid_length)
+        self._file.seek(valid_length)
+
+        self._pending = bytearray()
+        self._pending_count = 0
+        self._pending_since = None
+        self._durable_seq = self._last_seq
+        self._commits = 0
+        self._checkpoints = 0
+
+    def record_transfer(self, source_id, dest_id, amount):
+        """
+        Append a completed transfer to the current group.
+
+        Called while the transfer's tank locks are held, so the journal
+        order matches the order transfers were applied. Nothing is written
+        to disk here; see wait_durable() and commit_if_due().
+
+        Returns:
+            int: Sequence number of the record
+        """
+        with self._lock:
+            self._last_seq += 1
+            seq = self._last_seq
+            payload = json.dumps([seq, source_id, dest_id, amount, time.time()],
+                                 separators=(',', ':')).encode()
+            self._pending += RECORD_HEADER.pack(len(payload), zlib.crc32(payload))
+            self._pending += payload
+            self._pending_count += 1
+            if self._pending_since is None:
+                self._pending_since = self._clock()
+        return seq
+
+    def is_synchronous(self):
+        return self._synchronous
+
+    def wait_durable(self, seq=None):
+        """
+        Acknowledge a recorded transfer. Call without holding any tank locks.
+
+        In synchronous mode, block until record seq is on disk: if no group
+        is being written, this caller writes everything pending; otherwise
+        it waits for the running fsync and, if its record was appended too
+        late for that group, leads the next one. In asynchronous mode only
+        commit the pending group if it is due.
+
+        Args:
+            seq (int): Sequence number from record_transfer (None: nothing recorded)
+
+        Returns:
+            bool: True if record seq is durable
+        """
+        if not self._synchronous:
+            self.commit_if_due()
+            return seq is None or self._durable_seq >= seq
+        if seq is None:
+            return True
+        with self._lock:
+            while self._durable_seq < seq:
+                if self._committing:
+                    self._committed.wait()
+                else:
+                    self._write_group()
+        if self._checkpoint_due():
+            self.checkpoint()
+        return True
+
+    def commit_if_due(self):
+        """
+        Commit the pending group if it is full or its oldest record has
+        waited max_delay seconds. Call without holding any tank locks.
+
+        Returns:
+            int: Number of records made durable
+        """
+        with self._lock:
+            due = self._pending_count and (
+                self._pending_count >= self._group_size
+                or self._clock() - self._pending_since >= self._max_delay)
+        return self.commit() if due else 0
+
+    def commit(self):
+        """
+        Write and fsync the pending group.
+
+        Returns:
+            int: Number of records made durable
+        """
+        with self._lock:
+            count = self._write_group()
+        if self._checkpoint_due():
+            self.checkpoint()
+        return count
+
+    def _checkpoint_due(self):
+        with self._lock:
+            return self._fuel_system is not None and self._journal_records >= self._checkpoint_every
+
+    def _write_group(self):
+        """
+        Write and fsync the pending records. Called with the lock held.
+
+        The lock is released during the fsync so other transfers can keep
+        appending records, which then form the next group.
+        """
+        while self._committing:
+            self._committed.wait()
+        count = self._pending_count
+        if not count:
+            return 0
+        data, last_seq = self._pending, self._last_seq
+        self._pending = bytearray()
+        self._pending_count = 0
+        self._pending_since = None
+        self._committing = True
+        self._lock.release()
+        try:
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        finally:
+            self._lock.acquire()
+            self._committing = False
+            self._committed.notify_all()
+        self._durable_seq = last_seq
+        self._journal_records += count
+        self._commits += 1
+        return count
+
+    def checkpoint(self, fuel_system=None):
+        """
+        Snapshot all tank levels and start an empty journal.
+
+        All tank locks are held while the snapshot is taken, so no transfer
+        is applied to the tanks without also being in the journal.
+        """
+        fuel_system = fuel_system or self._fuel_system
+        with fuel_system.get_tank_locks().hold(fuel_system.get_tank_ids()):
+            with self._lock:
+                self._write_group()
+                levels = {tank_id: tank.get_fuel_level()
+                          for tank_id, tank in fuel_system.get_all_tanks().items()}
+                write_snapshot(self._snapshot_path, self._last_seq, levels)
+                self._file.seek(0)
+                self._file.truncate(0)
+                self._file.write(JOURNAL_MAGIC)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._journal_records = 0
+                self._checkpoints += 1
+
+    def recover(self, fuel_system):
+        """
+        Rebuild tank levels from the last snapshot plus the journal.
+
+        Transfer deltas commute, so each tank's net change is applied once.
+        Tanks missing from the system are skipped. A replayed level outside
+        a tank's 0-capacity range means the journal does not match the
+        configured tanks; that tank is left unchanged and reported.
+
+        Returns:
+            dict: Recovery statistics (snapshot seq, records replayed, tanks restored,
+                  rejected tank_id -> replayed level, seconds)
+        """
+        start = time.perf_counter()
+        snapshot_seq, levels = read_snapshot(self._snapshot_path)
+        records, _ = read_journal(self._path)
+        for seq, source_id, dest_id, amount, _ in records:
+            if seq <= snapshot_seq:
+                continue  # Already in the snapshot (crash before the journal was reset)
+            for tank_id, delta in ((source_id, -amount), (dest_id, amount)):
+                if tank_id not in levels:
+                    tank = fuel_system.get_tank(tank_id)
+                    if tank is None:
+                        continue
+                    levels[tank_id] = tank.get_fuel_level()
+                levels[tank_id] += delta
+
+        restored = 0
+        rejected = {}
+        for tank_id, level in levels.items():
+            tank = fuel_system.get_tank(tank_id)
+            if tank is None:
+                continue
+            if level < 0 or level > tank.get_capacity():
+                print(f"Error recovering {tank_id}: replayed level {level:.1f}L "
+                      f"outside 0-{tank.get_capacity():.1f}L, tank left unchanged")
+                rejected[tank_id] = level
+                continue
+            tank.set_fuel_level(level)
+            restored += 1
+        return {
+            "snapshot_seq": snapshot_seq,
+            "records_replayed": sum(1 for record in records if record[0] > snapshot_seq),
+            "tanks_restored": restored,
+            "rejected": rejected,
+            "seconds": time.perf_counter() - start
+        }
+
+    def get_recovery_info(self):
+        """
+        Describe what recover() would replay, without touching any tank.
+
+        Returns:
+            dict: snapshot seq (0: no snapshot) and number of journal records after it
+        """
+        snapshot_seq, _ = read_snapshot(self._snapshot_path)
+        records, _ = read_journal(self._path)
+        return {
+            "snapshot_seq": snapshot_seq,
+            "records": sum(1 for record in records if record[0] > snapshot_seq)
+        }
+
+    def close(self):
+        """Commit pending records and close the file"""
+        self.commit()
+        self._file.close()
+
+    def get_metrics(self):
+        return {
+            "last_seq": self._last_seq,
+            "durable_seq": self._durable_seq,
+            "pending": self._pending_count,
+            "journal_records": self._journal_records,
+            "commits": self._commits,
+            "checkpoints": self._checkpoints
+        }
+
+    def __str__(self):
+        return f"TransferJournal: {self._path}, {self._journal_records} records since last checkpoint"